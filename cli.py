@@ -10,6 +10,7 @@ from elements.settings.general_settings import GeneralSettings
 from elements.settings.model_settings import ModelSettings
 from elements.settings.settings_orchestrator import SettingsOrchestrator
 from elements.settings.tracking_settings import TrackingSettings
+from elements.utils import parse_timestamp
 from gradio_server.model_manager import ModelManager
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
@@ -17,52 +18,101 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 parser = ArgumentParser(description='')
 parser.add_argument('--type', type=str, default='tracking', help="Type of task, currently only tracking is implemented")
 parser.add_argument('--realistic', action="store_true", help="Help ease down the processing speed to make the resulting video seem realistic, in case of very good hardware")
+parser.add_argument('--realtime', action="store_true", help="Process the video file like a live camera feed, skipping the frames that can not be processed in time instead of falling behind")
 parser.add_argument('--camera-mode', action="store_true", help="Use USB webcam/camera as input")
 parser.add_argument('--gpu', action="store_true", help="Use GPU for processing")
 parser.add_argument('--template', type=str, default="bikehelmets", help="Initializes settings according to template, currently only bikehelmets is implemented")
 parser.add_argument('--input', type=str, default="output.mp4", help="Use video file as input, looks in dataset folder only. So first copy file there and put the file name as an argument")
 parser.add_argument('--screen-width', type=int, default=1920, help="Screen width in pixels for visualization")
 parser.add_argument('--screen-height', type=int, default=1080, help="Screen height in pixels for visualization")
+parser.add_argument('--pipeline-queue-size', type=int, default=0, help="Run decoding, detection, tracking, rendering and saving of consecutive frames in parallel stages linked by queues of this size, 0 processes frames one after another")
+parser.add_argument('--batch-size', type=int, default=1, help="Amount of consecutive frames to detect in a single forward pass, only used when processing frames one after another")
+parser.add_argument('--batch-latency-ms', type=float, default=0.0, help="Latency target in milliseconds per batch in camera mode, the batch size adapts to it up to --batch-size. 0 always uses --batch-size")
+parser.add_argument('--start-frame', type=int, default=0, help="First frame of the video file to process, reached by seeking instead of decoding")
+parser.add_argument('--end-frame', type=int, default=None, help="Frame of the video file to stop processing at (exclusive), the whole video if not set")
+parser.add_argument('--start-time', type=parse_timestamp, default=None, help="Like --start-frame, but as a timestamp in seconds or HH:MM:SS. Takes precedence over --start-frame")
+parser.add_argument('--end-time', type=parse_timestamp, default=None, help="Like --end-frame, but as a timestamp in seconds or HH:MM:SS. Takes precedence over --end-frame")
+parser.add_argument('--workers', type=int, default=1, help="Split the video file in this amount of overlapping chunks that get processed in parallel worker processes, only the counts are produced")
+parser.add_argument('--chunk-overlap', type=int, default=60, help="Amount of frames neighbouring chunks overlap when using --workers")
+parser.add_argument('--prefetch-frames', type=int, default=8, help="Amount of video frames to decode ahead on a background thread, 0 disables prefetching")
+parser.add_argument('--tracker', type=str, default=None, help="Tracker to use instead of the one configured for the architecture: DeepOcSort, DeepOcSortLite, OcSort or ByteTrack")
+parser.add_argument('--detection-cache', action="store_true", help="Cache the detections of the video file on disk, later runs with the same model replay them instead of running the model")
+parser.add_argument('--detection-interval', type=int, default=1, help="Only detect every x-th frame of the video file, the tracks get extrapolated along their motion in between")
+parser.add_argument('--detection-fps', type=float, default=0.0, help="Detect this amount of frames per second of video instead of every --detection-interval-th frame, 0 disables")
 parser.add_argument('--camera-index', type=int, default=-1, help="Index of camera to use, -1 is automatic discovery")
 parser.add_argument('--save-all-frames', action="store_true", help="Save all raw frames from camera as separate .png files")
 parser.add_argument('--save-results', action="store_true", help="Construct an .mp4 file with all processed images")
+parser.add_argument('--video-queue-size', type=int, default=32, help="Amount of frames that can wait to be encoded into the result video on a background thread")
+parser.add_argument('--video-overflow-policy', type=str, default="block", choices=["block", "drop", "coalesce"], help="What to do with a new frame when the result video queue is full: wait for room, drop the new frame or drop the oldest queued frame")
+parser.add_argument('--segment-minutes', type=float, default=0.0, help="Rotate the result video to a new segment every x minutes, 0 disables")
+parser.add_argument('--segment-max-mb', type=float, default=0.0, help="Rotate the result video to a new segment once it reaches x megabytes, 0 disables")
 parser.add_argument('--save-new-objects', action="store_true", help="Save all frames with new objects as .png files")
+parser.add_argument('--image-format', type=str, default="png", choices=["png", "jpg", "webp"], help="Format of the saved frames and images with new objects")
+parser.add_argument('--image-compression', type=int, default=-1, help="PNG compression level (0-9) or JPG/WebP quality (0-100) of saved images, -1 is the standard of the format")
+parser.add_argument('--image-queue-size', type=int, default=16, help="Amount of images that can wait to be saved on background threads before saving blocks")
+parser.add_argument('--export-tracks', action="store_true", help="Export the active tracks of every frame to chunked .npz files in output/tracks for analysis without re-running the detector")
 parser.add_argument('--reset-stats-min', type=float, default=0.0, help="Automatically reset counts every x minutes")
+parser.add_argument('--target-fps', type=float, default=0.0, help="Lower the detection size of the camera feed in steps when it can not keep up with this fps, and raise it again when it can. 0 always detects at the input size")
+parser.add_argument('--motion-sensitivity', type=float, default=0.0, help="Skip the detector on camera frames without motion, between 0 and 1, the higher the smaller the moving area that triggers detection. 0 disables the gate")
 
-args = parser.parse_args()
 
-general_settings = GeneralSettings()
-model_settings = ModelSettings()
-tracking_settings = TrackingSettings()
+def main() -> None:
+    """
+    Runs the analysis on a camera feed or video file as configured by the command line arguments.
+    """
+    args = parser.parse_args()
 
-model_manager = ModelManager(args)
-model_manager.initialize_settings(general_settings=general_settings, model_settings=model_settings, tracking_settings=tracking_settings)
+    general_settings = GeneralSettings()
+    model_settings = ModelSettings()
+    tracking_settings = TrackingSettings()
 
-config = model_manager.get_parsed_config()
-full_input_path = os.path.join("dataset", args.input)
+    model_manager = ModelManager(args)
+    model_manager.initialize_settings(general_settings=general_settings, model_settings=model_settings, tracking_settings=tracking_settings)
 
-setting_orchestrator = SettingsOrchestrator(model_manager=model_manager)
+    config = model_manager.get_parsed_config()
+    full_input_path = os.path.join("dataset", args.input)
 
-setting_orchestrator.device_setting.update(device="cuda:0" if args.gpu else "cpu")
-setting_orchestrator.realistic_processing_setting.update(realistic_processing=args.realistic)
-setting_orchestrator.screen_dimension_setting.update(width=args.screen_width, height=args.screen_height)
-setting_orchestrator.camera_index_setting.update(index=args.camera_index)
-setting_orchestrator.save_all_frames_setting.update(save_all_frames=args.save_all_frames)
-setting_orchestrator.save_new_objects_setting.update(save_new_objects=args.save_new_objects)
-setting_orchestrator.save_results_setting.update(save_results=args.save_results)
-setting_orchestrator.reset_stats_min.update(minutes=args.reset_stats_min)
-setting_orchestrator.initialize_values(config=config.current_config)
+    setting_orchestrator = SettingsOrchestrator(model_manager=model_manager)
 
-general_settings.application_mode = ApplicationMode.CLI
-display = Display()
-locker = Locker()
-if args.camera_mode:
-    setting_orchestrator.camera_mode_setting.update(InputMode.CAMERA)
-    predictor, predictor_parameters = PredictTracking(general_settings=general_settings, model_settings=model_settings, tracking_settings=tracking_settings, display=display, locker=locker).get_predictor()
+    setting_orchestrator.device_setting.update(device="cuda:0" if args.gpu else "cpu")
+    setting_orchestrator.realistic_processing_setting.update(realistic_processing=args.realistic)
+    setting_orchestrator.realtime_setting.update(realtime=args.realtime)
+    setting_orchestrator.screen_dimension_setting.update(width=args.screen_width, height=args.screen_height)
+    setting_orchestrator.pipeline_queue_size_setting.update(pipeline_queue_size=args.pipeline_queue_size)
+    setting_orchestrator.batch_size_setting.update(batch_size=args.batch_size, latency_target_ms=args.batch_latency_ms)
+    setting_orchestrator.prefetch_frames_setting.update(prefetch_frames=args.prefetch_frames)
+    setting_orchestrator.detection_cache_setting.update(detection_cache=args.detection_cache)
+    setting_orchestrator.detection_interval_setting.update(interval=args.detection_interval, fps=args.detection_fps)
+    setting_orchestrator.chunked_processing_setting.update(workers=args.workers, overlap_frames=args.chunk_overlap)
+    setting_orchestrator.camera_index_setting.update(index=args.camera_index)
+    setting_orchestrator.save_all_frames_setting.update(save_all_frames=args.save_all_frames)
+    setting_orchestrator.save_new_objects_setting.update(save_new_objects=args.save_new_objects)
+    setting_orchestrator.save_results_setting.update(save_results=args.save_results)
+    setting_orchestrator.export_tracks_setting.update(export_tracks=args.export_tracks)
+    setting_orchestrator.video_segments_setting.update(minutes=args.segment_minutes, max_mb=args.segment_max_mb)
+    setting_orchestrator.video_writer_setting.update(queue_size=args.video_queue_size, overflow_policy=args.video_overflow_policy)
+    setting_orchestrator.image_writer_setting.update(image_format=args.image_format, compression=args.image_compression, queue_size=args.image_queue_size)
+    setting_orchestrator.reset_stats_min.update(minutes=args.reset_stats_min)
+    setting_orchestrator.motion_gate_setting.update(sensitivity=args.motion_sensitivity)
+    setting_orchestrator.target_fps_setting.update(target_fps=args.target_fps)
+    setting_orchestrator.initialize_values(config=config.current_config)
+    if args.tracker is not None:
+        setting_orchestrator.tracker_setting.update(tracker=args.tracker)
 
-    predictor.predict()
-else:
-    setting_orchestrator.camera_mode_setting.update(InputMode.FILE)
-    predictor, predictor_parameters = PredictTracking(general_settings=general_settings, model_settings=model_settings, tracking_settings=tracking_settings, display=display, input_path=full_input_path, locker=locker).get_predictor()
+    general_settings.application_mode = ApplicationMode.CLI
+    display = Display()
+    locker = Locker()
+    if args.camera_mode:
+        setting_orchestrator.camera_mode_setting.update(InputMode.CAMERA)
+        predictor, predictor_parameters = PredictTracking(general_settings=general_settings, model_settings=model_settings, tracking_settings=tracking_settings, display=display, locker=locker).get_predictor()
 
-    predictor.predict()
+        predictor.predict()
+    else:
+        setting_orchestrator.camera_mode_setting.update(InputMode.FILE)
+        predictor, predictor_parameters = PredictTracking(general_settings=general_settings, model_settings=model_settings, tracking_settings=tracking_settings, display=display, input_path=full_input_path, locker=locker, start_frame=args.start_frame, end_frame=args.end_frame, start_time=args.start_time, end_time=args.end_time).get_predictor()
+
+        predictor.predict()
+
+
+if __name__ == '__main__':  # Guarded as the worker processes of chunked processing import this module
+    main()
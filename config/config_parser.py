@@ -18,7 +18,7 @@ class ConfigParser:
         self.logger = Logger.setup_logger()
         self.base_path = getattr(sys, '_MEIPASS', os.path.abspath(os.path.dirname(__file__)))
         self.config_path = os.path.join(self.base_path, 'config.yaml')
-        self.weight_extensions = ["ckpt", "pth", "pt"]
+        self.weight_extensions = ["ckpt", "pth", "pt", "onnx"]
         self.all_configs: list[ModelConfig] = []
         self.trackers: list[str] = []
         self.task_type_models: dict[str, list[ModelConfig]] = {}
@@ -83,6 +83,11 @@ class ConfigParser:
             return None
 
         model_config_data = config_file.get(architecture, {})
+        weights_config = self._get_weights_config(weights_entries=model_config_data.get("weights") or {}, weights=weights)
+        if weights_config is None:
+            self.logger.warning(f"Weights {weights} of model {architecture} not found in the config file.")
+            return None
+
         model_config = ModelConfig(architecture=architecture, weights=weights)
 
         # Set model properties
@@ -93,14 +98,34 @@ class ConfigParser:
         model_config.normalize_type = model_config_data.get("normalize_type")
         self._add_to_list_in_dict(dictionary=self.task_type_models, key=model_config.task_type, value=model_config)
 
-        model_config.classes = model_config_data.get("weights").get(weights).get("classes", [])
-        model_config.tracked_classes = model_config_data.get("weights").get(weights).get("tracked_classes", [])
-        model_config.showed_classes = model_config_data.get("weights").get(weights).get("showed_classes", [])
-        model_config.load_model_type = model_config_data.get("load_model_type")
+        model_config.classes = weights_config.get("classes", [])
+        model_config.tracked_classes = weights_config.get("tracked_classes", [])
+        model_config.showed_classes = weights_config.get("showed_classes", [])
+        model_config.load_model_type = weights_config.get("load_model_type", model_config_data.get("load_model_type"))  # Weights can override the loader of their architecture
         model_config.box_threshold = model_config_data.get("box_threshold")
+        model_config.intra_op_threads = model_config_data.get("intra_op_threads")
+        model_config.inter_op_threads = model_config_data.get("inter_op_threads")
 
         return model_config
 
+    def _get_weights_config(self, weights_entries: dict, weights: str) -> Optional[dict]:
+        """
+        Returns the config entry of the weights, or None if there is none.
+
+        The <stem>_int8.onnx variants made by elements.load_model.quantize do not need an entry of their own, they take the entry of the weights they were made from and run with
+        ONNX Runtime.
+
+        """
+        if weights in weights_entries:
+            return weights_entries[weights] or {}
+
+        if weights.endswith("_int8.onnx"):
+            stem = weights[:-len("_int8.onnx")]
+            for source_weights, source_config in weights_entries.items():
+                if os.path.splitext(source_weights)[0] == stem:
+                    return {**(source_config or {}), "load_model_type": "onnx"}
+        return None
+
     def get_trackers(self) -> list[str]:
         """
         Getter for the tracker list.
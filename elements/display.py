@@ -15,10 +15,10 @@ class Display:
         """
         Simply shows the image with cv2.imshow.
 
-        :param image: Image to show
+        :param image: BGR image to show
 
         """
-        cv2.imshow(self.window_name, cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+        cv2.imshow(self.window_name, image)
         cv2.waitKey(1)
 
     def close(self) -> None:
@@ -30,6 +30,15 @@ class InputMode(Enum):
     FILE = 1
 
 
+class OverflowPolicy(Enum):
+    """
+    What a writer does with a new frame when its queue is full.
+    """
+    BLOCK = 0
+    DROP = 1
+    COALESCE = 2
+
+
 class ApplicationMode(Enum):
     """
     Mode of the application, either CLI or GUI.
@@ -0,0 +1,160 @@
+import os
+import shutil
+import threading
+from typing import Optional
+
+import cv2
+import numpy as np
+import onnxruntime as ort
+from ultralytics import YOLO
+
+from elements.load_model.load_model_base import LoadModel
+from elements.utils import Logger, hash_file
+
+logger = Logger.setup_logger()
+
+
+class OnnxModel:
+    """
+    Runs a YOLO model exported to ONNX with ONNX Runtime.
+
+    The model gets exported with a fixed input size, so an export and session is kept per input size. Exports are cached on disk next to the weights, keyed by the hash of the
+    weights file and the input size, and only happen the first time a size is used.
+
+    Weights that are an .onnx file already, like the INT8 variants made by elements.load_model.quantize, are used as is with the input size they were made for.
+
+    Calling the model returns a (N, 6) array of [x1, y1, x2, y2, confidence, class_id] per image, the same layout the BoxProcessor produces from the ultralytics results.
+
+    """
+    def __init__(self, weights_path: str, device: str = "cpu", intra_op_threads: Optional[int] = None, inter_op_threads: Optional[int] = None, iou_threshold: float = 0.7, max_detections: int = 300):
+        self.logger = Logger.setup_logger()
+        self.weights_path = weights_path
+        self.device = device
+        self.intra_op_threads = intra_op_threads
+        self.inter_op_threads = inter_op_threads
+        self.iou_threshold = iou_threshold
+        self.max_detections = max_detections
+
+        self.weights_hash = hash_file(weights_path)[:16]
+        self.cache_directory = os.path.join(os.path.dirname(weights_path), ".cache")
+        self.sessions: dict[tuple[int, int], ort.InferenceSession] = {}
+        self.session_lock = threading.Lock()
+
+    def to(self, device: str) -> 'OnnxModel':
+        """
+        Moves the model to another device, the sessions get recreated with the matching execution provider on their next use.
+        """
+        if device != self.device:
+            with self.session_lock:
+                self.device = device
+                self.sessions = {}
+        return self
+
+    def get_providers(self) -> list[str]:
+        if "cuda" in self.device and "CUDAExecutionProvider" in ort.get_available_providers():
+            return ["CUDAExecutionProvider", "CPUExecutionProvider"]
+        return ["CPUExecutionProvider"]
+
+    def get_export_path(self, width: int, height: int) -> str:
+        stem = os.path.splitext(os.path.basename(self.weights_path))[0]
+        return os.path.join(self.cache_directory, f"{stem}_{self.weights_hash}_{width}x{height}.onnx")
+
+    def export(self, width: int, height: int) -> str:
+        """
+        Exports the weights to ONNX for the given input size, unless a cached export exists already.
+        """
+        if self.weights_path.endswith(".onnx"):
+            return self.weights_path
+
+        export_path = self.get_export_path(width=width, height=height)
+        if os.path.isfile(export_path):
+            return export_path
+
+        self.logger.info(f"Exporting {self.weights_path} to ONNX with input size {width}x{height}, this only happens once")
+        os.makedirs(self.cache_directory, exist_ok=True)
+        exported_path = YOLO(model=self.weights_path).export(format="onnx", imgsz=(height, width), dynamic=False, simplify=True, device="cpu", verbose=False)
+        shutil.move(exported_path, export_path)
+        return export_path
+
+    def get_session(self, width: int, height: int) -> ort.InferenceSession:
+        with self.session_lock:
+            if (width, height) not in self.sessions:
+                options = ort.SessionOptions()
+                options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+                options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+                options.intra_op_num_threads = self.intra_op_threads or 0  # 0 lets ONNX Runtime pick the amount of physical cores
+                options.inter_op_num_threads = self.inter_op_threads or 1
+                self.sessions[(width, height)] = ort.InferenceSession(self.export(width=width, height=height), sess_options=options, providers=self.get_providers())
+                self.logger.info(f"Created ONNX Runtime session for {width}x{height} with providers {self.sessions[(width, height)].get_providers()}")
+            return self.sessions[(width, height)]
+
+    def __call__(self, image: np.ndarray, conf: float = 0.25, classes: Optional[list[int]] = None) -> np.ndarray:
+        height, width = image.shape[:2]
+        session = self.get_session(width=width, height=height)
+
+        model_height, model_width = session.get_inputs()[0].shape[2:]
+        rescale = isinstance(model_width, int) and isinstance(model_height, int) and (model_width, model_height) != (width, height)
+        if rescale:
+            image = cv2.resize(src=image, dsize=(model_width, model_height))  # Only for .onnx weights made for another input size
+
+        blob = cv2.dnn.blobFromImage(image, scalefactor=1 / 255, swapRB=True)  # HWC BGR uint8 to NCHW RGB float32 in [0, 1], as ultralytics preprocesses
+        output = session.run(None, {session.get_inputs()[0].name: blob})[0][0]
+        boxes = self.postprocess(output=output, conf=conf, classes=classes)
+
+        if rescale:
+            boxes[:, [0, 2]] *= width / model_width
+            boxes[:, [1, 3]] *= height / model_height
+        return boxes
+
+    def postprocess(self, output: np.ndarray, conf: float, classes: Optional[list[int]] = None) -> np.ndarray:
+        """
+        Converts the raw output of a single image to [x1, y1, x2, y2, confidence, class_id] rows, only of the class indices in classes if passed.
+
+        End-to-end models like YOLOv10 already output (max_detections, 6) rows in that layout. Other models output (4 + classes, anchors) with center based boxes, which still
+        need non maximum suppression per class. Only the scores of the requested classes are considered, so boxes of other classes never reach the suppression.
+
+        """
+        if output.ndim == 2 and output.shape[1] == 6:
+            mask = output[:, 4] > conf
+            if classes is not None:
+                mask &= np.isin(output[:, 5].astype(np.int64), classes)
+            return output[mask].astype(np.float32)
+
+        predictions = output.T
+        class_columns = np.arange(predictions.shape[1] - 4) if classes is None else np.asarray(classes, dtype=np.int64)
+        if len(class_columns) == 0:
+            return np.zeros((0, 6), dtype=np.float32)
+        class_ids = class_columns[predictions[:, 4 + class_columns].argmax(axis=1)]
+        scores = predictions[np.arange(len(predictions)), 4 + class_ids]
+        mask = scores > conf
+        predictions, class_ids, scores = predictions[mask], class_ids[mask], scores[mask]
+        if len(predictions) == 0:
+            return np.zeros((0, 6), dtype=np.float32)
+
+        boxes = np.empty((len(predictions), 4), dtype=np.float32)
+        boxes[:, :2] = predictions[:, :2] - predictions[:, 2:4] / 2
+        boxes[:, 2:] = predictions[:, :2] + predictions[:, 2:4] / 2
+
+        offset_boxes = boxes + class_ids[:, None] * 4096  # Offsets the boxes per class, so a single NMS call never suppresses boxes of another class
+        keep = cv2.dnn.NMSBoxes(bboxes=np.column_stack([offset_boxes[:, :2], offset_boxes[:, 2:] - offset_boxes[:, :2]]).tolist(), scores=scores.tolist(), score_threshold=conf, nms_threshold=self.iou_threshold, top_k=self.max_detections)
+        keep = np.asarray(keep, dtype=np.int64).reshape(-1)
+        return np.column_stack([boxes[keep], scores[keep], class_ids[keep]]).astype(np.float32)
+
+
+class LoadModelOnnx(LoadModel):
+    """
+    This class is responsible for loading in YOLO models for inference with ONNX Runtime, exported from the .pt weights.
+    """
+    def __init__(self, model_name: str, weights_file: str, num_classes: int = 1, device: str = "cpu", intra_op_threads: Optional[int] = None, inter_op_threads: Optional[int] = None):
+        super().__init__(weights_file=weights_file, num_classes=num_classes, device=device)
+        self.model_name = model_name
+        self.intra_op_threads = intra_op_threads
+        self.inter_op_threads = inter_op_threads
+
+    def load_model(self) -> OnnxModel:
+        """
+        Returns an OnnxModel for the weights, the export to ONNX happens on the first inference with a given input size.
+        """
+        self.logger.info(f"Loading {self.weights_file} for ONNX Runtime")
+        weights_path = str(os.path.join(self.base_path, "models", "architectures", self.model_name, self.weights_file))
+        return OnnxModel(weights_path=weights_path, device=self.device, intra_op_threads=self.intra_op_threads, inter_op_threads=self.inter_op_threads)
@@ -0,0 +1,188 @@
+import argparse
+import json
+import os
+import time
+from typing import Iterator, Optional
+
+import cv2
+import numpy as np
+from onnxruntime.quantization import CalibrationDataReader, CalibrationMethod, QuantFormat, QuantType, quantize_static
+from onnxruntime.quantization.shape_inference import quant_pre_process
+
+from config.config_parser import ConfigParser
+from elements.load_model.load_model_onnx import OnnxModel
+from elements.predictors.utils.video_reader import VideoReader
+from elements.utils import Logger
+
+logger = Logger.setup_logger()
+
+
+def sample_frames(video_paths: list[str], amount: int, width: int, height: int, offset: float = 0.0) -> Iterator[np.ndarray]:
+    """
+    Yields amount frames spread evenly over all videos, resized to the input size of the model.
+
+    :param offset: Fraction of the distance between two samples to shift the samples by, so calibration and evaluation frames differ
+
+    """
+    per_video = max(1, amount // len(video_paths))
+    for video_path in video_paths:
+        with VideoReader(video_path) as video_reader:
+            if video_reader.total_frames <= 0:
+                logger.warning(f"Skipping {video_path}, its length is unknown")
+                continue
+            step = video_reader.total_frames / per_video
+            for i in range(per_video):
+                video_reader.seek(int((i + offset) * step))
+                success, image = video_reader.vidcap.read()
+                if success:
+                    yield cv2.resize(src=image, dsize=(width, height))
+
+
+class FrameCalibrationReader(CalibrationDataReader):
+    """
+    Feeds frames sampled from videos to the static quantization calibration, preprocessed like OnnxModel does.
+    """
+    def __init__(self, input_name: str, frames: Iterator[np.ndarray]):
+        self.input_name = input_name
+        self.frames = frames
+
+    def get_next(self) -> Optional[dict[str, np.ndarray]]:
+        image = next(self.frames, None)
+        if image is None:
+            return None
+        return {self.input_name: cv2.dnn.blobFromImage(image, scalefactor=1 / 255, swapRB=True)}
+
+
+def box_iou_matrix(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+    """
+    Intersection over union of every box in boxes_a with every box in boxes_b, both (N, 4) arrays of [x1, y1, x2, y2].
+    """
+    top_left = np.maximum(boxes_a[:, None, :2], boxes_b[None, :, :2])
+    bottom_right = np.minimum(boxes_a[:, None, 2:], boxes_b[None, :, 2:])
+    intersection = np.clip(bottom_right - top_left, 0, None).prod(axis=2)
+    area_a = (boxes_a[:, 2:] - boxes_a[:, :2]).prod(axis=1)
+    area_b = (boxes_b[:, 2:] - boxes_b[:, :2]).prod(axis=1)
+    union = area_a[:, None] + area_b[None, :] - intersection
+    return np.where(union > 0, intersection / np.maximum(union, 1e-9), 0.0)
+
+
+def match_detections(reference: np.ndarray, candidate: np.ndarray, iou_threshold: float = 0.5) -> list[tuple[int, int, float]]:
+    """
+    Greedily matches the candidate detections to the reference detections of the same class, best overlap first.
+
+    :return: List of (reference_index, candidate_index, iou) per match.
+
+    """
+    if len(reference) == 0 or len(candidate) == 0:
+        return []
+    ious = box_iou_matrix(reference[:, :4], candidate[:, :4])
+    ious[reference[:, 5][:, None] != candidate[:, 5][None, :]] = 0.0
+
+    matches = []
+    while True:
+        i, j = np.unravel_index(np.argmax(ious), ious.shape)
+        if ious[i, j] < iou_threshold:
+            return matches
+        matches.append((int(i), int(j), float(ious[i, j])))
+        ious[i, :] = 0.0
+        ious[:, j] = 0.0
+
+
+def compare_models(reference: OnnxModel, candidate: OnnxModel, frames: list[np.ndarray], conf: float) -> dict:
+    """
+    Runs both models on the frames and reports their latency and how well the detections of the candidate agree with those of the reference.
+    """
+    height, width = frames[0].shape[:2]
+    latencies = {"reference": [], "candidate": []}
+    reference_detections = candidate_detections = matched = 0
+    ious, confidence_deltas = [], []
+
+    for model in (reference, candidate):
+        model(frames[0], conf=conf)  # Warm up, creating the session and allocating its buffers
+
+    for image in frames:
+        start = time.perf_counter()
+        reference_boxes = reference(image, conf=conf)
+        latencies["reference"].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        candidate_boxes = candidate(image, conf=conf)
+        latencies["candidate"].append(time.perf_counter() - start)
+
+        matches = match_detections(reference=reference_boxes, candidate=candidate_boxes)
+        reference_detections += len(reference_boxes)
+        candidate_detections += len(candidate_boxes)
+        matched += len(matches)
+        ious += [iou for _, _, iou in matches]
+        confidence_deltas += [abs(float(reference_boxes[i, 4] - candidate_boxes[j, 4])) for i, j, _ in matches]
+
+    reference_ms = float(np.mean(latencies["reference"]) * 1000)
+    candidate_ms = float(np.mean(latencies["candidate"]) * 1000)
+    return {
+        "input_size": f"{width}x{height}",
+        "evaluation_frames": len(frames),
+        "box_threshold": conf,
+        "fp32_ms_per_frame": round(reference_ms, 2),
+        "int8_ms_per_frame": round(candidate_ms, 2),
+        "speedup": round(reference_ms / candidate_ms, 2) if candidate_ms > 0 else None,
+        "fp32_detections": reference_detections,
+        "int8_detections": candidate_detections,
+        "matched_detections": matched,
+        "recall_vs_fp32": round(matched / reference_detections, 4) if reference_detections else None,
+        "precision_vs_fp32": round(matched / candidate_detections, 4) if candidate_detections else None,
+        "mean_matched_iou": round(float(np.mean(ious)), 4) if ious else None,
+        "mean_confidence_delta": round(float(np.mean(confidence_deltas)), 4) if confidence_deltas else None,
+    }
+
+
+def quantize(architecture: str, weights: str, video_paths: list[str], calibration_frames: int = 200, evaluation_frames: int = 100, per_channel: bool = True) -> dict:
+    """
+    Creates a statically quantized INT8 variant of the weights next to them in models/architectures/<architecture>/, calibrated on frames of the videos.
+
+    The variant gets compared to the fp32 model on other frames of the same videos, the report gets saved as JSON next to the variant and returned.
+
+    """
+    config = ConfigParser().get_current_config(architecture=architecture, weights=weights)
+    width, height = int(config.input_width), int(config.input_height)
+    weights_path = os.path.join("models", "architectures", architecture, weights)
+    stem = os.path.splitext(weights)[0]
+    output_path = os.path.join("models", "architectures", architecture, f"{stem}_int8.onnx")
+
+    fp32_model = OnnxModel(weights_path=weights_path, device="cpu")
+    fp32_path = fp32_model.export(width=width, height=height)
+    preprocessed_path = os.path.join(fp32_model.cache_directory, f"{stem}_{fp32_model.weights_hash}_{width}x{height}_preprocessed.onnx")
+    quant_pre_process(fp32_path, preprocessed_path)
+
+    logger.info(f"Calibrating {weights} on {calibration_frames} frames of {len(video_paths)} videos")
+    input_name = fp32_model.get_session(width=width, height=height).get_inputs()[0].name
+    quantize_static(model_input=preprocessed_path, model_output=output_path, calibration_data_reader=FrameCalibrationReader(input_name=input_name, frames=sample_frames(video_paths=video_paths, amount=calibration_frames, width=width, height=height)), quant_format=QuantFormat.QDQ, activation_type=QuantType.QUInt8, weight_type=QuantType.QInt8, per_channel=per_channel, calibrate_method=CalibrationMethod.MinMax)
+    logger.info(f"Saved the INT8 variant to {output_path}")
+
+    frames = list(sample_frames(video_paths=video_paths, amount=evaluation_frames, width=width, height=height, offset=0.5))
+    report = {
+        "architecture": architecture,
+        "weights": weights,
+        "int8_weights": os.path.basename(output_path),
+        "videos": video_paths,
+        "calibration_frames": calibration_frames,
+        **compare_models(reference=fp32_model, candidate=OnnxModel(weights_path=output_path, device="cpu"), frames=frames, conf=float(config.box_threshold)),
+    }
+
+    report_path = os.path.join("models", "architectures", architecture, f"{stem}_int8.json")
+    with open(report_path, "w") as file:
+        json.dump(report, file, indent=2)
+    logger.info(f"Accuracy and speed of the INT8 variant compared to fp32, saved to {report_path}: {json.dumps(report, indent=2)}")
+    return report
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Creates an INT8 variant of YOLO weights for ONNX Runtime on the CPU, calibrated on frames of your own videos. Run from the root of the repository.")
+    parser.add_argument('--architecture', type=str, default="yolov10", help="Architecture folder in models/architectures the weights are in")
+    parser.add_argument('--weights', type=str, default="yolov10_tracker.pt", help="Name of the .pt weights file to quantize")
+    parser.add_argument('--videos', type=str, nargs="+", required=True, help="Videos to sample calibration and evaluation frames from")
+    parser.add_argument('--calibration-frames', type=int, default=200, help="Amount of frames to calibrate the activation ranges on")
+    parser.add_argument('--evaluation-frames', type=int, default=100, help="Amount of other frames to compare the INT8 variant to the fp32 model on")
+    parser.add_argument('--per-tensor', action="store_true", help="Quantize the weights per tensor instead of per channel, faster on some CPUs but less accurate")
+    args = parser.parse_args()
+
+    quantize(architecture=args.architecture, weights=args.weights, video_paths=args.videos, calibration_frames=args.calibration_frames, evaluation_frames=args.evaluation_frames, per_channel=not args.per_tensor)
@@ -23,3 +23,5 @@ class ModelConfig:
     mean: Optional[float] = None
     std: Optional[float] = None
     tracker: Optional[str] = None
+    intra_op_threads: Optional[int] = None
+    inter_op_threads: Optional[int] = None
@@ -1,8 +1,8 @@
+import json
 import statistics
 import threading
 import time
 from abc import ABC, abstractmethod
-from copy import deepcopy
 from typing import Optional
 import traceback
 
@@ -13,12 +13,20 @@ import torch
 
 from elements.benchmark_timer import BenchmarkTimer
 from elements.cycling_timer import CyclingTimer
+from elements.datatypes.boundingbox import BoundingBox
 from elements.display import Display
 from elements.enums import ApplicationMode
 from elements.locker import Locker
 from elements.predictors.parameters import PredictorParameters
+from elements.predictors.utils.async_image_writer import AsyncImageWriter
 from elements.predictors.utils.box_processor import BoxProcessor
+from elements.predictors.utils.detection_cache import DetectionCache
+from elements.predictors.utils.frame_pool import FramePool
+from elements.predictors.utils.motion_gate import MotionGate
+from elements.predictors.utils.pipeline import FramePipeline, FramePacket
 from elements.predictors.utils.predictor import Predictor
+from elements.predictors.utils.realtime_scheduler import RealtimeScheduler
+from elements.predictors.utils.resolution_controller import ResolutionController
 from elements.predictors.utils.result_saver import ResultSaver
 from elements.processing.postprocessing.object_detection.combine_boxes import CombineBoxes
 from elements.processing.preprocessing.resize import Resize
@@ -48,14 +56,35 @@ class PredictorBase(ABC):
         self.locker = locker
         self.aborting = None
         self.predictor_parameters = predictor_parameters
-
-        if self.general_settings.reset_stats_min > 0:
-            self.cycling_timer = CyclingTimer(name="Reset stats timer", minutes=self.general_settings.reset_stats_min, fn=self.update_settings, locker=self.locker)
-            self.t = threading.Thread(target=self.cycling_timer.start)
-            self.t.start()
+        self.pipeline: Optional[FramePipeline] = None
+        self.detection_cache: Optional[DetectionCache] = None
+        self.motion_gate: Optional[MotionGate] = None
+        self.resolution_controller: Optional[ResolutionController] = None
+        self.realtime_scheduler: Optional[RealtimeScheduler] = None
+        self.detection_interval = 1  # The detector runs on every x-th frame, set per video by the predictors supporting it
+        self.frame_pool: Optional[FramePool] = self.initialize_frame_pool()
+        self.cycling_timer: Optional[CyclingTimer] = self.initialize_cycling_timer()
 
         self.predictor, self.box_processor, self.result_saver, self.combine_boxes = self.initialize_helpers()
 
+    def initialize_frame_pool(self) -> Optional[FramePool]:
+        """
+        Instantiate the FramePool the frames get rendered into.
+        """
+        # Rendered frames in use at once: those in the pipeline queues after rendering or the frames of a batch, plus the one being rendered and the one last returned
+        return FramePool(size=2 * self.general_settings.pipeline_queue_size + self.general_settings.batch_size + 2)
+
+    def initialize_cycling_timer(self) -> Optional[CyclingTimer]:
+        """
+        Starts the timer resetting the statistics every reset_stats_min minutes on its own thread, if set.
+        """
+        if self.general_settings.reset_stats_min <= 0:
+            return None
+        cycling_timer = CyclingTimer(name="Reset stats timer", minutes=self.general_settings.reset_stats_min, fn=self.request_statistics_reset, locker=self.locker)
+        self.t = threading.Thread(target=cycling_timer.start)
+        self.t.start()
+        return cycling_timer
+
     def initialize_helpers(self) -> tuple[Predictor, BoxProcessor, ResultSaver, CombineBoxes]:
         """
         Instantiate building blocks for the prediction process and postprocessing like Predictor, BoxProcessor, ResultSaver and CombineBoxes.
@@ -84,7 +113,8 @@ class PredictorBase(ABC):
         """
         Instantiate the result saver from general settings and model settings.
         """
-        return ResultSaver(output_folder=self.general_settings.output_folder)
+        image_writer = AsyncImageWriter(image_format=self.general_settings.image_format, compression=self.general_settings.image_compression, max_pending=self.general_settings.image_queue_size)
+        return ResultSaver(output_folder=self.general_settings.output_folder, video_queue_size=self.general_settings.video_queue_size, overflow_policy=self.general_settings.video_overflow_policy, image_writer=image_writer, segment_seconds=self.general_settings.segment_minutes * 60, segment_bytes=int(self.general_settings.segment_max_mb * 1024 * 1024), export_tracks=self.general_settings.export_tracks, classes=self.general_settings.classes)
 
     def initialize_combine_boxes(self) -> CombineBoxes:
         """
@@ -92,25 +122,50 @@ class PredictorBase(ABC):
         """
         return CombineBoxes(general_settings=self.general_settings, color_map=self.color_map)
 
-    def update_settings(self) -> None:
+    def apply_tracking_changes(self) -> None:
+        """
+        Applies the tracker changes and statistics reset requested from the GUI since the last frame, called while holding the lock.
         """
-        Resets the tracker.
+        if self.tracking_settings.reset:
+            self.update_settings()
+        if self.tracking_settings.reset_stats:
+            self.reset_statistics()
+
+    def update_settings(self) -> None:
         """
-        _, tracker_processor = TrackerFactory.create(general_settings=self.general_settings, tracking_settings=self.tracking_settings, model_settings=self.model_settings)
-        self.predictor_parameters.tracker_processor = tracker_processor
+        Applies changed tracker settings. Changed parameters get applied to the running tracker in place if it supports that, which keeps its appearance model loaded and its
+        tracks and counts alive. Another tracker gets created from scratch.
+
+        The Predictor, BoxProcessor and CombineBoxes read the settings on every frame, so they are kept.
 
-        self.box_processor = self.initialize_box_processor()
-        self.predictor = self.initialize_predictor()
-        self.combine_boxes = self.initialize_combine_boxes()
+        """
+        if not TrackerFactory.reconfigure(general_settings=self.general_settings, tracking_settings=self.tracking_settings, tracker_processor=self.predictor_parameters.tracker_processor):
+            _, tracker_processor = TrackerFactory.create(general_settings=self.general_settings, tracking_settings=self.tracking_settings, model_settings=self.model_settings)
+            self.predictor_parameters.tracker_processor = tracker_processor
 
         self.tracking_settings.reset = False
 
+    def reset_statistics(self) -> None:
+        """
+        Zeroes the counts and forgets the counted tracks, the tracker itself keeps running. Requested by the reset stats timer and the reset button in the GUI.
+        """
+        self.predictor_parameters.tracker_processor.reset_statistics()
+        self.tracking_settings.reset_stats = False
+
+    def request_statistics_reset(self) -> None:
+        """
+        Lets the next frame reset the statistics, so the tracker only gets changed by the thread tracking the frames. Invoked by the reset stats timer.
+        """
+        self.tracking_settings.reset_stats = True
+
     def abort(self) -> None:
         """
         Stops the analyzing, invoked by user interactions with the GUI.
         """
         self.aborting = True
-        if self.general_settings.reset_stats_min > 0:
+        if self.pipeline is not None:
+            self.pipeline.cancel()
+        if self.cycling_timer is not None:
             self.cycling_timer.stop()
 
     def wait_for_websocket(self) -> None:
@@ -127,14 +182,227 @@ class PredictorBase(ABC):
         """
         Set the base64 representation of the image as a response in the websocket instance.
         """
+        if self.general_settings.application_mode != ApplicationMode.GUI:
+            return
+
         _, buffer = cv2.imencode('.jpg', image, params=[int(cv2.IMWRITE_JPEG_QUALITY), 85])  # Convert the frame to JPG format
 
         frame_base64 = pybase64.b64encode(buffer).decode('utf-8')  # Encode to base64
 
-        if self.general_settings.application_mode == ApplicationMode.GUI:
-            self.websocket.set_response(response=frame_base64)
+        self.websocket.set_response(response=frame_base64)
+
+    def detect_frame(self, image: np.ndarray, frame_index: Optional[int] = None, input_size: Optional[tuple[int, int]] = None, inference_size: Optional[tuple[int, int]] = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Resizes the image to the input size of the model and returns it together with the numpy representation of the boxes predicted on it.
+
+        With a detection cache, the boxes of the frame at frame_index get replayed from the cache if possible, and stored in it otherwise. With a motion gate, frames without
+        motion get no boxes instead of being detected. With a resolution controller, the image gets detected at the size it picked and the boxes are scaled back to the input size.
+
+        The input and inference size are taken from the settings unless passed, the pipeline passes the sizes it took under the lock.
+
+        """
+        input_size = input_size if input_size is not None else self.get_input_size()
+        image = cv2.resize(src=image, dsize=input_size)
+
+        boxes = self.get_cached_detections(frame_index=frame_index)
+        if boxes is None and not self.gate_frame(image=image):
+            boxes = np.zeros((0, 6), dtype=np.float32)
+        if boxes is None:
+            inference_size = inference_size if inference_size is not None else self.get_inference_size()
+            predictions = self.predictor.predict(image=self.resize_for_inference(image=image, inference_size=inference_size))
+            boxes = self.scale_to_input(boxes=self.box_processor.extract_boxes(predictions=predictions), inference_size=inference_size, input_size=input_size)
+            self.cache_detections(frame_index=frame_index, boxes=boxes)
+        return image, boxes
+
+    def detect_frames(self, images: list[np.ndarray], frame_indices: Optional[list[Optional[int]]] = None) -> list[tuple[np.ndarray, np.ndarray]]:
+        """
+        Like detect_frame, but runs a batch of consecutive images through the model in a single forward pass. The results are in the order of the images.
+
+        Only the images without cached detections get passed to the model.
+
+        """
+        images = [cv2.resize(src=image, dsize=self.get_input_size()) for image in images]
+        frame_indices = frame_indices if frame_indices is not None else [None] * len(images)
+
+        boxes = [self.get_cached_detections(frame_index=frame_index) for frame_index in frame_indices]
+        for i, image in enumerate(images):
+            if boxes[i] is None and not self.gate_frame(image=image):
+                boxes[i] = np.zeros((0, 6), dtype=np.float32)
+        missing = [i for i, cached in enumerate(boxes) if cached is None]
+        if missing:
+            inference_size = self.get_inference_size()
+            predictions = self.predictor.predict_batch(images=[self.resize_for_inference(image=images[i], inference_size=inference_size) for i in missing])
+            for i, prediction in zip(missing, predictions):
+                boxes[i] = self.scale_to_input(boxes=self.box_processor.extract_boxes(predictions=prediction), inference_size=inference_size)
+                self.cache_detections(frame_index=frame_indices[i], boxes=boxes[i])
+        return list(zip(images, boxes))
+
+    def get_input_size(self) -> tuple[int, int]:
+        """
+        Returns the (width, height) the tracker, rendering and exports work in.
+        """
+        return int(self.general_settings.input_width), int(self.general_settings.input_height)
+
+    def get_inference_size(self) -> tuple[int, int]:
+        """
+        Returns the (width, height) images get detected at, the input size unless a resolution controller picked a smaller one.
+        """
+        if self.resolution_controller is None:
+            return self.get_input_size()
+        return self.resolution_controller.get_size(base_size=self.get_input_size())
+
+    def resize_for_inference(self, image: np.ndarray, inference_size: tuple[int, int]) -> np.ndarray:
+        """
+        Resizes an image of the input size to the inference size, if they differ.
+        """
+        if (image.shape[1], image.shape[0]) == inference_size:
+            return image
+        return cv2.resize(src=image, dsize=inference_size, interpolation=cv2.INTER_AREA)
+
+    def scale_to_input(self, boxes: np.ndarray, inference_size: tuple[int, int], input_size: Optional[tuple[int, int]] = None) -> np.ndarray:
+        """
+        Scales the (N, 6) boxes detected at the inference size to the input size the tracker, rendering and exports work in, in place.
+        """
+        input_size = input_size if input_size is not None else self.get_input_size()
+        if inference_size != input_size:
+            Resize.resize_boxes(boxes=list(boxes), dimension_from=inference_size, dimension_to=input_size)  # The rows are views on boxes, so scaling them scales boxes
+        return boxes
+
+    def get_cached_detections(self, frame_index: Optional[int]) -> Optional[np.ndarray]:
+        """
+        Returns the detections of a frame from the detection cache, filtered like fresh detections, or None if there is no cache or the frame can not be replayed from it.
+        """
+        if self.detection_cache is None or frame_index is None:
+            return None
+        boxes = self.detection_cache.get(frame_index=frame_index, box_threshold=self.general_settings.box_threshold)
+        return self.box_processor.extract_boxes(predictions=boxes) if boxes is not None else None
+
+    def gate_frame(self, image: np.ndarray) -> bool:
+        """
+        Returns whether the detector has to run on the image, always without a motion gate.
+        """
+        if self.motion_gate is None:
+            return True
+        return self.motion_gate.check(image=image, tracking=len(self.predictor_parameters.tracker_processor.alive_ids) > 0)
+
+    def cache_detections(self, frame_index: Optional[int], boxes: np.ndarray) -> None:
+        """
+        Stores the detections of a frame in the detection cache if there is one.
+        """
+        if self.detection_cache is not None and frame_index is not None:
+            self.detection_cache.put(frame_index=frame_index, boxes=boxes, box_threshold=self.general_settings.box_threshold)
+
+    def get_detection_interval(self, fps: Optional[float]) -> int:
+        """
+        Returns on which frames of a source with the given fps the detector has to run, from the detection rate if set and the fps is known, otherwise the detection interval.
+        """
+        if self.general_settings.detection_fps > 0 and fps:
+            return max(1, round(fps / self.general_settings.detection_fps))
+        return max(1, int(self.general_settings.detection_interval))
+
+    def is_keyframe(self, frame_index: Optional[int]) -> bool:
+        """
+        Returns whether the detector runs on the frame at frame_index, frames without an index always get detected.
+        """
+        return self.detection_interval <= 1 or frame_index is None or frame_index % self.detection_interval == 0
+
+    def track_frame(self, image: np.ndarray, boxes_numpy: np.ndarray) -> tuple[list[BoundingBox], bool]:
+        """
+        Updates the tracker state with the boxes of a frame and returns the boxes of the active tracks, plus whether a new object got counted.
+        """
+        try:
+            active_boxes = self.predictor_parameters.tracker_processor.update_boxes(boxes=boxes_numpy, image=image)
+        except Exception as e:
+            self.logger.error(traceback.format_exc())
+            self.logger.error(e)
+            active_boxes = []
+
+        boxes_from_active_tracks = self.predictor_parameters.tracker_processor.get_boxes_from_active_tracks(active_tracks=active_boxes)
+        save_image = self.predictor_parameters.tracker_processor.update_tracks(active_tracks=boxes_from_active_tracks, verbose=False)
+        return boxes_from_active_tracks, save_image
+
+    def propagate_frame(self) -> tuple[list[BoundingBox], bool]:
+        """
+        Like track_frame for a frame that is not detected, the active tracks get extrapolated from the last detected frame. They are known already, so nothing new gets counted.
+        """
+        active_boxes = self.predictor_parameters.tracker_processor.propagate_boxes()
+        boxes_from_active_tracks = self.predictor_parameters.tracker_processor.get_boxes_from_active_tracks(active_tracks=active_boxes)
+        save_image = self.predictor_parameters.tracker_processor.update_tracks(active_tracks=boxes_from_active_tracks, verbose=False)
+        return boxes_from_active_tracks, save_image
+
+    def export_tracks(self, boxes_from_active_tracks: list[BoundingBox], frame_index: Optional[int], timestamp: Optional[float], source_image: np.ndarray, input_size: Optional[tuple[int, int]] = None) -> None:
+        """
+        Records the active tracks of a frame with the TrackExporter of the ResultSaver if exporting is enabled, with the boxes in the coordinates of the source image.
+        """
+        if self.result_saver.track_exporter is None or frame_index is None:
+            return
+
+        input_size = input_size if input_size is not None else self.get_input_size()
+        scale = (source_image.shape[1] / input_size[0], source_image.shape[0] / input_size[1])
+        self.result_saver.track_exporter.append(frame_index=frame_index, timestamp=timestamp if timestamp is not None else time.time(), boxes=boxes_from_active_tracks, scale=scale)
+
+    def render_frame(self, image: np.ndarray, boxes_from_active_tracks: list[BoundingBox], display: Optional[Display], input_size: Optional[tuple[int, int]] = None, count_text: Optional[str] = None, show: bool = True) -> np.ndarray:
+        """
+        Visualizes the boxes and counts on top of the original image and displays the result if a Display instance is passed.
+
+        The image gets resized into a reused buffer of the FramePool and everything is drawn on that buffer in place, so the original image is never copied.
+
+        :param input_size: Size the boxes are in, the input size of the settings unless passed
+        :param count_text: The formatted counts to show, the current counts of the tracker unless passed
+        :param show: Whether to show the result on the display right away. The pipeline shows it on the thread handling the window events instead
+
+        """
+        input_size = input_size if input_size is not None else self.get_input_size()
+        visualization_image = self.frame_pool.next(width=int(self.general_settings.screen_width), height=int(self.general_settings.screen_height))
+        cv2.resize(image, (visualization_image.shape[1], visualization_image.shape[0]), dst=visualization_image)
+        boxes_from_active_tracks = Resize.resize_boxes(boxes=boxes_from_active_tracks, dimension_from=input_size, dimension_to=(visualization_image.shape[1], visualization_image.shape[0]))
+
+        if boxes_from_active_tracks:
+            self.combine_boxes.set_boxes(boxes=boxes_from_active_tracks)
+            visualization_image = self.combine_boxes.apply(image=visualization_image)
+
+        visualization_image = self.predictor_parameters.tracker_processor.update_count(image=visualization_image, background_fill=True, text=count_text)
+
+        if len(self.last_times) > 3:
+            fps = 1 / (statistics.mean(self.last_times))
+            visualization_image = draw_fps_text(image=visualization_image, text=f"FPS: {round(fps, 1)}")
+
+        if display is not None:
+            if self.cycling_timer is not None:
+                left, percentage = self.cycling_timer.get_time_left()
+                text = "Resetting statistics in:"
+                visualization_image = draw_progress_bar(image=visualization_image, text=f"{text} {str(left)}", percentage=percentage)
+
+            if show:
+                display.show_image(visualization_image)
+
+        return visualization_image
+
+    def publish_frame(self, show_image: np.ndarray, save_image: bool) -> None:
+        """
+        Hands a processed frame to the outputs: the result video, the images with new objects and the websocket response.
+        """
+        if self.general_settings.save_results:
+            self.result_saver.append_image_to_video(image=show_image)
+
+        if self.general_settings.save_new_objects and save_image:
+            self.result_saver.save_image(image=show_image)
+
+        self.set_response(image=show_image)
 
-    def process_frame(self, image: np.ndarray, display: Optional[Display]) -> tuple[np.ndarray, bool]:
+    def add_frame_time(self, elapsed: float) -> None:
+        """
+        Keeps the processing times of the last 10 frames, used to display the FPS, and passes the time to the resolution controller if there is one.
+        """
+        self.last_times.append(elapsed)
+        if len(self.last_times) > 10:
+            self.last_times = self.last_times[-10:]
+        if self.resolution_controller is not None:
+            level = self.resolution_controller.level
+            if self.resolution_controller.update(frame_time=elapsed) != level:
+                self.logger.info(f"Changed the detection size to {self.get_inference_size()} to hold {self.resolution_controller.target_fps} fps")
+
+    def process_frame(self, image: np.ndarray, display: Optional[Display], detection: Optional[tuple[np.ndarray, np.ndarray]] = None, detection_time: float = 0.0, frame_index: Optional[int] = None, timestamp: Optional[float] = None) -> tuple[np.ndarray, bool]:
         """
         Performs inference on a single image using the predictor passed.
 
@@ -144,53 +412,148 @@ class PredictorBase(ABC):
         3. Visualizes the boxes on top of the original image
         4. Display the resulting image if a Display instance is passed
 
+        :param detection: The result of detect_frame(s) for this image if it got detected already, for example as part of a batch
+        :param detection_time: The time in seconds already spent on detecting this image, counted in the FPS
+        :param frame_index: Index of the frame in the source, the active tracks get exported if passed and exporting is enabled. Frames that are not keyframes get no detections
+        :param timestamp: Time of the frame in seconds, the position in a video file or the capture time of a camera frame
+
         """
         processing_timer = BenchmarkTimer("Process frame", print_time=False)
 
         with processing_timer:
-            visualization_image = deepcopy(image)
+            if detection is None and not self.is_keyframe(frame_index=frame_index):
+                boxes_from_active_tracks, save_image = self.propagate_frame()
+            else:
+                input_image, boxes_numpy = self.detect_frame(image=image, frame_index=frame_index) if detection is None else detection
+                boxes_from_active_tracks, save_image = self.track_frame(image=input_image, boxes_numpy=boxes_numpy)
+            self.export_tracks(boxes_from_active_tracks=boxes_from_active_tracks, frame_index=frame_index, timestamp=timestamp, source_image=image)
+            visualization_image = self.render_frame(image=image, boxes_from_active_tracks=boxes_from_active_tracks, display=display)
 
-            image = cv2.resize(src=image, dsize=(int(self.general_settings.input_width), int(self.general_settings.input_height)))
+        self.add_frame_time(processing_timer.elapsed_real_time() + detection_time)
 
-            predictions = self.predictor.predict(image=image)
-            boxes_numpy = self.box_processor.extract_boxes(predictions=predictions)
-
-            try:
-                active_boxes = self.predictor_parameters.tracker_processor.update_boxes(boxes=boxes_numpy, image=image)
-            except Exception as e:
-                self.logger.error(traceback.format_exc())
-                self.logger.error(e)
-                active_boxes = []
-
-            boxes_from_active_tracks = self.predictor_parameters.tracker_processor.get_boxes_from_active_tracks(active_tracks=active_boxes)
-            save_image = self.predictor_parameters.tracker_processor.update_tracks(active_tracks=boxes_from_active_tracks, verbose=False)
+        return visualization_image, save_image
 
-            visualization_image = cv2.resize(visualization_image, (self.general_settings.screen_width, self.general_settings.screen_height))
-            boxes_from_active_tracks = Resize.resize_boxes(boxes=boxes_from_active_tracks, dimension_from=(int(self.general_settings.input_width), int(self.general_settings.input_height)), dimension_to=(int(self.general_settings.screen_width), int(self.general_settings.screen_height)))
+    def process_batch(self, images: list[np.ndarray], display: Optional[Display], frame_indices: Optional[list[int]] = None, timestamps: Optional[list[float]] = None) -> list[tuple[np.ndarray, bool]]:
+        """
+        Like process_frame, but detects the objects in all keyframes among the images in a single forward pass. The images get tracked in order.
+        """
+        frame_indices = frame_indices if frame_indices is not None else [None] * len(images)
+        keyframes = [i for i, frame_index in enumerate(frame_indices) if self.is_keyframe(frame_index=frame_index)]
+
+        detections: list[Optional[tuple[np.ndarray, np.ndarray]]] = [None] * len(images)
+        detection_timer = BenchmarkTimer("Detect batch", print_time=False)
+        with detection_timer:
+            if keyframes:
+                for i, detection in zip(keyframes, self.detect_frames(images=[images[i] for i in keyframes], frame_indices=[frame_indices[i] for i in keyframes])):
+                    detections[i] = detection
+        detection_time = detection_timer.elapsed_real_time() / len(images)
+
+        timestamps = timestamps if timestamps is not None else [None] * len(images)
+        return [
+            self.process_frame(image=image, display=display, detection=detection, detection_time=detection_time, frame_index=frame_index, timestamp=timestamp)
+            for image, detection, frame_index, timestamp in zip(images, detections, frame_indices, timestamps)
+        ]
+
+    def process_and_publish_batch(self, images: list[np.ndarray], display: Optional[Display], frame_indices: Optional[list[int]] = None, timestamps: Optional[list[float]] = None) -> Optional[np.ndarray]:
+        """
+        Processes a batch of frames under the lock and publishes the results in order, returns the last processed image.
+        """
+        while self.model_settings.model is None:
+            self.logger.info("Waiting for model to be loaded...")
+            time.sleep(0.1)
 
-            if boxes_from_active_tracks:
-                self.combine_boxes.set_boxes(boxes=boxes_from_active_tracks)
-                visualization_image = self.combine_boxes.apply(image=visualization_image)
+        with self.locker.lock:
+            self.apply_tracking_changes()
 
-            visualization_image = self.predictor_parameters.tracker_processor.update_count(image=visualization_image, background_fill=True)
+            results = self.process_batch(images=images, display=display, frame_indices=frame_indices, timestamps=timestamps)
 
-            if len(self.last_times) > 3:
-                fps = 1 / (statistics.mean(self.last_times))
-                visualization_image = draw_fps_text(image=visualization_image, text=f"FPS: {round(fps, 1)}")
+        for show_image, save_image in results:
+            self.publish_frame(show_image=show_image, save_image=save_image)
+        return results[-1][0] if results else None
 
-            if display is not None:
-                if self.general_settings.reset_stats_min > 0:
-                    left, percentage = self.cycling_timer.get_time_left()
-                    text = "Resetting statistics in:"
-                    visualization_image = draw_progress_bar(image=visualization_image, text=f"{text} {str(left)}", percentage=percentage)
+    def create_pipeline(self, display: Optional[Display]) -> FramePipeline:
+        """
+        Creates a FramePipeline running the detect, track, render and publish steps of process_frame and publish_frame as separate stages.
 
-                display.show_image(cv2.cvtColor(visualization_image, cv2.COLOR_BGR2RGB))
+        The stages run without the lock, so they overlap. Detect takes the sizes of the frame from the settings under the lock, so they can not change halfway, and track applies
+        the changes requested from the GUI under it. Only the track stage changes the tracker, and it sees the frames in order as every stage runs on a single thread. Track
+        also takes the counts after the frame into the packet, so render shows the counts belonging to the boxes it draws while track is frames ahead.
 
-        self.last_times.append(processing_timer.elapsed_real_time())
-        if len(self.last_times) > 10:
-            self.last_times = self.last_times[-10:]
+        The rendered frames are not shown on the display by the pipeline, the caller shows packet.show_image on the thread handling the window events.
 
-        return visualization_image, save_image
+        """
+        @torch.no_grad()  # Grad mode is thread local, so it has to be disabled on the stage thread itself
+        def detect(packet: FramePacket) -> FramePacket:
+            while self.model_settings.model is None and not self.aborting:
+                self.logger.info("Waiting for model to be loaded...")
+                time.sleep(0.1)
+            with self.locker.lock:
+                packet.input_size, packet.inference_size = self.get_input_size(), self.get_inference_size()
+            if not self.is_keyframe(frame_index=packet.index):
+                return packet
+            packet.input_image, packet.boxes = self.detect_frame(image=packet.image, frame_index=packet.index, input_size=packet.input_size, inference_size=packet.inference_size)
+            return packet
+
+        def track(packet: FramePacket) -> FramePacket:
+            with self.locker.lock:
+                self.apply_tracking_changes()
+            if packet.boxes is None:
+                packet.tracks, packet.save_image = self.propagate_frame()
+            else:
+                packet.tracks, packet.save_image = self.track_frame(image=packet.input_image, boxes_numpy=packet.boxes)
+            packet.count_text = self.predictor_parameters.tracker_processor.get_formatted_count()
+            self.export_tracks(boxes_from_active_tracks=packet.tracks, frame_index=packet.index, timestamp=packet.timestamp, source_image=packet.image, input_size=packet.input_size)
+            return packet
+
+        last_render_time: list[Optional[float]] = [None]
+
+        def render(packet: FramePacket) -> FramePacket:
+            packet.show_image = self.render_frame(image=packet.image, boxes_from_active_tracks=packet.tracks, display=display, input_size=packet.input_size, count_text=packet.count_text, show=False)
+
+            # The FPS of a pipeline is its throughput, so the time between two rendered frames instead of the processing time of a single frame
+            now = time.perf_counter()
+            if last_render_time[0] is not None:
+                self.add_frame_time(now - last_render_time[0])
+            last_render_time[0] = now
+            return packet
+
+        def publish(packet: FramePacket) -> FramePacket:
+            self.publish_frame(show_image=packet.show_image, save_image=packet.save_image)
+            packet.image = packet.input_image = None
+            return packet
+
+        self.pipeline = FramePipeline(stages=[("detect", detect), ("track", track), ("render", render), ("publish", publish)], queue_size=self.general_settings.pipeline_queue_size)
+        return self.pipeline
+
+    def get_metrics(self) -> dict:
+        """
+        Returns the metrics of the processing, like the queue depths and stage occupancy of the pipeline when it is used.
+        """
+        metrics = {}
+        if self.last_times and len(self.last_times) > 1:
+            metrics["fps"] = round(1 / statistics.mean(self.last_times), 2)
+        if self.pipeline is not None:
+            metrics["pipeline"] = self.pipeline.get_metrics()
+        if self.frame_pool is not None:
+            metrics["frame_pool"] = self.frame_pool.get_metrics()
+        metrics["tracker"] = self.predictor_parameters.tracker_processor.get_metrics()
+        if self.realtime_scheduler is not None:
+            metrics["realtime"] = self.realtime_scheduler.get_metrics()
+        if self.resolution_controller is not None:
+            metrics["resolution_controller"] = {**self.resolution_controller.get_metrics(), "size": list(self.get_inference_size())}
+        if self.motion_gate is not None:
+            metrics["motion_gate"] = self.motion_gate.get_metrics()
+        if self.detection_cache is not None:
+            metrics["detection_cache"] = self.detection_cache.get_metrics()
+        if self.result_saver is not None and (self.general_settings.save_results or self.general_settings.save_new_objects or self.general_settings.export_tracks):
+            metrics["result_saver"] = self.result_saver.get_metrics()
+        return metrics
+
+    def log_metrics(self) -> None:
+        """
+        Logs the metrics of the processing.
+        """
+        self.logger.info(f"Metrics: {json.dumps(self.get_metrics())}")
 
     @torch.no_grad()
     @abstractmethod
@@ -1,12 +1,19 @@
 import time
 import traceback
+from typing import Optional
 
 import cv2
+import numpy as np
 import torch
 
+from elements.load_model.load_model_onnx import OnnxModel
 from elements.locker import Locker
 from elements.predictors.base_predictor import PredictorBase
 from elements.predictors.parameters import PredictorParameters
+from elements.predictors.utils.batch_size_controller import BatchSizeController
+from elements.predictors.utils.motion_gate import MotionGate
+from elements.predictors.utils.pipeline import FramePacket
+from elements.predictors.utils.resolution_controller import ResolutionController
 from elements.predictors.utils.video_capture import VideoCapture
 from elements.settings.general_settings import GeneralSettings
 from elements.settings.model_settings import ModelSettings
@@ -20,7 +27,12 @@ class PredictorTrackerCamera(PredictorBase):
     """
     def __init__(self, general_settings: GeneralSettings, model_settings: ModelSettings, tracking_settings: TrackingSettings, predictor_parameters: PredictorParameters, websocket_server: WebSocketServer, locker: Locker):
         super().__init__(general_settings=general_settings, model_settings=model_settings, tracking_settings=tracking_settings, predictor_parameters=predictor_parameters, websocket_server=websocket_server, locker=locker)
-        self.result_saver.initiate_result_video(width=self.general_settings.screen_width, height=self.general_settings.screen_height, fps=5)  # The FPS is as guess as this information is not available until later
+        self.result_saver.initiate_result_video(width=self.general_settings.screen_width, height=self.general_settings.screen_height, fps=None)  # The FPS is not known until processing, so it gets measured
+        if self.general_settings.motion_sensitivity > 0:
+            self.motion_gate = MotionGate(sensitivity=self.general_settings.motion_sensitivity)
+        if self.general_settings.target_fps > 0:
+            self.resolution_controller = ResolutionController(target_fps=self.general_settings.target_fps)
+        self.video_capture: Optional[VideoCapture] = None
 
     @torch.no_grad()
     def predict(self):
@@ -29,49 +41,157 @@ class PredictorTrackerCamera(PredictorBase):
         """
         try:
             with VideoCapture(camera_index=self.general_settings.camera_index, save_directory=self.general_settings.output_folder) as video_capture:
+                self.video_capture = video_capture
                 if video_capture.vidcap is None:
                     self.logger.error("No video capture available, aborting processing")
                     self.abort()
                     cv2.destroyAllWindows()
                     return None
 
+                self.prepare_resolution_controller()
                 with self.result_saver:
-                    for image in video_capture.frames(general_settings=self.general_settings):
-                        try:
-                            if self.aborting:
-                                break
+                    if self.general_settings.pipeline_queue_size > 0:
+                        show_image = self.predict_pipelined(video_capture=video_capture)
+                    elif self.general_settings.batch_size > 1:
+                        show_image = self.predict_batched(video_capture=video_capture)
+                    else:
+                        show_image = self.predict_serial(video_capture=video_capture)
 
-                            while self.model_settings.model is None:
-                                self.logger.info("Waiting for model to be loaded...")
-                                time.sleep(0.1)
+                self.log_metrics()
 
-                            self.locker.lock.acquire()
+            return show_image
 
-                            if self.tracking_settings.reset:
-                                self.update_settings()
+        except Exception as e:
+            self.logger.error(traceback.format_exc())
+            self.logger.error(e)
+            return None
 
-                            show_image, save_image = self.process_frame(image=image, display=self.predictor_parameters.display)
-                            self.locker.lock.release()
+    def prepare_resolution_controller(self) -> None:
+        """
+        Prepares the ONNX Runtime model for every size of the ladder of the resolution controller before the feed starts, so stepping to another size never exports the model
+        and creates its session halfway the feed. The ultralytics models take any size as is.
 
-                            if self.general_settings.save_results:
-                                self.result_saver.append_image_to_video(image=show_image)
+        Weights that are an .onnx file already have a fixed input size every image gets rescaled to, so a smaller size does not detect faster and the controller gets disabled.
 
-                            if self.general_settings.save_new_objects and save_image:
-                                self.result_saver.save_image(image=show_image)
+        """
+        if self.resolution_controller is None:
+            return
+        while self.model_settings.model is None and not self.aborting:
+            self.logger.info("Waiting for model to be loaded...")
+            time.sleep(0.1)
+
+        model = self.model_settings.model
+        if not isinstance(model, OnnxModel):
+            return
+        if model.weights_path.endswith(".onnx"):
+            self.logger.info("Not adapting the detection size to the target fps, the .onnx weights have a fixed input size")
+            self.resolution_controller = None
+            return
+
+        sizes = self.resolution_controller.get_sizes(base_size=self.get_input_size())
+        for width, height in sizes:
+            model(np.zeros((height, width, 3), dtype=np.uint8))  # Exports the model for the size if needed, creates its session and runs it once
+        self.logger.info(f"Prepared the ONNX Runtime sessions for the detection sizes {sizes}")
+
+    def get_metrics(self) -> dict:
+        """
+        Returns the metrics of the processing, plus the dropped frames and the capture to display latency of the camera.
+        """
+        metrics = super().get_metrics()
+        if self.video_capture is not None:
+            metrics["capture"] = self.video_capture.get_metrics()
+        return metrics
 
-                            self.set_response(image=show_image)
+    def predict_serial(self, video_capture: VideoCapture) -> Optional[np.ndarray]:
+        """
+        Processes the camera frames one after another on the calling thread.
+        """
+        show_image = None
+        for i, (capture_time, image) in enumerate(video_capture.frames(general_settings=self.general_settings)):
+            try:
+                if self.aborting:
+                    break
 
-                            if cv2.waitKey(1) & 0xFF == ord('q'):
-                                break
-                        except Exception as e:
-                            self.logger.error(traceback.format_exc())
-                            self.logger.error(e)
-                            if self.locker.lock.locked():
-                                self.locker.lock.release()
+                while self.model_settings.model is None:
+                    self.logger.info("Waiting for model to be loaded...")
+                    time.sleep(0.1)
 
-            return show_image
+                self.locker.lock.acquire()
 
-        except Exception as e:
-            self.logger.error(traceback.format_exc())
-            self.logger.error(e)
-            return None
+                self.apply_tracking_changes()
+
+                show_image, save_image = self.process_frame(image=image, display=self.predictor_parameters.display, frame_index=i, timestamp=capture_time)
+                self.locker.lock.release()
+
+                self.publish_frame(show_image=show_image, save_image=save_image)
+                video_capture.record_display(capture_time=capture_time)
+
+                if cv2.waitKey(1) & 0xFF == ord('q'):
+                    break
+            except Exception as e:
+                self.logger.error(traceback.format_exc())
+                self.logger.error(e)
+                if self.locker.lock.locked():
+                    self.locker.lock.release()
+        return show_image
+
+    def predict_batched(self, video_capture: VideoCapture) -> Optional[np.ndarray]:
+        """
+        Processes the camera frames in batches that get detected in a single forward pass. The batch size adapts to the latency target, so the delay of the first frame of a batch
+        stays bounded.
+        """
+        show_image = None
+        controller = BatchSizeController(max_batch_size=self.general_settings.batch_size, latency_target_ms=self.general_settings.batch_latency_ms)
+
+        batch: list[np.ndarray] = []
+        frame_indices: list[int] = []
+        timestamps: list[float] = []
+        batch_start = time.perf_counter()
+        for i, (capture_time, image) in enumerate(video_capture.frames(general_settings=self.general_settings)):
+            try:
+                if self.aborting:
+                    break
+
+                if not batch:
+                    batch_start = time.perf_counter()
+                batch.append(image)
+                frame_indices.append(i)
+                timestamps.append(capture_time)
+                if len(batch) < controller.batch_size:
+                    continue
+
+                show_image = self.process_and_publish_batch(images=batch, display=self.predictor_parameters.display, frame_indices=frame_indices, timestamps=timestamps)
+                for timestamp in timestamps:
+                    video_capture.record_display(capture_time=timestamp)
+                batch, frame_indices, timestamps = [], [], []
+
+                batch_size = controller.batch_size
+                if controller.update(latency_ms=(time.perf_counter() - batch_start) * 1000) != batch_size:
+                    self.logger.debug(f"Changed batch size from {batch_size} to {controller.batch_size}")
+
+                if cv2.waitKey(1) & 0xFF == ord('q'):
+                    break
+            except Exception as e:
+                self.logger.error(traceback.format_exc())
+                self.logger.error(e)
+                batch, frame_indices, timestamps = [], [], []
+        return show_image
+
+    def predict_pipelined(self, video_capture: VideoCapture) -> Optional[np.ndarray]:
+        """
+        Processes the camera frames in a FramePipeline, so capturing, detection, tracking, rendering and publishing of consecutive frames overlap.
+        """
+        show_image = None
+        pipeline = self.create_pipeline(display=self.predictor_parameters.display)
+        for i, packet in enumerate(pipeline.run(FramePacket(index=i, image=image, timestamp=capture_time) for i, (capture_time, image) in enumerate(video_capture.frames(general_settings=self.general_settings)))):
+            show_image = packet.show_image
+            if self.predictor_parameters.display is not None:
+                self.predictor_parameters.display.show_image(show_image)
+            video_capture.record_display(capture_time=packet.timestamp)
+            if self.aborting:
+                break
+            if i > 0 and i % 500 == 0:
+                self.log_metrics()
+            if cv2.waitKey(1) & 0xFF == ord('q'):
+                break
+        return show_image
@@ -0,0 +1,276 @@
+import multiprocessing
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional
+
+import cv2
+import torch
+
+from elements.enums import ApplicationMode
+from elements.load_model.load_model_onnx import LoadModelOnnx, OnnxModel
+from elements.load_model.load_model_yolo import LoadModelYolo
+from elements.locker import Locker
+from elements.predictors.base_predictor import PredictorBase
+from elements.predictors.parameters import PredictorParameters
+from elements.predictors.utils.box_processor import BoxProcessor
+from elements.predictors.utils.predictor import Predictor
+from elements.predictors.utils.video_reader import VideoReader
+from elements.settings.general_settings import GeneralSettings
+from elements.settings.model_settings import ModelSettings
+from elements.settings.tracking_settings import TrackingSettings
+from elements.trackers.tracker_factory import TrackerFactory
+from elements.utils import Logger
+from gradio_server.websocket_manager.websocket_manager import WebSocketServer
+
+
+@dataclass
+class ChunkJob:
+    """
+    Describes the part of a video a single worker process is responsible for.
+
+    The worker counts the tracks confirmed in the core range [start, end). The frames [warmup_start, start) only warm up the tracker, the frames [end, tail_end) are used to
+    reconcile the counts with the next chunk.
+
+    """
+    index: int
+    input_path: str
+    warmup_start: int
+    start: int
+    end: int
+    tail_end: int
+    general_settings: GeneralSettings
+    tracking_settings: TrackingSettings
+    architecture: str
+    weights_path: str
+    device: str
+    threads: int
+    load_model_type: str = "yolo"
+    detection_interval: int = 1
+
+
+@dataclass
+class ChunkResult:
+    """
+    The outcome of processing a single ChunkJob.
+
+    head_boxes holds the boxes of the tracks counted in the first frames of the core range, tail_boxes the boxes of the already counted tracks seen after the core range. Both
+    map a track id to its class id and a list of (frame_index, [x1, y1, x2, y2]).
+
+    """
+    index: int
+    start: int
+    end: int
+    counts: dict[str, int] = field(default_factory=dict)
+    head_boxes: dict[int, tuple[int, list]] = field(default_factory=dict)
+    tail_boxes: dict[int, tuple[int, list]] = field(default_factory=dict)
+    processed_frames: int = 0
+    elapsed: float = 0.0
+
+
+def split_frame_range(start_frame: int, end_frame: int, chunks: int, overlap_frames: int) -> list[tuple[int, int, int, int]]:
+    """
+    Splits [start_frame, end_frame) in contiguous core ranges and extends each with overlap_frames of warm up before and tail after it.
+
+    :return: List of (warmup_start, start, end, tail_end) per chunk.
+
+    """
+    total = end_frame - start_frame
+    chunks = max(1, min(chunks, total))
+    bounds = [start_frame + (total * i) // chunks for i in range(chunks + 1)]
+    return [(max(start_frame, bounds[i] - overlap_frames), bounds[i], bounds[i + 1], min(end_frame, bounds[i + 1] + overlap_frames)) for i in range(chunks)]
+
+
+def process_chunk(job: ChunkJob) -> ChunkResult:
+    """
+    Runs detection and tracking on a single chunk of a video, in its own process with its own model and GeneralizedProcessor.
+    """
+    logger = Logger.setup_logger()
+    torch.set_num_threads(job.threads)
+    cv2.setNumThreads(job.threads)
+
+    general_settings = job.general_settings
+    model_settings = ModelSettings()
+    model_settings.device = job.device
+    model_settings.architecture = job.architecture
+    model_settings.weights_path = job.weights_path
+    if job.load_model_type == "onnx":
+        model_settings.model = LoadModelOnnx(weights_file=job.weights_path, model_name=job.architecture, device=job.device, intra_op_threads=job.threads, inter_op_threads=1).load_model()
+    else:
+        model_settings.model = LoadModelYolo(weights_file=job.weights_path, model_name=job.architecture, device=job.device).load_model()
+
+    _, tracker_processor = TrackerFactory.create(general_settings=general_settings, tracking_settings=job.tracking_settings, model_settings=model_settings)
+    predictor = Predictor(model_settings=model_settings, general_settings=general_settings)
+    box_processor = BoxProcessor(general_settings=general_settings)
+    input_size = (int(general_settings.input_width), int(general_settings.input_height))
+    head_end = min(job.end, job.start + (job.start - job.warmup_start))
+
+    result = ChunkResult(index=job.index, start=job.start, end=job.end)
+    start_time = time.perf_counter()
+
+    with torch.no_grad(), VideoReader(job.input_path, prefetch_frames=general_settings.prefetch_frames) as video_reader:
+        for frame_index, image in video_reader.frames(start_frame=job.warmup_start, end_frame=job.tail_end):
+            if frame_index == job.start:
+                tracker_processor.reset_count()  # Tracks confirmed during the warm up stay known, only their counts get dropped
+
+            if frame_index % job.detection_interval == 0:
+                image = cv2.resize(src=image, dsize=input_size)
+                boxes_numpy = box_processor.extract_boxes(predictions=predictor.predict(image=image))
+                try:
+                    active_boxes = tracker_processor.update_boxes(boxes=boxes_numpy, image=image)
+                except Exception as e:
+                    logger.error(traceback.format_exc())
+                    logger.error(e)
+                    active_boxes = []
+            else:
+                active_boxes = tracker_processor.propagate_boxes()
+            boxes_from_active_tracks = tracker_processor.get_boxes_from_active_tracks(active_tracks=active_boxes)
+            result.processed_frames += 1
+
+            if frame_index >= job.end:
+                for box in boxes_from_active_tracks:
+                    if box.track_id in tracker_processor.tracks:
+                        result.tail_boxes.setdefault(int(box.track_id), (box.class_id, []))[1].append((frame_index, [box.x1, box.y1, box.x2, box.y2]))
+                continue
+
+            known_tracks = set(tracker_processor.tracks.keys())
+            tracker_processor.update_tracks(active_tracks=boxes_from_active_tracks, verbose=False)
+
+            if frame_index < job.start or frame_index >= head_end:
+                continue
+            for box in boxes_from_active_tracks:
+                if box.track_id not in known_tracks or int(box.track_id) in result.head_boxes:
+                    result.head_boxes.setdefault(int(box.track_id), (box.class_id, []))[1].append((frame_index, [box.x1, box.y1, box.x2, box.y2]))
+
+    result.counts = dict(tracker_processor.counts)
+    result.elapsed = time.perf_counter() - start_time
+    logger.info(f"Chunk {job.index} processed frames {job.start}-{job.end} ({result.processed_frames} decoded) in {result.elapsed:.1f} seconds")
+    return result
+
+
+def box_iou(box_a: list, box_b: list) -> float:
+    """
+    Intersection over union of two [x1, y1, x2, y2] boxes.
+    """
+    width = min(box_a[2], box_b[2]) - max(box_a[0], box_b[0])
+    height = min(box_a[3], box_b[3]) - max(box_a[1], box_b[1])
+    if width <= 0 or height <= 0:
+        return 0.0
+    intersection = width * height
+    union = (box_a[2] - box_a[0]) * (box_a[3] - box_a[1]) + (box_b[2] - box_b[0]) * (box_b[3] - box_b[1]) - intersection
+    return intersection / union if union > 0 else 0.0
+
+
+def reconcile_counts(results: list[ChunkResult], classes: list[str], iou_threshold: float = 0.5) -> dict[str, int]:
+    """
+    Sums the counts of all chunks and removes the tracks that got counted twice at a chunk boundary.
+
+    A track counted at the start of a chunk is a duplicate if, on a common frame of the overlap region, its box matches the box of a track the previous chunk had already
+    counted. Every track of the previous chunk is matched to at most one track of the current chunk, the pairs with the highest IoU first, so a single duplicate never gets
+    subtracted twice.
+
+    """
+    results = sorted(results, key=lambda r: r.index)
+    counts = {k: 0 for k in classes}
+    for result in results:
+        for class_name, count in result.counts.items():
+            counts[class_name] = counts.get(class_name, 0) + count
+
+    for previous, current in zip(results, results[1:]):
+        matches = []
+        for head_id, (class_id, head_boxes) in current.head_boxes.items():
+            head = dict(head_boxes)
+            for tail_id, (tail_class_id, tail_boxes) in previous.tail_boxes.items():
+                if tail_class_id != class_id:
+                    continue
+                iou = max((box_iou(head[frame_index], box) for frame_index, box in tail_boxes if frame_index in head), default=0.0)
+                if iou >= iou_threshold:
+                    matches.append((iou, head_id, tail_id, class_id))
+
+        matched_heads, matched_tails = set(), set()
+        for _, head_id, tail_id, class_id in sorted(matches, key=lambda match: match[0], reverse=True):
+            if head_id in matched_heads or tail_id in matched_tails:
+                continue
+            matched_heads.add(head_id)
+            matched_tails.add(tail_id)
+            counts[classes[int(class_id)]] -= 1
+    return counts
+
+
+class PredictorTrackerChunked(PredictorBase):
+    """
+    A PredictorTrackerChunked is a type of Predictor that counts the objects in a single video file by splitting it in overlapping frame ranges that get processed in parallel
+    worker processes.
+
+    Only the counts are produced, frames are not visualized or saved.
+
+    """
+    def __init__(self, general_settings: GeneralSettings, model_settings: ModelSettings, tracking_settings: TrackingSettings, predictor_parameters: PredictorParameters, websocket_server: WebSocketServer, locker: Locker):
+        super().__init__(general_settings=general_settings, model_settings=model_settings, tracking_settings=tracking_settings, predictor_parameters=predictor_parameters, websocket_server=websocket_server, locker=locker)
+
+    def initialize_helpers(self) -> tuple[None, None, None, None]:
+        """
+        The worker processes detect and track the chunks with their own helpers, this process only reconciles their counts, so it needs no Predictor, BoxProcessor, ResultSaver
+        or CombineBoxes.
+        """
+        return None, None, None, None
+
+    def initialize_frame_pool(self) -> None:
+        """
+        Frames are not rendered, so there is no FramePool.
+        """
+        return None
+
+    def initialize_cycling_timer(self) -> None:
+        """
+        The counts only exist once all chunks are reconciled, so there is nothing for the reset stats timer to reset.
+        """
+        return None
+
+    def create_jobs(self, video_reader: VideoReader) -> list[ChunkJob]:
+        """
+        Splits the requested frame range of the video in one job per worker.
+        """
+        start_frame, end_frame = video_reader.resolve_frame_range(start_frame=self.predictor_parameters.start_frame, end_frame=self.predictor_parameters.end_frame, start_time=self.predictor_parameters.start_time, end_time=self.predictor_parameters.end_time)
+        if end_frame is None:
+            raise ValueError("Chunked processing needs the length of the video, which the container does not report")
+
+        workers = self.general_settings.workers
+        threads = max(1, (os.cpu_count() or 1) // workers)
+        detection_interval = self.get_detection_interval(fps=video_reader.fps)
+        return [ChunkJob(index=i, input_path=self.predictor_parameters.input_path, warmup_start=warmup_start, start=start, end=end, tail_end=tail_end, general_settings=self.general_settings, tracking_settings=self.tracking_settings, architecture=self.model_settings.architecture, weights_path=self.model_settings.weights_path, device=self.model_settings.device, threads=threads, load_model_type="onnx" if isinstance(self.model_settings.model, OnnxModel) else "yolo", detection_interval=detection_interval) for i, (warmup_start, start, end, tail_end) in enumerate(split_frame_range(start_frame=start_frame, end_frame=end_frame, chunks=workers, overlap_frames=self.general_settings.chunk_overlap_frames))]
+
+    @torch.no_grad()
+    def predict(self) -> Optional[dict[str, int]]:
+        """
+        Processes the video from the input_path passed in parallel chunks and returns the reconciled counts.
+        """
+        try:
+            if self.general_settings.save_results or self.predictor_parameters.display is not None:
+                self.logger.warning("Chunked processing only produces counts, results are not visualized or saved")
+
+            with VideoReader(self.predictor_parameters.input_path) as video_reader:
+                jobs = self.create_jobs(video_reader=video_reader)
+
+            self.logger.info(f"Processing {len(jobs)} chunks of {self.predictor_parameters.input_path} in {self.general_settings.workers} worker processes")
+            start_time = time.perf_counter()
+            # Spawn instead of fork, forking a process that already initialized torch threads or CUDA is unsafe
+            with ProcessPoolExecutor(max_workers=self.general_settings.workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+                results = list(pool.map(process_chunk, jobs))
+
+            counts = reconcile_counts(results=results, classes=self.general_settings.classes)
+            self.predictor_parameters.tracker_processor.counts = counts
+
+            self.logger.info(f"Processed {sum(result.end - result.start for result in results)} frames in {time.perf_counter() - start_time:.1f} seconds")
+            self.logger.info(f"Counts: {self.predictor_parameters.tracker_processor.get_formatted_count().strip()}")
+
+            if self.general_settings.application_mode == ApplicationMode.GUI:
+                self.websocket.finish_connection()
+            return counts
+
+        except Exception as e:
+            self.logger.error(e)
+            self.logger.error(traceback.format_exc())
+            return None
@@ -12,6 +12,9 @@ class PredictorParameters:
     """
     result_processor: Callable
     tracker_processor: TrackerProcessor
-    skip_frames: int = 0
+    start_frame: int = 0
+    end_frame: Optional[int] = None
+    start_time: Optional[float] = None  # In seconds, takes precedence over start_frame
+    end_time: Optional[float] = None  # In seconds, takes precedence over end_frame
     display: Optional[Display] = None
     input_path: Optional[Union[str, List]] = None
@@ -14,7 +14,7 @@ class PredictorFactory(ABC):
     """
     Base class of every factory constructing a Predictor object.
     """
-    def __init__(self, general_settings: GeneralSettings, model_settings: ModelSettings, tracking_settings: Optional[TrackingSettings], websocket_server, display: Optional[Display], skip_frames: Optional[int], input_path: Optional[Union[str, List]], locker: Locker):
+    def __init__(self, general_settings: GeneralSettings, model_settings: ModelSettings, tracking_settings: Optional[TrackingSettings], websocket_server, display: Optional[Display], input_path: Optional[Union[str, List]], locker: Locker, start_frame: int = 0, end_frame: Optional[int] = None, start_time: Optional[float] = None, end_time: Optional[float] = None):
         self.logger = Logger.setup_logger()
 
         self.general_settings = general_settings
@@ -22,7 +22,10 @@ class PredictorFactory(ABC):
         self.model_settings = model_settings
         self.websocket_server = websocket_server
         self.display = display
-        self.skip_frames = skip_frames
+        self.start_frame = start_frame
+        self.end_frame = end_frame
+        self.start_time = start_time
+        self.end_time = end_time
         self.input_path = input_path
         self.locker = locker
 
@@ -1,13 +1,10 @@
-from functools import partial
-from pathlib import Path
 from typing import Optional, Union
 
-import boxmot
-
 from elements.display import Display
 from elements.enums import InputMode
 from elements.locker import Locker
 from elements.predictors.camera import PredictorTrackerCamera
+from elements.predictors.chunked_input import PredictorTrackerChunked
 from elements.predictors.parameters import PredictorParameters
 from elements.predictors.predictor_factory import PredictorFactory
 from elements.predictors.video_input import PredictorTrackerInput
@@ -19,14 +16,12 @@ from elements.trackers.tracker_factory import TrackerFactory
 
 
 class PredictTracking(PredictorFactory):
-    def __init__(self, general_settings: GeneralSettings, model_settings: ModelSettings, tracking_settings: Optional[TrackingSettings] = None, websocket_server=None, display: Optional[Display] = None, input_path: Optional[Union[str, list]] = None, skip_frames: Optional[int] = 0, locker: Locker = None):
-        super().__init__(general_settings=general_settings, model_settings=model_settings, tracking_settings=tracking_settings, websocket_server=websocket_server, display=display, skip_frames=skip_frames, input_path=input_path, locker=locker)
+    def __init__(self, general_settings: GeneralSettings, model_settings: ModelSettings, tracking_settings: Optional[TrackingSettings] = None, websocket_server=None, display: Optional[Display] = None, input_path: Optional[Union[str, list]] = None, locker: Locker = None, start_frame: int = 0, end_frame: Optional[int] = None, start_time: Optional[float] = None, end_time: Optional[float] = None):
+        super().__init__(general_settings=general_settings, model_settings=model_settings, tracking_settings=tracking_settings, websocket_server=websocket_server, display=display, input_path=input_path, locker=locker, start_frame=start_frame, end_frame=end_frame, start_time=start_time, end_time=end_time)
 
     def get_predictor(self):
-        tracker_generator = None
-        if self.tracking_settings.tracker.casefold() == "deepocsort":
-            tracker_generator = partial(boxmot.DeepOcSort, asso_func="centroid", half=False, reid_weights=Path("osnet_x1_0_msmt17.pt"), per_class=True)
-        else:
+        tracker_generator = TrackerFactory.get_tracker_generator(tracker=self.tracking_settings.tracker)
+        if tracker_generator is None:
             self.logger.exception(f"Unknown tracking case: {self.tracking_settings.tracker}")
             RuntimeError(f"Unknown tracking case: {self.tracking_settings.tracker}")
 
@@ -35,11 +30,14 @@ class PredictTracking(PredictorFactory):
         _, tracker_processor = TrackerFactory.create(general_settings=self.general_settings, tracking_settings=self.tracking_settings, model_settings=self.model_settings)
 
         self.tracking_settings.reset = False
+        self.tracking_settings.reset_stats = False
 
-        predictor_parameters = PredictorParameters(result_processor=decode_yolo_boxes_pt, tracker_processor=tracker_processor, display=self.display, skip_frames=self.skip_frames, input_path=self.input_path)
+        predictor_parameters = PredictorParameters(result_processor=decode_yolo_boxes_pt, tracker_processor=tracker_processor, display=self.display, input_path=self.input_path, start_frame=self.start_frame, end_frame=self.end_frame, start_time=self.start_time, end_time=self.end_time)
 
         if self.general_settings.camera_mode == InputMode.CAMERA:
             predictor = PredictorTrackerCamera(general_settings=self.general_settings, model_settings=self.model_settings, tracking_settings=self.tracking_settings, predictor_parameters=predictor_parameters, websocket_server=self.websocket_server, locker=self.locker)
+        elif self.general_settings.workers > 1:
+            predictor = PredictorTrackerChunked(general_settings=self.general_settings, model_settings=self.model_settings, tracking_settings=self.tracking_settings, predictor_parameters=predictor_parameters, websocket_server=self.websocket_server, locker=self.locker)
         else:
             predictor = PredictorTrackerInput(general_settings=self.general_settings, model_settings=self.model_settings, tracking_settings=self.tracking_settings, predictor_parameters=predictor_parameters, websocket_server=self.websocket_server, locker=self.locker)
         return predictor, predictor_parameters
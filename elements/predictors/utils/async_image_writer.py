@@ -0,0 +1,119 @@
+import os
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Optional
+
+import cv2
+import numpy as np
+
+from elements.utils import Logger
+
+# Encoder parameter and standard value per format: the compression level for png (0-9), the quality for jpg and webp (0-100)
+IMAGE_FORMATS: dict[str, tuple[int, int]] = {
+    "png": (cv2.IMWRITE_PNG_COMPRESSION, 1),
+    "jpg": (cv2.IMWRITE_JPEG_QUALITY, 90),
+    "webp": (cv2.IMWRITE_WEBP_QUALITY, 90),
+}
+
+
+class AsyncImageWriter:
+    """
+    Encodes and saves images on a pool of background threads, so saving images does not stall the capture or inference loop.
+
+    At most max_pending images wait to be written, which bounds the memory used by the copies of the images. Saving blocks while that many are pending, or drops the image
+    when saving without blocking. close waits for all pending images to be written.
+
+    """
+    def __init__(self, image_format: str = "png", compression: int = -1, max_pending: int = 16, threads: int = 2):
+        self.logger = Logger.setup_logger()
+        if image_format not in IMAGE_FORMATS:
+            raise ValueError(f"Unsupported image format {image_format}, use one of {list(IMAGE_FORMATS)}")
+
+        self.image_format = image_format
+        parameter, standard = IMAGE_FORMATS[image_format]
+        self.params = [int(parameter), int(compression) if compression >= 0 else standard]
+
+        self.pool = ThreadPoolExecutor(max_workers=max(1, threads), thread_name_prefix="Image writer")
+        self.pending = threading.BoundedSemaphore(max(1, max_pending))
+        self.pending_count = 0
+        self.stats_lock = threading.Lock()
+        self.closed = False
+
+        self.written = 0
+        self.failed = 0
+        self.dropped = 0
+        self.write_time = 0.0
+
+    def save(self, path: str, image: np.ndarray, block: bool = True) -> Optional[str]:
+        """
+        Queues a copy of the image to be saved at path, with the extension of the image format. Returns the full path the image will be saved at.
+
+        Without blocking, the image is dropped and None returned when max_pending images are pending already.
+
+        """
+        if self.closed:
+            raise RuntimeError("The image writer is closed already")
+
+        filename = f"{os.path.splitext(path)[0]}.{self.image_format}"
+        if not self.pending.acquire(blocking=block):
+            with self.stats_lock:
+                self.dropped += 1
+            return None
+        with self.stats_lock:
+            self.pending_count += 1
+        self.pool.submit(self._write, filename, image.copy()).add_done_callback(self._done)
+        return filename
+
+    def _write(self, filename: str, image: np.ndarray) -> None:
+        start = time.perf_counter()
+        success = False
+        try:
+            success = cv2.imwrite(filename=filename, img=image, params=self.params)
+            if not success:
+                self.logger.error(f"Failed to save image to {filename}")
+        except Exception as e:
+            self.logger.error(traceback.format_exc())
+            self.logger.error(e)
+
+        with self.stats_lock:  # The counters get updated from all threads of the pool
+            self.written += int(success)
+            self.failed += int(not success)
+            self.write_time += time.perf_counter() - start
+
+    def _done(self, future: Future) -> None:
+        with self.stats_lock:
+            self.pending_count -= 1
+        self.pending.release()
+
+    def close(self) -> None:
+        """
+        Waits for all pending images to be written and stops the threads.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        self.pool.shutdown(wait=True)
+        self.logger.info(f"Finished saving images: {self.get_metrics()}")
+
+    def get_metrics(self) -> dict:
+        """
+        Returns the images written, failed, dropped and pending and the mean time it takes to encode and write one.
+        """
+        with self.stats_lock:
+            pending = self.pending_count
+        return {
+            "format": self.image_format,
+            "written": self.written,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "pending": pending,
+            "mean_write_ms": round(self.write_time / (self.written + self.failed) * 1000, 2) if self.written + self.failed else 0.0,
+        }
+
+    def __enter__(self) -> 'AsyncImageWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
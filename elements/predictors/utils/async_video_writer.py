@@ -0,0 +1,163 @@
+import queue
+import threading
+import time
+import traceback
+from typing import Optional
+
+import cv2
+import numpy as np
+
+from elements.enums import OverflowPolicy
+from elements.utils import Logger
+
+_END_OF_STREAM = object()
+
+
+class AsyncVideoWriter:
+    """
+    Owns a cv2.VideoWriter on a background thread that encodes the frames from a bounded queue, so encoding does not stall the frame loop.
+
+    When the queue is full, the overflow policy decides what happens: BLOCK waits for room, DROP discards the new frame and COALESCE drops the oldest queued frame to make room for it.
+    close drains the queue before releasing the writer, so no accepted frame gets lost.
+
+    Without an fps the writer does not get opened here, which is left to subclasses like the SegmentedVideoWriter measuring the fps first.
+
+    """
+    def __init__(self, filename: str, fourcc: int, fps: Optional[float], frame_size: tuple[int, int], queue_size: int = 32, overflow_policy: OverflowPolicy = OverflowPolicy.BLOCK):
+        self.logger = Logger.setup_logger()
+        self.filename = filename
+        self.frame_size = frame_size
+        self.overflow_policy = overflow_policy
+        self.fourcc = fourcc
+        self.fps = fps
+        self.writer: Optional[cv2.VideoWriter] = self.open_writer(filename=filename, fps=fps) if fps else None
+
+        self.frame_queue: queue.Queue = queue.Queue(maxsize=max(1, queue_size))
+        self.put_lock = threading.Lock()
+        self.closed = False
+
+        self.written = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.max_depth = 0
+        self.lag_sum = 0.0
+        self.max_lag = 0.0
+        self.write_time = 0.0
+
+        self.thread = threading.Thread(target=self._write_worker, name="Video writer", daemon=True)
+        self.thread.start()
+
+    def write(self, image: np.ndarray) -> bool:
+        """
+        Queues an image to be appended to the video, resized to the frame size of the video. Returns whether the image got accepted.
+
+        The image gets copied before it is queued, so the caller can reuse its buffer right away.
+
+        """
+        if self.closed:
+            return False
+
+        if image.shape[1::-1] == self.frame_size:
+            frame = image.copy()
+        else:
+            frame = cv2.resize(image, self.frame_size)
+        item = (time.perf_counter(), frame)
+
+        with self.put_lock:
+            if self.overflow_policy == OverflowPolicy.BLOCK:
+                self.frame_queue.put(item)
+            elif self.overflow_policy == OverflowPolicy.DROP:
+                try:
+                    self.frame_queue.put_nowait(item)
+                except queue.Full:
+                    self.dropped += 1
+                    return False
+            else:
+                while True:
+                    try:
+                        self.frame_queue.put_nowait(item)
+                        break
+                    except queue.Full:
+                        try:
+                            self.frame_queue.get_nowait()
+                            self.coalesced += 1
+                        except queue.Empty:
+                            pass
+            self.max_depth = max(self.max_depth, self.frame_queue.qsize())
+        return True
+
+    def open_writer(self, filename: str, fps: float) -> cv2.VideoWriter:
+        return cv2.VideoWriter(filename=filename, fourcc=self.fourcc, fps=fps, frameSize=self.frame_size)
+
+    def write_frame(self, queued_at: float, frame: np.ndarray) -> None:
+        """
+        Writes a dequeued frame, called on the background thread only.
+        """
+        self.writer.write(frame)
+        self.written += 1
+
+    def finish(self) -> None:
+        """
+        Finishes the video after the last frame got written, called on the background thread only.
+        """
+        if self.writer is not None:
+            self.writer.release()
+
+    def _write_worker(self) -> None:
+        while True:
+            item = self.frame_queue.get()
+            if item is _END_OF_STREAM:
+                try:
+                    self.finish()
+                except Exception as e:
+                    self.logger.error(traceback.format_exc())
+                    self.logger.error(e)
+                return
+
+            queued_at, frame = item
+            start = time.perf_counter()
+            try:
+                self.write_frame(queued_at=queued_at, frame=frame)
+            except Exception as e:
+                self.logger.error(traceback.format_exc())
+                self.logger.error(e)
+            end = time.perf_counter()
+
+            self.write_time += end - start
+            self.lag_sum += end - queued_at
+            self.max_lag = max(self.max_lag, end - queued_at)
+
+    def close(self) -> None:
+        """
+        Waits for all queued frames to be written and finishes the video.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        with self.put_lock:
+            self.frame_queue.put(_END_OF_STREAM)
+        self.thread.join()
+        self.logger.info(f"Finished writing {self.filename}: {self.get_metrics()}")
+
+    def get_metrics(self) -> dict:
+        """
+        Returns the frames written and dropped and the lag between queueing a frame and it being written.
+        """
+        return {
+            "written": self.written,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "queue_depth": self.frame_queue.qsize(),
+            "max_queue_depth": self.max_depth,
+            "capacity": self.frame_queue.maxsize,
+            "mean_lag_ms": round(self.lag_sum / self.written * 1000, 2) if self.written else 0.0,
+            "max_lag_ms": round(self.max_lag * 1000, 2),
+            "mean_write_ms": round(self.write_time / self.written * 1000, 2) if self.written else 0.0,
+        }
+
+    def __enter__(self) -> 'AsyncVideoWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
@@ -0,0 +1,26 @@
+class BatchSizeController:
+    """
+    Adapts the batch size of a live feed to a latency target per batch.
+
+    A larger batch makes better use of the hardware, but the first frame of a batch has to wait for the whole batch to be captured and processed. The batch size steps down as
+    soon as a batch takes longer than the target and steps up again once batches take clearly less than the target.
+
+    """
+    def __init__(self, max_batch_size: int, latency_target_ms: float, headroom: float = 0.7):
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.latency_target_ms = float(latency_target_ms)
+        self.headroom = headroom
+        self.batch_size = 1 if self.latency_target_ms > 0 else self.max_batch_size
+
+    def update(self, latency_ms: float) -> int:
+        """
+        Registers the latency of the last batch and returns the batch size to use for the next one.
+        """
+        if self.latency_target_ms <= 0:
+            return self.batch_size
+
+        if latency_ms > self.latency_target_ms and self.batch_size > 1:
+            self.batch_size -= 1
+        elif latency_ms * (self.batch_size + 1) / self.batch_size < self.latency_target_ms * self.headroom and self.batch_size < self.max_batch_size:
+            self.batch_size += 1
+        return self.batch_size
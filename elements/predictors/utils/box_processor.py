@@ -10,14 +10,21 @@ class BoxProcessor:
     def __init__(self, general_settings: GeneralSettings):
         self.general_settings = general_settings
 
-    def extract_boxes(self, predictions: np.ndarray) -> list[np.ndarray]:
+    def extract_boxes(self, predictions: np.ndarray) -> np.ndarray:
         """
-        Constructs a numpy array from raw YOLO predictions [x1, y1, x2, y2, confidence, class_id]
+        Constructs a (N, 6) float32 array of [x1, y1, x2, y2, confidence, class_id] rows from raw YOLO predictions, keeping only confident boxes of tracked classes.
+
+        The ultralytics results get filtered on their whole boxes.data tensor at once, predictions of the ONNX Runtime backend are already an array of such rows. Both backends
+        drop the untracked classes already, the class filter here only guards against a model that does not.
+
         """
-        boxes_numpy = []
-        for box in predictions[0]:
-            if box.boxes.conf.item() > self.general_settings.box_threshold:
-                if self.general_settings.classes[int(box.boxes.cls.item())] in self.general_settings.tracked_classes:
-                    new_box = np.asarray(box.boxes.xyxy.tolist()[0] + [box.boxes.conf.item()] + [box.boxes.cls.item()])
-                    boxes_numpy.append(new_box)
-        return boxes_numpy
+        if isinstance(predictions, np.ndarray):
+            data = predictions
+        elif len(predictions) and predictions[0].boxes is not None:
+            data = predictions[0].boxes.data.cpu().numpy()
+        else:
+            data = np.zeros((0, 6), dtype=np.float32)
+        data = np.asarray(data, dtype=np.float32).reshape(-1, 6)
+
+        keep = (data[:, 4] > self.general_settings.box_threshold) & np.isin(data[:, 5].astype(np.int64), self.general_settings.tracked_class_ids)
+        return np.ascontiguousarray(data[keep])
@@ -0,0 +1,137 @@
+import hashlib
+import json
+import os
+from typing import Optional
+
+import numpy as np
+
+from elements.utils import Logger, hash_file
+
+DETECTION_CACHE_FOLDER = os.path.join(".cache", "detections")
+
+
+def hash_video(path: str, samples: int = 16, sample_size: int = 1 << 16) -> str:
+    """
+    Returns a sha256 hex digest identifying the contents of a video file, computed over its size and sample_size bytes at samples evenly spaced offsets.
+
+    Hashing a sample instead of the whole file keeps opening the cache of a video of hours instant, while any re-encode or edit changes the size or the sampled bytes.
+
+    """
+    sha = hashlib.sha256()
+    size = os.path.getsize(path)
+    sha.update(str(size).encode())
+    with open(path, "rb") as file:
+        for i in range(samples):
+            file.seek(max(0, size - sample_size) * i // max(1, samples - 1))
+            sha.update(file.read(sample_size))
+    return sha.hexdigest()
+
+
+def get_cache_key(video_path: str, weights_path: str, load_model_type: str, input_size: tuple[int, int], tracked_class_ids: list[int]) -> dict:
+    """
+    Returns the key of the detection cache of a video, covering everything besides the box threshold that changes the detections of the model.
+    """
+    return {
+        "video": hash_video(video_path),
+        "weights": hash_file(weights_path) if os.path.exists(weights_path) else weights_path,
+        "load_model_type": load_model_type,
+        "input_size": [int(input_size[0]), int(input_size[1])],
+        "tracked_class_ids": sorted(int(i) for i in tracked_class_ids),
+    }
+
+
+class DetectionCache:
+    """
+    Persistent store of the raw (N, 6) detections per frame of a video, so the tracker and counting can be re-tuned by replaying the detections instead of running the model.
+
+    The cache lives in a folder named after the hash of its key: the video contents, the weights file, the model backend, the input size and the tracked classes. The rows of all frames get
+    appended to detections.f32, which is memory-mapped for reading, and index.npz holds the row range and the box threshold every frame got detected with. Detections are only replayed
+    if they were detected with a box threshold at or below the current one, the rows under the current threshold get filtered by the BoxProcessor afterwards.
+
+    Frames that are not cached yet get added while processing, the index is saved when closing, so an interrupted run leaves the previous index intact. A read only cache can be
+    opened by many processes at once.
+
+    """
+    def __init__(self, folder: str, key: dict, read_only: bool = False):
+        self.logger = Logger.setup_logger()
+        self.key = key
+        self.folder = os.path.join(folder, hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()[:24])
+        self.data_path = os.path.join(self.folder, "detections.f32")
+        self.index_path = os.path.join(self.folder, "index.npz")
+        if not read_only:
+            os.makedirs(self.folder, exist_ok=True)
+            with open(os.path.join(self.folder, "key.json"), "w") as file:
+                json.dump(key, file)
+
+        self.index: dict[int, tuple[int, int, float]] = {}
+        if os.path.exists(self.index_path):
+            with np.load(self.index_path) as index:
+                self.index = {int(frame): (int(start), int(end), float(threshold)) for frame, start, end, threshold in zip(index["frame"], index["start"], index["end"], index["box_threshold"])}
+
+        rows = os.path.getsize(self.data_path) // (6 * 4) if os.path.exists(self.data_path) else 0
+        self.data: Optional[np.ndarray] = np.memmap(self.data_path, dtype=np.float32, mode="r", shape=(rows, 6)) if rows else None
+        self.rows = rows
+        self.file = None
+        if not read_only:
+            self.file = open(self.data_path, "ab")
+            self.file.truncate(rows * 6 * 4)  # Drops a partially written row of an interrupted run
+        self.changed = False
+
+        self.hits = 0
+        self.misses = 0
+        self.added = 0
+        self.logger.info(f"Opened detection cache {self.folder} with {len(self.index)} cached frames")
+
+    def get(self, frame_index: int, box_threshold: float) -> Optional[np.ndarray]:
+        """
+        Returns the cached detections of a frame, or None if the frame is not cached or got detected with a higher box threshold than the given one.
+        """
+        entry = self.index.get(frame_index)
+        if entry is None or entry[2] > box_threshold or self.data is None or entry[1] > self.data.shape[0]:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return np.asarray(self.data[entry[0]:entry[1]])
+
+    def put(self, frame_index: int, boxes: np.ndarray, box_threshold: float) -> None:
+        """
+        Appends the detections of a frame, detected with the given box threshold, replacing an earlier entry of the frame.
+        """
+        if self.file is None:
+            raise RuntimeError("The detection cache is opened read only")
+        boxes = np.ascontiguousarray(boxes, dtype=np.float32).reshape(-1, 6)
+        self.file.write(boxes.tobytes())
+        self.index[frame_index] = (self.rows, self.rows + boxes.shape[0], float(box_threshold))
+        self.rows += boxes.shape[0]
+        self.added += 1
+        self.changed = True
+
+    def covers(self, start_frame: int, end_frame: int, box_threshold: float) -> bool:
+        """
+        Returns whether all frames in [start_frame, end_frame) can be replayed with the given box threshold.
+        """
+        return all(frame in self.index and self.index[frame][2] <= box_threshold for frame in range(start_frame, end_frame))
+
+    def close(self) -> None:
+        """
+        Saves the index, making the detections added in this run available for replaying.
+        """
+        if self.file is None or self.file.closed:
+            return
+        self.file.close()
+        if self.changed:
+            frames = np.fromiter(self.index.keys(), dtype=np.int64, count=len(self.index))
+            entries = np.asarray(list(self.index.values()), dtype=np.float64).reshape(-1, 3)
+            with open(f"{self.index_path}.tmp", "wb") as file:
+                np.savez(file, frame=frames, start=entries[:, 0].astype(np.int64), end=entries[:, 1].astype(np.int64), box_threshold=entries[:, 2])
+            os.replace(f"{self.index_path}.tmp", self.index_path)
+        self.logger.info(f"Closed detection cache {self.folder}: {self.get_metrics()}")
+
+    def get_metrics(self) -> dict:
+        return {"cached_frames": len(self.index), "hits": self.hits, "misses": self.misses, "added": self.added}
+
+    def __enter__(self) -> 'DetectionCache':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
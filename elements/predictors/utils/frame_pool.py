@@ -0,0 +1,37 @@
+import numpy as np
+
+
+class FramePool:
+    """
+    A ring of preallocated image buffers, so rendering a frame reuses memory instead of allocating a new full size image every frame.
+
+    A buffer gets handed out again after size other buffers have been, so size has to exceed the amount of rendered frames that can be in use at the same time, for example
+    waiting in a queue to be published.
+
+    """
+    def __init__(self, size: int):
+        self.size = max(1, int(size))
+        self.buffers: list[np.ndarray] = []
+        self.index = 0
+        self.allocations = 0
+
+    def next(self, width: int, height: int, channels: int = 3) -> np.ndarray:
+        """
+        Returns the next buffer of the ring with the given dimensions, only allocating when the ring is not full yet or the dimensions changed.
+        """
+        shape = (height, width, channels)
+        if self.buffers and self.buffers[0].shape != shape:
+            self.buffers = []
+            self.index = 0
+
+        if len(self.buffers) < self.size:
+            self.buffers.append(np.empty(shape, dtype=np.uint8))
+            self.allocations += 1
+            return self.buffers[-1]
+
+        buffer = self.buffers[self.index]
+        self.index = (self.index + 1) % self.size
+        return buffer
+
+    def get_metrics(self) -> dict:
+        return {"size": self.size, "allocations": self.allocations}
@@ -0,0 +1,94 @@
+import collections
+import time
+from typing import Optional
+
+import cv2
+import numpy as np
+
+
+class MotionGate:
+    """
+    Decides per camera frame whether the detector has to run, by comparing a small blurred version of the frame to a running average of the background. A pixel changed if any
+    of its channels changed, so a green jacket in front of a gray road of the same brightness still counts.
+
+    The detector runs when enough pixels changed, while the tracker holds tracks, for hold_frames after the last motion and at least every refresh_frames frames, so objects that
+    enter slowly or stand still when the tracker lost them still get detected. The other frames are skipped, the tracker gets an empty update for them.
+
+    :param sensitivity: Between 0 and 1, the higher the smaller the changed area that counts as motion. 1 detects on any changed pixel
+    :param width: Width in pixels the frame gets downscaled to before comparing, the height follows the aspect ratio
+    :param pixel_threshold: Difference in a channel from the background for a pixel to count as changed
+
+    """
+    def __init__(self, sensitivity: float, width: int = 320, pixel_threshold: int = 25, learning_rate: float = 0.05, hold_frames: int = 15, refresh_frames: int = 150, history: int = 100):
+        self.min_changed = 0.005 * (1 - min(max(float(sensitivity), 0.0), 1.0))  # Fraction of the pixels, 0.25% at a sensitivity of 0.5
+        self.width = width
+        self.pixel_threshold = pixel_threshold
+        self.learning_rate = learning_rate
+        self.hold_frames = hold_frames
+        self.refresh_frames = refresh_frames
+
+        self.background: Optional[np.ndarray] = None
+        self.hold = 0
+        self.since_detection = 0
+
+        self.reasons: dict[str, int] = {"motion": 0, "tracks": 0, "hold": 0, "refresh": 0}
+        self.skipped = 0
+        self.frames = 0
+        self.score = 0.0
+        self.gate_time = 0.0
+        self.decisions: collections.deque = collections.deque(maxlen=history)  # D for a detected frame, . for a skipped one
+
+    def check(self, image: np.ndarray, tracking: bool) -> bool:
+        """
+        Returns whether the detector has to run on the image, tracking tells whether the tracker holds any tracks.
+        """
+        start = time.perf_counter()
+        height = max(1, round(image.shape[0] * self.width / image.shape[1]))
+        small = cv2.GaussianBlur(cv2.resize(image, (self.width, height), interpolation=cv2.INTER_AREA), (5, 5), 0)
+
+        if self.background is None or self.background.shape != small.shape:
+            self.background = small.astype(np.float32)
+            self.score = 1.0
+        else:
+            difference = cv2.absdiff(small, cv2.convertScaleAbs(self.background))
+            if difference.ndim == 3:
+                difference = difference.max(axis=2)
+            self.score = np.count_nonzero(difference > self.pixel_threshold) / difference.size
+            cv2.accumulateWeighted(small, self.background, self.learning_rate)
+
+        reason = None
+        if self.score > self.min_changed:
+            reason = "motion"
+            self.hold = self.hold_frames
+        elif tracking:
+            reason = "tracks"
+        elif self.hold > 0:
+            reason = "hold"
+            self.hold -= 1
+        elif self.since_detection + 1 >= self.refresh_frames:
+            reason = "refresh"
+
+        self.frames += 1
+        if reason is None:
+            self.skipped += 1
+            self.since_detection += 1
+        else:
+            self.reasons[reason] += 1
+            self.since_detection = 0
+        self.decisions.append("." if reason is None else "D")
+        self.gate_time += time.perf_counter() - start
+        return reason is not None
+
+    def get_metrics(self) -> dict:
+        """
+        Returns the share of skipped frames, why the other frames got detected, the motion score of the last frame, the cost of the gate and its decisions on the last frames.
+        """
+        return {
+            "frames": self.frames,
+            "skipped": self.skipped,
+            "skipped_ratio": round(self.skipped / self.frames, 3) if self.frames else 0.0,
+            "detected": dict(self.reasons),
+            "score": round(float(self.score), 5),
+            "mean_gate_ms": round(self.gate_time / self.frames * 1000, 3) if self.frames else 0.0,
+            "decisions": "".join(self.decisions),
+        }
@@ -0,0 +1,197 @@
+import queue
+import threading
+import time
+import traceback
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Iterator, Optional, Any
+
+import numpy as np
+
+from elements.utils import Logger
+
+_END_OF_STREAM = object()
+
+
+@dataclass
+class FramePacket:
+    """
+    The state of a single frame while it moves through the stages of a FramePipeline.
+    """
+    index: int
+    image: np.ndarray
+    timestamp: Optional[float] = None
+    input_size: Optional[tuple[int, int]] = None  # Sizes of the settings at the time the frame got detected
+    inference_size: Optional[tuple[int, int]] = None
+    input_image: Optional[np.ndarray] = None
+    boxes: Any = None
+    tracks: list = field(default_factory=list)
+    count_text: Optional[str] = None  # Counts after tracking this frame, so they get rendered with its boxes
+    save_image: bool = False
+    show_image: Optional[np.ndarray] = None
+
+
+class PipelineStage:
+    """
+    A single stage of a FramePipeline, applying its function on every item of its input queue on its own thread.
+
+    The function returns the item for the next stage, or None to drop the item.
+
+    """
+    def __init__(self, name: str, fn: Callable[[Any], Any]):
+        self.name = name
+        self.fn = fn
+        self.busy_time: float = 0.0
+        self.processed: int = 0
+        self.failed: int = 0
+
+    def get_metrics(self, elapsed: float) -> dict:
+        return {
+            "processed": self.processed,
+            "failed": self.failed,
+            "busy_seconds": round(self.busy_time, 3),
+            "occupancy": round(self.busy_time / elapsed, 3) if elapsed > 0 else 0.0,
+        }
+
+
+class FramePipeline:
+    """
+    Runs a sequence of stages on their own threads, linked by bounded queues, so the throughput is bound by the slowest stage instead of the sum of all stages.
+
+    Every stage has exactly one thread and the queues are FIFO, so items leave the pipeline in the order they entered it. A full queue blocks the stage producing into it.
+
+    """
+    def __init__(self, stages: list[tuple[str, Callable[[Any], Any]]], queue_size: int = 4):
+        self.logger = Logger.setup_logger()
+        self.stages = [PipelineStage(name=name, fn=fn) for name, fn in stages]
+        self.queue_size = max(1, queue_size)
+        self.queues: list[queue.Queue] = []
+        self.threads: list[threading.Thread] = []
+        self.stop_event = threading.Event()
+        self.start_time: float = 0.0
+        self.decoded: int = 0
+        self.depth_samples: list[int] = []
+        self.depth_sums: list[int] = []
+
+    def run(self, source: Iterable) -> Iterator:
+        """
+        Feeds the items of source through all stages and yields the results of the last stage in order.
+        """
+        self.stop_event.clear()
+        self.queues = [queue.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)]
+        self.depth_samples = [0] * len(self.queues)
+        self.depth_sums = [0] * len(self.queues)
+        self.start_time = time.perf_counter()
+
+        self.threads = [threading.Thread(target=self._feed, args=(source, ), name="Pipeline decode", daemon=True)]
+        self.threads += [threading.Thread(target=self._work, args=(i, ), name=f"Pipeline {stage.name}", daemon=True) for i, stage in enumerate(self.stages)]
+        for thread in self.threads:
+            thread.start()
+
+        try:
+            while True:
+                item = self._get(len(self.queues) - 1)
+                if item is None or item is _END_OF_STREAM:
+                    break
+                yield item
+        finally:
+            self.stop()
+
+    def cancel(self) -> None:
+        """
+        Signals all stages to stop without waiting for them, safe to call from any thread.
+        """
+        self.stop_event.set()
+
+    def stop(self) -> None:
+        """
+        Stops all stages, items still in the queues get discarded.
+        """
+        self.stop_event.set()
+        for q in self.queues:
+            while not q.empty():
+                q.get_nowait()
+        for thread in self.threads:
+            if thread is not threading.current_thread():
+                thread.join()
+        self.threads = []
+
+    def _feed(self, source: Iterable) -> None:
+        try:
+            for item in source:
+                if not self._put(0, item):
+                    return
+                self.decoded += 1
+        except Exception as e:
+            self.logger.error(traceback.format_exc())
+            self.logger.error(e)
+        finally:
+            self._put(0, _END_OF_STREAM)
+
+    def _work(self, index: int) -> None:
+        stage = self.stages[index]
+        while True:
+            item = self._get(index)
+            if item is None:
+                return
+            if item is _END_OF_STREAM:
+                self._put(index + 1, _END_OF_STREAM)
+                return
+
+            start = time.perf_counter()
+            try:
+                item = stage.fn(item)
+                stage.processed += 1
+            except Exception as e:
+                self.logger.error(traceback.format_exc())
+                self.logger.error(e)
+                stage.failed += 1
+                item = None
+            stage.busy_time += time.perf_counter() - start
+
+            if item is not None and not self._put(index + 1, item):
+                return
+
+    def _put(self, index: int, item: Any) -> bool:
+        while not self.stop_event.is_set():
+            try:
+                self.queues[index].put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, index: int) -> Any:
+        self.depth_sums[index] += self.queues[index].qsize()
+        self.depth_samples[index] += 1
+        while not self.stop_event.is_set():
+            try:
+                return self.queues[index].get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return None
+
+    def get_metrics(self) -> dict:
+        """
+        Returns the current and average depth of every queue and the processed items and occupancy (fraction of time busy) of every stage.
+
+        The stage with the highest occupancy is the bottleneck of the pipeline.
+
+        """
+        elapsed = time.perf_counter() - self.start_time if self.start_time else 0.0
+        names = ["decode"] + [stage.name for stage in self.stages]
+        stages = {stage.name: stage.get_metrics(elapsed=elapsed) for stage in self.stages}
+        queues = {
+            f"{names[i]}_out": {
+                "depth": q.qsize(),
+                "mean_depth": round(self.depth_sums[i] / self.depth_samples[i], 2) if self.depth_samples[i] else 0.0,
+                "capacity": self.queue_size,
+            }
+            for i, q in enumerate(self.queues)
+        }
+        return {
+            "elapsed_seconds": round(elapsed, 3),
+            "decoded": self.decoded,
+            "stages": stages,
+            "queues": queues,
+            "bottleneck": max(stages, key=lambda name: stages[name]["occupancy"]) if stages else None,
+        }
@@ -1,6 +1,7 @@
 import numpy as np
 import ultralytics
 
+from elements.load_model.load_model_onnx import OnnxModel
 from elements.settings.general_settings import GeneralSettings
 from elements.settings.model_settings import ModelSettings
 from elements.utils import Logger
@@ -18,11 +19,30 @@ class Predictor:
     def predict(self, image: np.ndarray) -> np.ndarray:
         """
         Performs inference on a given image.
+
+        Only the tracked classes get passed to the postprocessing of the model, so boxes of other classes are dropped before non maximum suppression.
+
         """
         if self.model_settings.model is None:
             return np.asarray([])
         if isinstance(self.model_settings.model, ultralytics.models.yolo.model.YOLO):
-            predictions = self.model_settings.model(image, imgsz=image.shape[0], verbose=False, conf=self.general_settings.box_threshold, device=self.model_settings.device)
+            predictions = self.model_settings.model(image, imgsz=image.shape[0], verbose=False, conf=self.general_settings.box_threshold, classes=self.general_settings.tracked_class_ids, device=self.model_settings.device)
+        elif isinstance(self.model_settings.model, OnnxModel):
+            predictions = self.model_settings.model(image, conf=self.general_settings.box_threshold, classes=self.general_settings.tracked_class_ids)
         else:
             predictions = self.model_settings.model(image)
         return predictions
+
+    def predict_batch(self, images: list[np.ndarray]) -> list:
+        """
+        Performs inference on a batch of equally sized images in a single forward pass if the model supports it.
+
+        Returns the predictions per image, in the same form as predict returns them for a single image.
+
+        """
+        if self.model_settings.model is None:
+            return [np.asarray([]) for _ in images]
+        if isinstance(self.model_settings.model, ultralytics.models.yolo.model.YOLO):
+            results = self.model_settings.model(images, imgsz=images[0].shape[0], verbose=False, conf=self.general_settings.box_threshold, classes=self.general_settings.tracked_class_ids, device=self.model_settings.device)
+            return [[result] for result in results]
+        return [self.predict(image=image) for image in images]
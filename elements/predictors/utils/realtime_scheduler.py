@@ -0,0 +1,59 @@
+import time
+from typing import Iterator, Optional
+
+import numpy as np
+
+from elements.predictors.utils.video_reader import VideoReader
+
+
+class RealtimeScheduler:
+    """
+    Plays a video file back like a live camera feed: the wall clock since the start maps to the frame of the video that is due, at the fps of the video.
+
+    When processing is faster than the video, the scheduler waits until the next frame is due. When it is slower, the frames that passed in the meantime are skipped with grab,
+    which advances the decoder without converting the frames to images, and the frame that is due now gets decoded. The output stays in sync with the video like it would with a
+    camera, instead of drifting further behind.
+
+    """
+    def __init__(self, fps: float):
+        self.fps = fps
+        self.start_time: Optional[float] = None
+        self.processed = 0
+        self.dropped = 0
+
+    def frames(self, video_reader: VideoReader, start_frame: int = 0, end_frame: Optional[int] = None) -> Iterator[tuple[int, np.ndarray]]:
+        """
+        Returns the frames of the video in the range [start_frame, end_frame) that can be processed in time, together with their index.
+        """
+        position = video_reader.seek(start_frame)
+        self.start_time = time.perf_counter()
+        while end_frame is None or position < end_frame:
+            due_frame = start_frame + int((time.perf_counter() - self.start_time) * self.fps)
+            if position < due_frame:
+                if not video_reader.vidcap.grab():
+                    return
+                self.dropped += 1
+                position += 1
+                continue
+            if position > due_frame:
+                time.sleep(max(0.0, self.start_time + (position - start_frame) / self.fps - time.perf_counter()))
+
+            success, image = video_reader.vidcap.read()
+            if not success:
+                return
+            self.processed += 1
+            yield position, image
+            position += 1
+
+    def get_metrics(self) -> dict:
+        """
+        Returns the fps of the video, the fps the frames got processed at and the amount of processed and dropped frames.
+        """
+        elapsed = time.perf_counter() - self.start_time if self.start_time is not None else 0.0
+        return {
+            "source_fps": round(self.fps, 2),
+            "achieved_fps": round(self.processed / elapsed, 2) if elapsed > 0 else 0.0,
+            "processed": self.processed,
+            "dropped": self.dropped,
+            "dropped_ratio": round(self.dropped / (self.processed + self.dropped), 3) if self.processed + self.dropped else 0.0,
+        }
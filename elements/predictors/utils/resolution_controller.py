@@ -0,0 +1,74 @@
+import collections
+import statistics
+from typing import Optional
+
+
+class ResolutionController:
+    """
+    Adapts the resolution a live feed gets detected at to a target fps, by stepping through a ladder of fractions of the input size.
+
+    Every size of the ladder is rounded to a multiple of the stride of the model, so the model does not pad it. The resolution steps down as soon as the median time per frame
+    exceeds the time available per frame, and only steps up again once the median time, scaled by the amount of pixels of the larger size, stays clearly under it. After every
+    step the controller waits settle_frames frames, so the new resolution gets measured before deciding again and a single slow frame, like the first one at a new size, does not
+    cause a step.
+
+    """
+    def __init__(self, target_fps: float, scales: tuple[float, ...] = (1.0, 0.875, 0.75, 0.625, 0.5), stride: int = 32, headroom: float = 0.75, settle_frames: int = 10):
+        self.target_fps = float(target_fps)
+        self.scales = scales
+        self.stride = stride
+        self.headroom = headroom
+        self.settle_frames = settle_frames
+
+        self.level = 0
+        self.frame_times: collections.deque = collections.deque(maxlen=settle_frames)
+        self.steps_down = 0
+        self.steps_up = 0
+
+    def get_size(self, base_size: tuple[int, int], level: Optional[int] = None) -> tuple[int, int]:
+        """
+        Returns the (width, height) to detect at for the given input size at a level of the ladder, the current level if not passed.
+        """
+        scale = self.scales[self.level if level is None else level]
+        return tuple(max(self.stride, round(dimension * scale / self.stride) * self.stride) for dimension in base_size)
+
+    def get_sizes(self, base_size: tuple[int, int]) -> list[tuple[int, int]]:
+        """
+        Returns the distinct (width, height) of every level of the ladder for the given input size.
+        """
+        return list(dict.fromkeys(self.get_size(base_size=base_size, level=level) for level in range(len(self.scales))))
+
+    def update(self, frame_time: float) -> int:
+        """
+        Registers the time in seconds the last frame took and returns the level of the ladder to use for the next frames, 0 being the full input size.
+        """
+        if self.target_fps <= 0:
+            return self.level
+
+        self.frame_times.append(frame_time)
+        if len(self.frame_times) < self.settle_frames:
+            return self.level
+
+        median_time = statistics.median(self.frame_times)
+        budget = 1 / self.target_fps
+        if median_time > budget and self.level < len(self.scales) - 1:
+            self.level += 1
+            self.steps_down += 1
+            self.frame_times.clear()
+        elif self.level > 0 and median_time * (self.scales[self.level - 1] / self.scales[self.level]) ** 2 < budget * self.headroom:
+            self.level -= 1
+            self.steps_up += 1
+            self.frame_times.clear()
+        return self.level
+
+    def get_metrics(self) -> dict:
+        """
+        Returns the current scale of the input size, the amount of steps taken and the median time per frame at the current level.
+        """
+        return {
+            "target_fps": self.target_fps,
+            "scale": self.scales[self.level],
+            "steps_down": self.steps_down,
+            "steps_up": self.steps_up,
+            "median_ms": round(statistics.median(self.frame_times) * 1000, 2) if self.frame_times else None,
+        }
@@ -1,10 +1,15 @@
 import os
-import shutil
 import time
+from typing import Optional
 
 import cv2
 import numpy as np
 
+from elements.enums import OverflowPolicy
+from elements.predictors.utils.async_image_writer import AsyncImageWriter
+from elements.predictors.utils.async_video_writer import AsyncVideoWriter
+from elements.predictors.utils.segmented_video_writer import SegmentedVideoWriter, link_or_copy
+from elements.predictors.utils.track_exporter import TrackExporter
 from elements.utils import Logger
 
 
@@ -14,22 +19,42 @@ class ResultSaver:
 
     By using it as a context manager, you are sure that the VideoWriter instance gets released and that a copy of the resulting video gets saved
 
+    The video gets encoded on a background thread by an AsyncVideoWriter, with a queue of video_queue_size frames handled according to overflow_policy when full. Images get
+    saved in the background by an AsyncImageWriter.
+
+    If segment_seconds or segment_bytes is set, or the fps is unknown, the video gets written in segments by a SegmentedVideoWriter instead, measuring the fps per segment when unknown.
+
+    With export_tracks, the active tracks of every frame get exported to output/tracks/<time> by a TrackExporter.
+
     """
-    def __init__(self, output_folder: str):
+    def __init__(self, output_folder: str, video_queue_size: int = 32, overflow_policy: OverflowPolicy = OverflowPolicy.BLOCK, image_writer: Optional[AsyncImageWriter] = None, segment_seconds: float = 0.0, segment_bytes: int = 0, export_tracks: bool = False, classes: Optional[list[str]] = None):
         self.logger = Logger.setup_logger()
         self.local_output_folder = "output"
         self.output_folder = output_folder
         self.out_file: str = os.path.join(self.output_folder, "output", "videos", f"{time.time()}.mp4")
-        self.out_video = None
+        self.out_video: Optional[AsyncVideoWriter] = None
         self.frame_size = None
+        self.video_queue_size = video_queue_size
+        self.overflow_policy = overflow_policy
+        self.segment_seconds = segment_seconds
+        self.segment_bytes = segment_bytes
+        self.image_writer = image_writer if image_writer is not None else AsyncImageWriter()
+        self.track_exporter: Optional[TrackExporter] = None
+        if export_tracks:
+            self.track_exporter = TrackExporter(folder=os.path.join(self.output_folder, "output", "tracks", os.path.splitext(os.path.basename(self.out_file))[0]), classes=classes or [])
         self.initialize_folder()
 
     def __enter__(self) -> 'ResultSaver':
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:
-        if isinstance(self.out_video, cv2.VideoWriter):
-            self.out_video.release()
+        self.image_writer.close()
+        if self.track_exporter is not None:
+            self.track_exporter.close()
+        if isinstance(self.out_video, SegmentedVideoWriter):
+            self.out_video.close()  # The segments are in the local cache already
+        elif isinstance(self.out_video, AsyncVideoWriter):
+            self.out_video.close()
             self.save_copy_video()
 
     def initialize_folder(self) -> None:
@@ -43,38 +68,52 @@ class ResultSaver:
 
     def save_image(self, image: np.ndarray) -> None:
         """
-        Save an image to the output folder.
+        Save an image to the output folder, encoded and written in the background.
         """
-        self.logger.info(f"Saving image to {os.path.join(self.output_folder, 'output', 'images', f'{time.time()}.png')}")
-        cv2.imwrite(filename=os.path.join(self.output_folder, "output", "images", f"{time.time()}.png"), img=image)
+        filename = self.image_writer.save(path=os.path.join(self.output_folder, "output", "images", str(time.time())), image=image)
+        self.logger.info(f"Saving image to {filename}")
 
-    def initiate_result_video(self, width: int, height: int, fps: float) -> None:
+    def initiate_result_video(self, width: int, height: int, fps: Optional[float]) -> None:
         """
-        Instantiates a cv2.VideoWriter object.
+        Instantiates an AsyncVideoWriter object, or a SegmentedVideoWriter when segmenting or if the fps is not known (None) and has to be measured.
         """
         # Proper frame size and codec
         self.frame_size = (width, height)  # (width, height)
         fourcc = cv2.VideoWriter_fourcc(*'mp4v')  # For .mp4 files
 
         # Video writer
-        self.out_video = cv2.VideoWriter(filename=self.out_file, fourcc=fourcc, fps=fps, frameSize=self.frame_size)
+        if fps is None or self.segment_seconds > 0 or self.segment_bytes > 0:
+            self.out_video = SegmentedVideoWriter(filename=self.out_file, fourcc=fourcc, frame_size=self.frame_size, cache_folder=os.path.join(self.local_output_folder, "videos"), fps=fps, segment_seconds=self.segment_seconds, segment_bytes=self.segment_bytes, queue_size=self.video_queue_size, overflow_policy=self.overflow_policy)
+            return
+        self.out_video = AsyncVideoWriter(filename=self.out_file, fourcc=fourcc, fps=fps, frame_size=self.frame_size, queue_size=self.video_queue_size, overflow_policy=self.overflow_policy)
 
     def append_image_to_video(self, image: np.ndarray) -> None:
         """
-        Appends an image to the cv2.VideoWriter instance created using initiate_result_video(...)
+        Queues an image to be appended to the video created using initiate_result_video(...)
         """
         if not self.frame_size:
             self.logger.exception("No VideoWriter instance initiated yet, use initiate_result_video first.")
             return
 
-        self.logger.info("Appending image to video")
-        self.out_video.write(cv2.resize(image, self.frame_size))
+        self.logger.debug("Appending image to video")
+        self.out_video.write(image)
+
+    def get_metrics(self) -> dict:
+        """
+        Returns the metrics of the image and video writer, like the queue lag and dropped frames.
+        """
+        metrics = {"image_writer": self.image_writer.get_metrics()}
+        if self.track_exporter is not None:
+            metrics["track_exporter"] = self.track_exporter.get_metrics()
+        if self.out_video is not None:
+            metrics["video_writer"] = self.out_video.get_metrics()
+        return metrics
 
     def save_copy_video(self) -> str:
         """
-        Copies the fully analyzed video to a local directory.
+        Saves the fully analyzed video to a local directory, hard linked if possible instead of copied.
         """
         local_cache_copy = os.path.join(self.local_output_folder, "videos", os.path.basename(self.out_file))
-        shutil.copy(src=self.out_file, dst=local_cache_copy)
-        self.logger.info(f"Saving video to: {local_cache_copy}")
+        method = link_or_copy(src=self.out_file, dst=local_cache_copy)
+        self.logger.info(f"Saving video to: {local_cache_copy} ({method})")
         return local_cache_copy
@@ -0,0 +1,138 @@
+import json
+import os
+import shutil
+import time
+from typing import Optional
+
+import numpy as np
+
+from elements.enums import OverflowPolicy
+from elements.predictors.utils.async_video_writer import AsyncVideoWriter
+
+
+def link_or_copy(src: str, dst: str) -> str:
+    """
+    Makes the file at src available at dst with a hard link, which costs no copying of the contents. Falls back to copying if linking is impossible, for example across
+    file systems.
+
+    :return: How the file got there, "link" or "copy".
+
+    """
+    if os.path.exists(dst):
+        os.remove(dst)
+    try:
+        os.link(src, dst)
+        return "link"
+    except OSError:
+        shutil.copy(src=src, dst=dst)
+        return "copy"
+
+
+class SegmentedVideoWriter(AsyncVideoWriter):
+    """
+    An AsyncVideoWriter that splits the result video in segments, rotated after segment_seconds or once a segment reaches segment_bytes, so files stay bounded and finished
+    segments can be read while recording continues.
+
+    Unless a fixed fps is passed, the fps of every segment is measured from the timestamps of its first probe_frames frames, which get buffered until the writer of the segment
+    is opened. Finished segments get hard linked into the cache folder and described by a line in the JSONL index file next to them.
+
+    """
+    def __init__(self, filename: str, fourcc: int, frame_size: tuple[int, int], cache_folder: str, fps: Optional[float] = None, segment_seconds: float = 0.0, segment_bytes: int = 0, probe_frames: int = 30, queue_size: int = 32, overflow_policy: OverflowPolicy = OverflowPolicy.BLOCK):
+        self.stem = os.path.splitext(filename)[0]
+        self.cache_folder = cache_folder
+        self.segment_seconds = segment_seconds
+        self.segment_bytes = segment_bytes
+        self.probe_frames = max(2, probe_frames)
+        self.index_file = f"{self.stem}_index.jsonl"
+        self.fixed_fps = fps
+
+        self.segment_index = 0
+        self.segment_file: Optional[str] = None
+        self.segment_frames = 0
+        self.segment_start: Optional[float] = None
+        self.segment_end: float = 0.0
+        self.probe: list[tuple[float, np.ndarray]] = []
+        self.segments: list[dict] = []
+
+        super().__init__(filename=filename, fourcc=fourcc, fps=None, frame_size=frame_size, queue_size=queue_size, overflow_policy=overflow_policy)
+
+    def write_frame(self, queued_at: float, frame: np.ndarray) -> None:
+        if self.writer is None:
+            self.probe.append((queued_at, frame))
+            if self.fixed_fps or len(self.probe) >= self.probe_frames:
+                self.open_segment()
+            return
+
+        self.writer.write(frame)
+        self.written += 1
+        self.segment_frames += 1
+        self.segment_end = queued_at
+
+        if self.segment_seconds > 0 and self.get_segment_duration() >= self.segment_seconds:
+            self.close_segment()
+        elif self.segment_bytes > 0 and self.segment_frames % 25 == 0 and os.path.getsize(self.segment_file) >= self.segment_bytes:
+            self.close_segment()
+
+    def get_segment_duration(self) -> float:
+        """
+        Returns the duration of the current segment, in video time with a fixed fps and in wall clock time with a measured fps.
+        """
+        if self.fixed_fps:
+            return self.segment_frames / self.fixed_fps
+        return self.segment_end - self.segment_start
+
+    def open_segment(self) -> None:
+        """
+        Opens the writer of the next segment with the fps measured over the buffered probe frames and writes them.
+        """
+        first, last = self.probe[0][0], self.probe[-1][0]
+        if self.fixed_fps:
+            self.fps = self.fixed_fps
+        else:
+            self.fps = (len(self.probe) - 1) / (last - first) if last > first else 25.0
+
+        self.segment_index += 1
+        self.segment_file = f"{self.stem}_{self.segment_index:04d}.mp4"
+        self.segment_frames = 0
+        self.segment_start = first
+        self.writer = self.open_writer(filename=self.segment_file, fps=self.fps)
+        self.logger.info(f"Started video segment {self.segment_file} with {'an' if self.fixed_fps else 'a measured'} fps of {self.fps:.2f}")
+
+        probe, self.probe = self.probe, []
+        for queued_at, frame in probe:
+            self.write_frame(queued_at=queued_at, frame=frame)
+
+    def close_segment(self) -> None:
+        """
+        Finishes the current segment, links it into the cache folder and adds it to the index.
+        """
+        self.writer.release()
+        self.writer = None
+
+        cache_file = os.path.join(self.cache_folder, os.path.basename(self.segment_file))
+        method = link_or_copy(src=self.segment_file, dst=cache_file)
+
+        segment = {
+            "segment": self.segment_index,
+            "file": self.segment_file,
+            "cache_file": cache_file,
+            "cached_by": method,
+            "start_time": round(time.time() - (time.perf_counter() - self.segment_start), 3),
+            "duration_seconds": round(self.get_segment_duration(), 3),
+            "frames": self.segment_frames,
+            "fps": round(self.fps, 3),
+            "bytes": os.path.getsize(self.segment_file),
+        }
+        self.segments.append(segment)
+        with open(self.index_file, "a") as file:
+            file.write(json.dumps(segment) + "\n")
+        self.logger.info(f"Finished video segment {self.segment_file} with {self.segment_frames} frames, {method} saved to {cache_file}")
+
+    def finish(self) -> None:
+        if self.writer is None and self.probe:
+            self.open_segment()  # Fewer frames than probe_frames arrived, measure the fps on those
+        if self.writer is not None:
+            self.close_segment()
+
+    def get_metrics(self) -> dict:
+        return {**super().get_metrics(), "segments": len(self.segments), "segment_fps": round(self.fps, 2) if self.fps else None}
@@ -0,0 +1,130 @@
+import json
+import os
+import queue
+import threading
+import time
+import traceback
+from typing import Optional
+
+import numpy as np
+
+from elements.datatypes.boundingbox import BoundingBox
+from elements.utils import Logger
+
+_END_OF_STREAM = object()
+
+
+class TrackExporter:
+    """
+    Streams the active tracks of every frame to chunked, append-only NPZ files, so analytics can work from compact tables instead of re-running the detector.
+
+    Rows get collected in preallocated columns on the calling thread, which costs little per frame. Full chunks, or chunks older than flush_seconds, get compressed and saved on
+    a background thread as tracks_<chunk>.npz with the columns frame, timestamp, track_id, class_id, confidence and box ([x1, y1, x2, y2] in source image coordinates).
+
+    """
+    def __init__(self, folder: str, classes: list[str], chunk_rows: int = 65536, flush_seconds: float = 60.0, max_pending_chunks: int = 4):
+        self.logger = Logger.setup_logger()
+        self.folder = folder
+        self.chunk_rows = max(1, chunk_rows)
+        self.flush_seconds = flush_seconds
+        os.makedirs(self.folder, exist_ok=True)
+        with open(os.path.join(self.folder, "meta.json"), "w") as file:
+            json.dump({"classes": classes, "columns": ["frame", "timestamp", "track_id", "class_id", "confidence", "box"], "box_format": "x1y1x2y2"}, file)
+
+        self.columns = self.allocate_columns()
+        self.rows = 0
+        self.chunk_index = 0
+        self.chunk_started = time.perf_counter()
+        self.exported_rows = 0
+        self.closed = False
+
+        self.chunk_queue: queue.Queue = queue.Queue(maxsize=max(1, max_pending_chunks))
+        self.thread = threading.Thread(target=self._write_worker, name="Track exporter", daemon=True)
+        self.thread.start()
+
+    def allocate_columns(self) -> dict[str, np.ndarray]:
+        return {
+            "frame": np.empty(self.chunk_rows, dtype=np.int64),
+            "timestamp": np.empty(self.chunk_rows, dtype=np.float64),
+            "track_id": np.empty(self.chunk_rows, dtype=np.int64),
+            "class_id": np.empty(self.chunk_rows, dtype=np.int16),
+            "confidence": np.empty(self.chunk_rows, dtype=np.float32),
+            "box": np.empty((self.chunk_rows, 4), dtype=np.float32),
+        }
+
+    def append(self, frame_index: int, timestamp: float, boxes: list[BoundingBox], scale: tuple[float, float] = (1.0, 1.0)) -> None:
+        """
+        Adds a row per box of an active track of the frame, the boxes get multiplied by scale (width, height) to convert them to source image coordinates.
+        """
+        if self.closed:
+            return
+
+        for box in boxes:
+            if self.rows == self.chunk_rows:
+                self.flush()
+            i = self.rows
+            self.columns["frame"][i] = frame_index
+            self.columns["timestamp"][i] = timestamp
+            self.columns["track_id"][i] = box.track_id if box.track_id is not None else -1
+            self.columns["class_id"][i] = box.class_id
+            self.columns["confidence"][i] = box.confidence if box.confidence is not None else np.nan
+            self.columns["box"][i] = (box.x1 * scale[0], box.y1 * scale[1], box.x2 * scale[0], box.y2 * scale[1])
+            self.rows += 1
+
+        if self.rows and time.perf_counter() - self.chunk_started >= self.flush_seconds:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Hands the collected rows to the background thread to be saved as the next chunk and starts a new one.
+        """
+        if self.rows:
+            chunk = {name: column[:self.rows] for name, column in self.columns.items()}
+            self.chunk_queue.put((self.chunk_index, chunk))
+            self.chunk_index += 1
+            self.exported_rows += self.rows
+            self.columns = self.allocate_columns()  # The queued chunk still references the old columns
+            self.rows = 0
+        self.chunk_started = time.perf_counter()
+
+    def _write_worker(self) -> None:
+        while True:
+            item = self.chunk_queue.get()
+            if item is _END_OF_STREAM:
+                return
+
+            chunk_index, chunk = item
+            filename = os.path.join(self.folder, f"tracks_{chunk_index:05d}.npz")
+            try:
+                with open(f"{filename}.tmp", "wb") as file:
+                    np.savez_compressed(file, **chunk)
+                os.replace(f"{filename}.tmp", filename)  # Readers never see a partially written chunk
+            except Exception as e:
+                self.logger.error(traceback.format_exc())
+                self.logger.error(e)
+
+    def close(self) -> None:
+        """
+        Saves the remaining rows and waits for all chunks to be written.
+        """
+        if self.closed:
+            return
+        self.flush()
+        self.closed = True
+        self.chunk_queue.put(_END_OF_STREAM)
+        self.thread.join()
+        self.logger.info(f"Exported {self.exported_rows} track rows in {self.chunk_index} chunks to {self.folder}")
+
+    def get_metrics(self) -> dict:
+        return {"exported_rows": self.exported_rows + self.rows, "chunks": self.chunk_index, "pending_chunks": self.chunk_queue.qsize()}
+
+
+def load_tracks(folder: str) -> Optional[dict[str, np.ndarray]]:
+    """
+    Reads all chunks exported by a TrackExporter in the folder and concatenates them per column.
+    """
+    filenames = sorted(name for name in os.listdir(folder) if name.startswith("tracks_") and name.endswith(".npz"))
+    if not filenames:
+        return None
+    chunks = [dict(np.load(os.path.join(folder, name))) for name in filenames]
+    return {name: np.concatenate([chunk[name] for chunk in chunks]) for name in chunks[0]}
@@ -1,10 +1,13 @@
+import collections
 import os
+import threading
 import time
-from typing import Self, Iterator
+from typing import Self, Iterator, Optional
 
 import cv2
 import numpy as np
 
+from elements.predictors.utils.async_image_writer import AsyncImageWriter
 from elements.settings.general_settings import GeneralSettings
 from elements.utils import Logger
 
@@ -97,31 +100,116 @@ def get_webcam_settings(camera_index: int = -1, verbose: bool = False) -> cv2.Vi
 class VideoCapture:
     """
     A VideoCapture instance is responsible for reading images from the webcam and returning it frame for frame in a generator method.
+
+    A background thread reads the camera continuously and keeps only the newest frame with its capture time in a single slot, so the driver buffer never fills up while a frame
+    is being processed. The consumer always gets the freshest frame, the frames it was too slow for are counted as dropped. With save_all_frames, a frame is not saved when the
+    image writer is behind, so writing to a slow disk never stalls reading the camera.
+
     """
-    def __init__(self, camera_index: int = 0, save_directory: str = "output"):
+    def __init__(self, camera_index: int = 0, save_directory: str = "output", latency_history: int = 100):
         self.logger = Logger.setup_logger()
         self.vidcap = get_webcam_settings(camera_index=camera_index, verbose=True)
         self.save_folder = os.path.join(save_directory, str(time.time()))
         os.makedirs(self.save_folder, exist_ok=True)
+        self.image_writer: Optional[AsyncImageWriter] = None
+
+        self._condition = threading.Condition()
+        self._stop_event = threading.Event()
+        self._capture_thread: Optional[threading.Thread] = None
+        self._slot: Optional[tuple[float, np.ndarray]] = None
+        self._fresh = False  # Whether the frame in the slot did not get returned yet
+        self._ended = False
+
+        self.captured = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.dropped_saves = 0  # Frames not saved with save_all_frames because the image writer was behind
+        self.latencies: collections.deque = collections.deque(maxlen=latency_history)
 
     def __enter__(self) -> Self:
         return self
 
-    def frames(self, general_settings: GeneralSettings) -> Iterator[np.ndarray]:
-        success, image = self.vidcap.read()
-        i: int = 0
-        while success:
-            yield image
-            success, image = self.vidcap.read()
-            if general_settings.save_all_frames:
-                logger.info(f"Saving frame to {os.path.join(self.save_folder, f'frame{str(i)}.png')}")
-                cv2.imwrite(os.path.join(self.save_folder, f"frame{str(i)}.png"), image)
-                i += 1
-        return None
+    def frames(self, general_settings: GeneralSettings) -> Iterator[tuple[float, np.ndarray]]:
+        """
+        Returns the newest frame of the camera together with its capture time from time.time(), every time the previous one is processed, until the camera stops delivering.
+        """
+        self._capture_thread = threading.Thread(target=self._capture_worker, args=(general_settings,), name="VideoCapture grabber", daemon=True)
+        self._capture_thread.start()
+
+        while True:
+            with self._condition:
+                while not self._fresh and not self._ended:
+                    self._condition.wait()
+                if not self._fresh:
+                    return None
+                capture_time, image = self._slot
+                self._fresh = False
+                self.delivered += 1
+            yield capture_time, image
+
+    def _capture_worker(self, general_settings: GeneralSettings) -> None:
+        """
+        Reads frames into the slot as fast as the camera delivers them, replacing a frame the consumer did not take yet.
+        """
+        try:
+            while not self._stop_event.is_set():
+                success, image = self.vidcap.read()
+                if not success:
+                    break
+                capture_time = time.time()
+
+                if general_settings.save_all_frames:
+                    if self.image_writer is None:
+                        self.image_writer = AsyncImageWriter(image_format=general_settings.image_format, compression=general_settings.image_compression, max_pending=general_settings.image_queue_size)
+                    filename = self.image_writer.save(path=os.path.join(self.save_folder, f"frame{str(self.captured)}"), image=image, block=False)
+                    if filename is None:
+                        self.dropped_saves += 1
+                    else:
+                        logger.debug(f"Saving frame to {filename}")
+
+                with self._condition:
+                    if self._fresh:
+                        self.dropped += 1
+                    self._slot = (capture_time, image)
+                    self._fresh = True
+                    self.captured += 1
+                    self._condition.notify()
+        except Exception as e:
+            self.logger.exception(e)
+        finally:
+            with self._condition:
+                self._ended = True
+                self._condition.notify()
+
+    def record_display(self, capture_time: float) -> None:
+        """
+        Registers that the frame captured at capture_time got displayed and published, for the capture to display latency.
+        """
+        self.latencies.append(time.time() - capture_time)
+
+    def get_metrics(self) -> dict:
+        """
+        Returns the amount of captured, processed and dropped frames, the frames not saved and the latency from capturing a frame to displaying it over the last frames.
+        """
+        latencies_ms = np.asarray(self.latencies) * 1000
+        return {
+            "captured": self.captured,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "dropped_saves": self.dropped_saves,
+            "latency_ms": round(float(latencies_ms.mean()), 1) if len(latencies_ms) else None,
+            "p95_latency_ms": round(float(np.percentile(latencies_ms, 95)), 1) if len(latencies_ms) else None,
+        }
 
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:
         self.release()
 
     def release(self) -> None:
+        self._stop_event.set()
+        if self._capture_thread is not None:
+            self._capture_thread.join()
+            self._capture_thread = None
+        if self.image_writer is not None:
+            self.image_writer.close()  # Saves the frames still pending
         if isinstance(self.vidcap, cv2.VideoCapture):
             self.vidcap.release()
@@ -1,34 +1,150 @@
-from typing import Iterator
+import queue
+import threading
+from typing import Iterator, Optional
 
 import cv2
 import numpy as np
 
+_END_OF_STREAM = object()
+
 
 class VideoReader:
     """
     A VideoReader instance is responsible for taking in a video path and returning it frame for frame in a generator method.
+
+    If prefetch_frames is larger than 0, frames get decoded ahead on a background thread into a bounded queue of that size, so decoding overlaps with the processing of the
+    previous frames. The decoding thread blocks as soon as the queue is full.
+
     """
-    def __init__(self, input_path: str) -> None:
+    def __init__(self, input_path: str, prefetch_frames: int = 0) -> None:
         self.vidcap: cv2.VideoCapture = cv2.VideoCapture(input_path)
         if not self.vidcap.isOpened():
             raise ValueError(f"Failed to open video file: {input_path}")
         self.total_frames: int = int(self.vidcap.get(cv2.CAP_PROP_FRAME_COUNT))
         self.fps: float = self.vidcap.get(cv2.CAP_PROP_FPS)
+        self.prefetch_frames = max(0, int(prefetch_frames))
+
+        self._stop_event = threading.Event()
+        self._decode_thread: Optional[threading.Thread] = None
 
     def __enter__(self) -> 'VideoReader':
         return self
 
-    def frames(self, skip_frames: int = 0) -> Iterator[tuple[int, np.ndarray]]:
-        current_frame: int = 0
+    def resolve_frame_range(self, start_frame: int = 0, end_frame: Optional[int] = None, start_time: Optional[float] = None, end_time: Optional[float] = None) -> tuple[int, Optional[int]]:
+        """
+        Converts the requested start and end of the video to a frame range [start, end). Timestamps are in seconds and take precedence over frame indices.
+
+        The end is None if it is not requested and the container does not report its length. Only None leaves the end unset, an end of 0 is an empty range.
+
+        """
+        for name, value in (("start frame", start_frame), ("end frame", end_frame), ("start time", start_time), ("end time", end_time)):
+            if value is not None and value < 0:
+                raise ValueError(f"Negative {name} requested: {value}")
+
+        if start_time is not None:
+            start_frame = int(round(start_time * self.fps))
+        if end_time is not None:
+            end_frame = int(round(end_time * self.fps))
+
+        start_frame = int(start_frame or 0)
+        if end_frame is None:
+            end_frame = self.total_frames if self.total_frames > 0 else None
+        elif self.total_frames > 0:
+            end_frame = min(int(end_frame), self.total_frames)
+
+        if end_frame is not None and start_frame >= end_frame:
+            raise ValueError(f"Empty frame range requested: start {start_frame}, end {end_frame}")
+        return start_frame, end_frame
+
+    def seek(self, frame_index: int) -> int:
+        """
+        Moves the decoder to frame_index using the keyframe index of the container, returns the index of the next frame that will be decoded.
+
+        Falls back to grabbing (without decoding to an image) frame for frame if the backend cannot seek.
+
+        """
+        if frame_index <= 0:
+            return 0
+
+        if self.vidcap.set(cv2.CAP_PROP_POS_FRAMES, frame_index):
+            position = int(self.vidcap.get(cv2.CAP_PROP_POS_FRAMES))
+            if position == frame_index:
+                return position
+
+        self.vidcap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        position = 0
+        while position < frame_index and self.vidcap.grab():
+            position += 1
+        return position
+
+    def frames(self, start_frame: int = 0, end_frame: Optional[int] = None) -> Iterator[tuple[int, np.ndarray]]:
+        """
+        Returns the frames of the video in the range [start_frame, end_frame) together with their index, decoded ahead on a background thread if prefetching is enabled.
+        """
+        if self.prefetch_frames > 0:
+            yield from self._prefetched_frames(start_frame=start_frame, end_frame=end_frame)
+        else:
+            yield from self._decoded_frames(start_frame=start_frame, end_frame=end_frame)
+
+    def _decoded_frames(self, start_frame: int = 0, end_frame: Optional[int] = None) -> Iterator[tuple[int, np.ndarray]]:
+        current_frame: int = self.seek(start_frame)
         success, image = self.vidcap.read()
-        while success:
-            if current_frame >= skip_frames:
-                yield current_frame, image
+        while success and not self._stop_event.is_set() and (end_frame is None or current_frame < end_frame):
+            yield current_frame, image
             current_frame += 1
             success, image = self.vidcap.read()
 
+    def _prefetched_frames(self, start_frame: int = 0, end_frame: Optional[int] = None) -> Iterator[tuple[int, np.ndarray]]:
+        frame_queue: queue.Queue = queue.Queue(maxsize=self.prefetch_frames)
+        self._stop_event.clear()
+        self._decode_thread = threading.Thread(target=self._decode_worker, args=(frame_queue, start_frame, end_frame), name="VideoReader decoder", daemon=True)
+        self._decode_thread.start()
+
+        try:
+            while True:
+                item = frame_queue.get()
+                if item is _END_OF_STREAM:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            self._stop_decoding(frame_queue=frame_queue)
+
+    def _decode_worker(self, frame_queue: queue.Queue, start_frame: int, end_frame: Optional[int]) -> None:
+        """
+        Decodes frames into the queue, blocks while the queue is full so the consumer applies back-pressure.
+        """
+        try:
+            for item in self._decoded_frames(start_frame=start_frame, end_frame=end_frame):
+                if not self._put(frame_queue=frame_queue, item=item):
+                    return
+        except Exception as e:
+            self._put(frame_queue=frame_queue, item=e)
+        finally:
+            self._put(frame_queue=frame_queue, item=_END_OF_STREAM)
+
+    def _put(self, frame_queue: queue.Queue, item: object) -> bool:
+        while not self._stop_event.is_set():
+            try:
+                frame_queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _stop_decoding(self, frame_queue: Optional[queue.Queue] = None) -> None:
+        self._stop_event.set()
+        if frame_queue is not None:
+            while not frame_queue.empty():
+                frame_queue.get_nowait()
+        if self._decode_thread is not None and self._decode_thread is not threading.current_thread():
+            self._decode_thread.join()
+            self._decode_thread = None
+
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:
         self.release()
 
     def release(self) -> None:
+        self._stop_decoding()
         self.vidcap.release()
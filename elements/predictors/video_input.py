@@ -1,13 +1,20 @@
+import os
 import time
 import traceback
+from typing import Iterator
 
 import gradio as gr
+import numpy as np
 import torch
 
 from elements.enums import ApplicationMode
+from elements.load_model.load_model_onnx import OnnxModel
 from elements.locker import Locker
 from elements.predictors.base_predictor import PredictorBase
 from elements.predictors.parameters import PredictorParameters
+from elements.predictors.utils.detection_cache import DETECTION_CACHE_FOLDER, DetectionCache, get_cache_key
+from elements.predictors.utils.pipeline import FramePacket
+from elements.predictors.utils.realtime_scheduler import RealtimeScheduler
 from elements.predictors.utils.video_reader import VideoReader
 from elements.settings.general_settings import GeneralSettings
 from elements.settings.model_settings import ModelSettings
@@ -32,48 +39,159 @@ class PredictorTrackerInput(PredictorBase):
             if self.general_settings.application_mode == ApplicationMode.GUI:
                 self.wait_for_websocket()
 
-            with VideoReader(self.predictor_parameters.input_path) as video_reader:
+            with VideoReader(self.predictor_parameters.input_path, prefetch_frames=self.general_settings.prefetch_frames if not self.general_settings.realtime else 0) as video_reader:
                 self.result_saver.initiate_result_video(width=self.general_settings.screen_width, height=self.general_settings.screen_height, fps=video_reader.fps)
 
-                with self.result_saver:
-                    for current_frame, image in video_reader.frames(skip_frames=self.predictor_parameters.skip_frames):
-                        try:
-                            with BenchmarkTimer("Process frame", wait_time=(1 / video_reader.fps) * 1000 if self.general_settings.realistic_processing else 0, print_time=False) as processing_timer:
-                                if self.aborting:
-                                    break
+                start_frame, end_frame = video_reader.resolve_frame_range(start_frame=self.predictor_parameters.start_frame, end_frame=self.predictor_parameters.end_frame, start_time=self.predictor_parameters.start_time, end_time=self.predictor_parameters.end_time)
+                total_frames = (end_frame if end_frame is not None else video_reader.total_frames) - start_frame
+                self.detection_interval = self.get_detection_interval(fps=video_reader.fps)
+                if self.detection_interval > 1:
+                    self.logger.info(f"Detecting every {self.detection_interval}th frame, the tracks get extrapolated in between")
+
+                try:
+                    if self.general_settings.detection_cache:
+                        self.detection_cache = self.open_detection_cache()
+                        if self.detection_cache.covers(start_frame=start_frame, end_frame=start_frame + total_frames, box_threshold=self.general_settings.box_threshold):
+                            self.logger.info("All frames are in the detection cache, replaying the detections without running the model")
+
+                    with self.result_saver:
+                        if self.general_settings.realtime:
+                            self.realtime_scheduler = RealtimeScheduler(fps=video_reader.fps)
+                            frames = self.realtime_scheduler.frames(video_reader=video_reader, start_frame=start_frame, end_frame=end_frame)
+                        else:
+                            frames = video_reader.frames(start_frame=start_frame, end_frame=end_frame)
+                        if self.general_settings.pipeline_queue_size > 0:
+                            self.predict_pipelined(frames=frames, fps=video_reader.fps, start_frame=start_frame, total_frames=total_frames)
+                        elif self.general_settings.batch_size > 1:
+                            self.predict_batched(frames=frames, fps=video_reader.fps, start_frame=start_frame, total_frames=total_frames)
+                        else:
+                            self.predict_serial(frames=frames, fps=video_reader.fps, start_frame=start_frame, total_frames=total_frames)
+
+                    self.log_metrics()
+                finally:
+                    if self.detection_cache is not None:
+                        self.detection_cache.close()  # Also keeps the detections of an aborted or failed run
 
-                                if current_frame % 50 == 0:
-                                    gr.Info(f"{(current_frame / video_reader.total_frames) * 100}% Done", duration=2)
+            if self.general_settings.application_mode == ApplicationMode.GUI:
+                self.websocket.finish_connection()
 
-                                while self.model_settings.model is None:
-                                    self.logger.info("Waiting for model to be loaded...")
-                                    time.sleep(0.1)
+        except Exception as e:
+            self.logger.error(e)
+            self.logger.error(traceback.format_exc())
 
-                                self.locker.lock.acquire()
+    def open_detection_cache(self) -> DetectionCache:
+        """
+        Opens the detection cache of the input video for the current model, input size and tracked classes.
+        """
+        while self.model_settings.model is None:
+            self.logger.info("Waiting for model to be loaded...")
+            time.sleep(0.1)
 
-                                if self.tracking_settings.reset:
-                                    self.update_settings()
+        key = get_cache_key(video_path=self.predictor_parameters.input_path, weights_path=os.path.join("models", "architectures", str(self.model_settings.architecture), str(self.model_settings.weights_path)), load_model_type="onnx" if isinstance(self.model_settings.model, OnnxModel) else "yolo", input_size=(int(self.general_settings.input_width), int(self.general_settings.input_height)), tracked_class_ids=self.general_settings.tracked_class_ids)
+        return DetectionCache(folder=DETECTION_CACHE_FOLDER, key=key)
 
-                                show_image, save_image = self.process_frame(image=image, display=self.predictor_parameters.display)
+    def report_progress(self, current_frame: int, start_frame: int, total_frames: int) -> None:
+        """
+        Shows the progress of the analysis in the GUI every 50 frames.
+        """
+        if current_frame % 50 == 0 and total_frames > 0:
+            gr.Info(f"{((current_frame - start_frame) / total_frames) * 100}% Done", duration=2)
 
-                                self.locker.lock.release()
+    def predict_serial(self, frames: Iterator[tuple[int, np.ndarray]], fps: float, start_frame: int, total_frames: int) -> None:
+        """
+        Processes the frames one after another on the calling thread.
+        """
+        for current_frame, image in frames:
+            try:
+                with BenchmarkTimer("Process frame", wait_time=(1 / fps) * 1000 if self.is_paced() else 0, print_time=False):
+                    if self.aborting:
+                        break
 
-                                if self.general_settings.save_results:
-                                    self.result_saver.append_image_to_video(image=show_image)
+                    self.report_progress(current_frame=current_frame, start_frame=start_frame, total_frames=total_frames)
 
-                                if self.general_settings.save_new_objects and save_image:
-                                    self.result_saver.save_image(image=show_image)
+                    while self.model_settings.model is None:
+                        self.logger.info("Waiting for model to be loaded...")
+                        time.sleep(0.1)
 
-                                self.set_response(image=show_image)
-                        except Exception as e:
-                            self.logger.error(traceback.format_exc())
-                            self.logger.error(e)
-                            if self.locker.lock.locked():
-                                self.locker.lock.release()
+                    self.locker.lock.acquire()
 
-            if self.general_settings.application_mode == ApplicationMode.GUI:
-                self.websocket.finish_connection()
+                    self.apply_tracking_changes()
+
+                    show_image, save_image = self.process_frame(image=image, display=self.predictor_parameters.display, frame_index=current_frame, timestamp=current_frame / fps)
+
+                    self.locker.lock.release()
+
+                    self.publish_frame(show_image=show_image, save_image=save_image)
+            except Exception as e:
+                self.logger.error(traceback.format_exc())
+                self.logger.error(e)
+                if self.locker.lock.locked():
+                    self.locker.lock.release()
+
+    def predict_batched(self, frames: Iterator[tuple[int, np.ndarray]], fps: float, start_frame: int, total_frames: int) -> None:
+        """
+        Processes the frames in batches of consecutive frames that get detected in a single forward pass, the detections are tracked frame for frame in order.
+        """
+        if self.is_paced():
+            frames = self.paced_frames(frames=frames, fps=fps)
 
+        batch: list[tuple[int, np.ndarray]] = []
+        for frame in frames:
+            if self.aborting:
+                return
+
+            batch.append(frame)
+            if len(batch) < self.general_settings.batch_size:
+                continue
+
+            self.process_frame_batch(batch=batch, fps=fps, start_frame=start_frame, total_frames=total_frames)
+            batch = []
+
+        if batch and not self.aborting:
+            self.process_frame_batch(batch=batch, fps=fps, start_frame=start_frame, total_frames=total_frames)
+
+    def process_frame_batch(self, batch: list[tuple[int, np.ndarray]], fps: float, start_frame: int, total_frames: int) -> None:
+        try:
+            for current_frame, _ in batch:
+                self.report_progress(current_frame=current_frame, start_frame=start_frame, total_frames=total_frames)
+
+            self.process_and_publish_batch(images=[image for _, image in batch], display=self.predictor_parameters.display, frame_indices=[current_frame for current_frame, _ in batch], timestamps=[current_frame / fps for current_frame, _ in batch])
         except Exception as e:
-            self.logger.error(e)
             self.logger.error(traceback.format_exc())
+            self.logger.error(e)
+
+    def predict_pipelined(self, frames: Iterator[tuple[int, np.ndarray]], fps: float, start_frame: int, total_frames: int) -> None:
+        """
+        Processes the frames in a FramePipeline, so decoding, detection, tracking, rendering and publishing of consecutive frames overlap.
+        """
+        if self.is_paced():
+            frames = self.paced_frames(frames=frames, fps=fps)
+
+        pipeline = self.create_pipeline(display=self.predictor_parameters.display)
+        for i, packet in enumerate(pipeline.run(FramePacket(index=current_frame, image=image, timestamp=current_frame / fps) for current_frame, image in frames)):
+            if self.aborting:
+                break
+            if self.predictor_parameters.display is not None:
+                self.predictor_parameters.display.show_image(packet.show_image)
+
+            self.report_progress(current_frame=packet.index, start_frame=start_frame, total_frames=total_frames)
+            if i > 0 and i % 500 == 0:
+                self.log_metrics()
+
+    def is_paced(self) -> bool:
+        """
+        Returns whether processing has to wait for the fps of the video, only with realistic processing and without the real time scheduler, which waits itself.
+        """
+        return self.general_settings.realistic_processing and not self.general_settings.realtime
+
+    @staticmethod
+    def paced_frames(frames: Iterator[tuple[int, np.ndarray]], fps: float) -> Iterator[tuple[int, np.ndarray]]:
+        """
+        Releases the frames no faster than the fps of the video.
+        """
+        start = time.perf_counter()
+        for i, frame in enumerate(frames):
+            remaining_time = start + i / fps - time.perf_counter()
+            if remaining_time > 0:
+                time.sleep(remaining_time)
+            yield frame
@@ -3,7 +3,7 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
 
-from elements.enums import NormalizeType, InputMode, ApplicationMode
+from elements.enums import NormalizeType, InputMode, ApplicationMode, OverflowPolicy
 
 
 @dataclass
@@ -19,6 +19,7 @@ class GeneralSettings:
         self.application_mode: ApplicationMode = ApplicationMode.GUI
         self.tracked_classes: list = []
         self.classes: list = []
+        self.tracked_class_ids: list[int] = []  # Indices of the tracked classes in classes, kept in sync by the settings changing either
         self.bpp: int = 8
         self.gamma_correction_bool: bool = False
         self.gamma_correction_value: float = 2.2
@@ -34,9 +35,29 @@ class GeneralSettings:
         self.save_all_frames: bool = False
         self.save_results: bool = False
         self.save_new_objects: bool = False
+        self.export_tracks: bool = False
 
         self.normalize_type: Optional[NormalizeType] = None
         self.advanced_view: bool = False
         self.realistic_processing: bool = True
+        self.realtime: bool = False
+        self.prefetch_frames: int = 8
+        self.detection_cache: bool = False
+        self.workers: int = 1
+        self.chunk_overlap_frames: int = 60
+        self.pipeline_queue_size: int = 0
+        self.batch_size: int = 1
+        self.batch_latency_ms: float = 0.0
+        self.motion_sensitivity: float = 0.0  # 0 runs the detector on every camera frame
+        self.target_fps: float = 0.0  # Fps the detection size of a camera feed adapts to, 0 always detects at the input size
+        self.detection_interval: int = 1  # Detect every x-th frame of a video file, the tracks get extrapolated in between
+        self.detection_fps: float = 0.0  # Detection rate for video files, takes precedence over detection_interval if above 0
+        self.video_queue_size: int = 32
+        self.video_overflow_policy: OverflowPolicy = OverflowPolicy.BLOCK
+        self.image_format: str = "png"
+        self.image_compression: int = -1  # PNG compression level or JPG/WebP quality, -1 is the standard of the format
+        self.image_queue_size: int = 16
+        self.segment_minutes: float = 0.0
+        self.segment_max_mb: float = 0.0
         self.box_threshold: float = 0.6
         self.output_folder: str = os.path.join(Path.home(), "Downloads")
\ No newline at end of file
@@ -3,6 +3,7 @@ import gradio as gr
 from elements.enums import Tasks, InputMode
 from elements.locker import Locker
 from elements.settings.params.param_settings import ParamSetting
+from elements.trackers.tracker_registry import get_parameter_label
 
 
 class AdvancedViewSetting(ParamSetting):
@@ -17,8 +18,7 @@ class AdvancedViewSetting(ParamSetting):
     Realistic Processing             | camera_mode == InputMode.FILE
     Box threshold
     Detection threshold            | advanced_view == True
-    Minimum hits                   | advanced_view == True
-    Maximum age                    | advanced_view == True
+    Tracker options                | advanced_view == True and used by the tracker, labeled as in the tracker registry
 
     Task: Other Tasks
     Field                          | Visible
@@ -52,19 +52,19 @@ class AdvancedViewSetting(ParamSetting):
 
             tracker_option_1 = gr.Text(label="Detection threshold", value=str(self.tracking_settings.param_options.get(self.tracking_settings.current_options[0], "-")), interactive=True, visible=False)  # Redundant as there is already a box threshold setting
             tracker_option_2 = gr.Text(
-                label="Minimum hits",
+                label=get_parameter_label(name=self.tracking_settings.current_options[1]),
                 value=str(self.tracking_settings.param_options.get(self.tracking_settings.current_options[1], "-")),
                 interactive=True,
                 visible=advanced_view and self.general_settings.task_type.casefold() == Tasks.TRACKING.name.casefold() is not None and not self.tracking_settings.current_options[1] == ""
             )
             tracker_option_3 = gr.Text(
-                label="Maximum age",
+                label=get_parameter_label(name=self.tracking_settings.current_options[2]),
                 value=str(self.tracking_settings.param_options.get(self.tracking_settings.current_options[2], "-")),
                 interactive=True,
                 visible=advanced_view and self.general_settings.task_type.casefold() == Tasks.TRACKING.name.casefold() is not None and not self.tracking_settings.current_options[2] == ""
             )
             tracker_option_4 = gr.Text(
-                label="_", value=str(self.tracking_settings.param_options.get(self.tracking_settings.current_options[3], "-")), interactive=True, visible=advanced_view and self.general_settings.task_type.casefold() == Tasks.TRACKING.name.casefold() is not None and not self.tracking_settings.current_options[3] == ""
+                label=get_parameter_label(name=self.tracking_settings.current_options[3]), value=str(self.tracking_settings.param_options.get(self.tracking_settings.current_options[3], "-")), interactive=True, visible=advanced_view and self.general_settings.task_type.casefold() == Tasks.TRACKING.name.casefold() is not None and not self.tracking_settings.current_options[3] == ""
             )
 
         return bit_box, width_input_box, height_input_box, box_threshold_box, gamma_correction_bool_box, gamma_correction_value_box, tracker_option_1, tracker_option_2, tracker_option_3, tracker_option_4, realistic_processing_box
@@ -42,6 +42,7 @@ class ArchitectureSetting(ParamSetting):
                         torch.cuda.empty_cache()
                 self.general_settings.tracked_classes = []
                 self.general_settings.classes = []
+                self.general_settings.tracked_class_ids = []
                 self.general_settings.showed_classes = []
 
             except Exception as e:
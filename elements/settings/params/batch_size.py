@@ -0,0 +1,27 @@
+import traceback
+
+from elements.locker import Locker
+from elements.settings.general_settings import GeneralSettings
+from elements.settings.params.param_settings import ParamSetting
+
+
+class BatchSizeSetting(ParamSetting):
+    """
+    Changes the amount of consecutive frames that get detected in a single forward pass and, for a camera feed, the latency per batch the batch size adapts to.
+    """
+    def __init__(self, general_settings: GeneralSettings, locker: Locker):
+        super().__init__(locker)
+        self.general_settings = general_settings
+
+    def update(self, batch_size: int, latency_target_ms: float = 0.0) -> None:
+        with self.locker.lock:
+            self.logger.info(f"Changing batch size from {str(self.general_settings.batch_size)} to {str(batch_size)} with a latency target of {str(latency_target_ms)} ms")
+            try:
+                assert int(batch_size) >= 1
+                assert float(latency_target_ms) >= 0
+                self.general_settings.batch_size = int(batch_size)
+                self.general_settings.batch_latency_ms = float(latency_target_ms)
+            except Exception as e:
+                self.logger.error(traceback.format_exc())
+                self.logger.exception(e)
+                self.logger.info(f"Sticking with a batch size of {self.general_settings.batch_size}")
@@ -0,0 +1,27 @@
+import traceback
+
+from elements.locker import Locker
+from elements.settings.general_settings import GeneralSettings
+from elements.settings.params.param_settings import ParamSetting
+
+
+class ChunkedProcessingSetting(ParamSetting):
+    """
+    Changes the amount of worker processes a single video file gets split over and the amount of frames neighbouring chunks overlap.
+    """
+    def __init__(self, general_settings: GeneralSettings, locker: Locker):
+        super().__init__(locker)
+        self.general_settings = general_settings
+
+    def update(self, workers: int, overlap_frames: int) -> None:
+        with self.locker.lock:
+            self.logger.info(f"Changing chunked processing from {str(self.general_settings.workers)} workers with {str(self.general_settings.chunk_overlap_frames)} overlap frames to {workers} workers with {overlap_frames} overlap frames")
+            try:
+                assert int(workers) > 0
+                assert int(overlap_frames) >= 0
+                self.general_settings.workers = int(workers)
+                self.general_settings.chunk_overlap_frames = int(overlap_frames)
+            except Exception as e:
+                self.logger.error(traceback.format_exc())
+                self.logger.exception(e)
+                self.logger.info(f"Sticking with {self.general_settings.workers} workers and {self.general_settings.chunk_overlap_frames} overlap frames")
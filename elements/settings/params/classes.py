@@ -1,6 +1,7 @@
 from elements.locker import Locker
 from elements.settings.general_settings import GeneralSettings
 from elements.settings.params.param_settings import ParamSetting
+from elements.utils import get_class_indices
 
 
 class ClassesSetting(ParamSetting):
@@ -15,3 +16,4 @@ class ClassesSetting(ParamSetting):
         with self.locker.lock:
             self.logger.info(f"Changed tracked classes value from {str(self.general_settings.tracked_classes)} to {str(classes)}")
             self.general_settings.tracked_classes = classes
+            self.general_settings.tracked_class_ids = get_class_indices(classes=self.general_settings.classes, selection=classes)
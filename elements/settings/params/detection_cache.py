@@ -0,0 +1,17 @@
+from elements.locker import Locker
+from elements.settings.general_settings import GeneralSettings
+from elements.settings.params.param_settings import ParamSetting
+
+
+class DetectionCacheSetting(ParamSetting):
+    """
+    Change whether the detections of video files get cached on disk to be replayed in later runs.
+    """
+    def __init__(self, general_settings: GeneralSettings, locker: Locker):
+        super().__init__(locker)
+        self.general_settings = general_settings
+
+    def update(self, detection_cache: bool) -> None:
+        with self.locker.lock:
+            self.logger.info(f"Changed detection cache from {str(self.general_settings.detection_cache)} to {str(detection_cache)}")
+            self.general_settings.detection_cache = detection_cache
@@ -0,0 +1,27 @@
+import traceback
+
+from elements.locker import Locker
+from elements.settings.general_settings import GeneralSettings
+from elements.settings.params.param_settings import ParamSetting
+
+
+class DetectionIntervalSetting(ParamSetting):
+    """
+    Changes on which frames of a video file the detector runs, every x-th frame or at a target amount of detections per second of video. The tracks get extrapolated in between.
+    """
+    def __init__(self, general_settings: GeneralSettings, locker: Locker):
+        super().__init__(locker)
+        self.general_settings = general_settings
+
+    def update(self, interval: int, fps: float = 0.0) -> None:
+        with self.locker.lock:
+            self.logger.info(f"Changing detection interval from {str(self.general_settings.detection_interval)} to {str(interval)} with a detection rate of {str(fps)} fps")
+            try:
+                assert int(interval) >= 1
+                assert float(fps) >= 0
+                self.general_settings.detection_interval = int(interval)
+                self.general_settings.detection_fps = float(fps)
+            except Exception as e:
+                self.logger.error(traceback.format_exc())
+                self.logger.exception(e)
+                self.logger.info(f"Sticking with a detection interval of {self.general_settings.detection_interval}")
@@ -0,0 +1,17 @@
+from elements.locker import Locker
+from elements.settings.general_settings import GeneralSettings
+from elements.settings.params.param_settings import ParamSetting
+
+
+class ExportTracksSetting(ParamSetting):
+    """
+    Change whether the active tracks of every frame get exported to chunked NPZ files.
+    """
+    def __init__(self, general_settings: GeneralSettings, locker: Locker):
+        super().__init__(locker)
+        self.general_settings = general_settings
+
+    def update(self, export_tracks: bool) -> None:
+        with self.locker.lock:
+            self.logger.info(f"Changed export tracks from {str(self.general_settings.export_tracks)} to {str(export_tracks)}")
+            self.general_settings.export_tracks = export_tracks
@@ -0,0 +1,30 @@
+import traceback
+
+from elements.locker import Locker
+from elements.predictors.utils.async_image_writer import IMAGE_FORMATS
+from elements.settings.general_settings import GeneralSettings
+from elements.settings.params.param_settings import ParamSetting
+
+
+class ImageWriterSetting(ParamSetting):
+    """
+    Changes the format and compression of saved images and the amount of images that can wait to be saved.
+    """
+    def __init__(self, general_settings: GeneralSettings, locker: Locker):
+        super().__init__(locker)
+        self.general_settings = general_settings
+
+    def update(self, image_format: str, compression: int = -1, queue_size: int = 16) -> None:
+        with self.locker.lock:
+            self.logger.info(f"Changing saved images from {self.general_settings.image_format} with compression {str(self.general_settings.image_compression)} to {str(image_format)} with compression {str(compression)}, {str(queue_size)} images can wait to be saved")
+            try:
+                assert str(image_format).lower() in IMAGE_FORMATS
+                assert -1 <= int(compression) <= 100
+                assert int(queue_size) >= 1
+                self.general_settings.image_format = str(image_format).lower()
+                self.general_settings.image_compression = int(compression)
+                self.general_settings.image_queue_size = int(queue_size)
+            except Exception as e:
+                self.logger.error(traceback.format_exc())
+                self.logger.exception(e)
+                self.logger.info(f"Sticking with saving images as {self.general_settings.image_format} with compression {self.general_settings.image_compression}")
@@ -0,0 +1,25 @@
+import traceback
+
+from elements.locker import Locker
+from elements.settings.general_settings import GeneralSettings
+from elements.settings.params.param_settings import ParamSetting
+
+
+class MotionGateSetting(ParamSetting):
+    """
+    Changes the sensitivity of the motion gate that skips the detector on camera frames without motion, 0 disables the gate.
+    """
+    def __init__(self, general_settings: GeneralSettings, locker: Locker):
+        super().__init__(locker)
+        self.general_settings = general_settings
+
+    def update(self, sensitivity: float) -> None:
+        with self.locker.lock:
+            self.logger.info(f"Changing motion sensitivity from {str(self.general_settings.motion_sensitivity)} to {str(sensitivity)}")
+            try:
+                assert 0 <= float(sensitivity) <= 1
+                self.general_settings.motion_sensitivity = float(sensitivity)
+            except Exception as e:
+                self.logger.error(traceback.format_exc())
+                self.logger.exception(e)
+                self.logger.info(f"Sticking with a motion sensitivity of {self.general_settings.motion_sensitivity}")
@@ -0,0 +1,25 @@
+import traceback
+
+from elements.locker import Locker
+from elements.settings.general_settings import GeneralSettings
+from elements.settings.params.param_settings import ParamSetting
+
+
+class PipelineQueueSizeSetting(ParamSetting):
+    """
+    Changes the size of the queues between the stages of the frame pipeline, 0 processes the frames one after another without a pipeline.
+    """
+    def __init__(self, general_settings: GeneralSettings, locker: Locker):
+        super().__init__(locker)
+        self.general_settings = general_settings
+
+    def update(self, pipeline_queue_size: int) -> None:
+        with self.locker.lock:
+            self.logger.info(f"Changing pipeline queue size from {str(self.general_settings.pipeline_queue_size)} to {str(pipeline_queue_size)}")
+            try:
+                assert int(pipeline_queue_size) >= 0
+                self.general_settings.pipeline_queue_size = int(pipeline_queue_size)
+            except Exception as e:
+                self.logger.error(traceback.format_exc())
+                self.logger.exception(e)
+                self.logger.info(f"Sticking with a pipeline queue size of {self.general_settings.pipeline_queue_size}")
@@ -0,0 +1,25 @@
+import traceback
+
+from elements.locker import Locker
+from elements.settings.general_settings import GeneralSettings
+from elements.settings.params.param_settings import ParamSetting
+
+
+class PrefetchFramesSetting(ParamSetting):
+    """
+    Changes the amount of video frames that get decoded ahead on a background thread, 0 disables prefetching.
+    """
+    def __init__(self, general_settings: GeneralSettings, locker: Locker):
+        super().__init__(locker)
+        self.general_settings = general_settings
+
+    def update(self, prefetch_frames: int) -> None:
+        with self.locker.lock:
+            self.logger.info(f"Changing prefetch frames from {str(self.general_settings.prefetch_frames)} to {str(prefetch_frames)}")
+            try:
+                assert int(prefetch_frames) >= 0
+                self.general_settings.prefetch_frames = int(prefetch_frames)
+            except Exception as e:
+                self.logger.error(traceback.format_exc())
+                self.logger.exception(e)
+                self.logger.info(f"Sticking with {self.general_settings.prefetch_frames} prefetch frames")
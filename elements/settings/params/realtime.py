@@ -0,0 +1,17 @@
+from elements.locker import Locker
+from elements.settings.general_settings import GeneralSettings
+from elements.settings.params.param_settings import ParamSetting
+
+
+class RealtimeSetting(ParamSetting):
+    """
+    Change whether video files get processed like a live camera feed, dropping the frames that can not be processed in time.
+    """
+    def __init__(self, general_settings: GeneralSettings, locker: Locker):
+        super().__init__(locker)
+        self.general_settings = general_settings
+
+    def update(self, realtime: bool) -> None:
+        with self.locker.lock:
+            self.logger.info(f"Changed realtime from {str(self.general_settings.realtime)} to {str(realtime)}")
+            self.general_settings.realtime = realtime
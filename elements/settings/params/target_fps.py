@@ -0,0 +1,25 @@
+import traceback
+
+from elements.locker import Locker
+from elements.settings.general_settings import GeneralSettings
+from elements.settings.params.param_settings import ParamSetting
+
+
+class TargetFpsSetting(ParamSetting):
+    """
+    Changes the fps the detection size of a camera feed adapts to, 0 always detects at the input size.
+    """
+    def __init__(self, general_settings: GeneralSettings, locker: Locker):
+        super().__init__(locker)
+        self.general_settings = general_settings
+
+    def update(self, target_fps: float) -> None:
+        with self.locker.lock:
+            self.logger.info(f"Changing target fps from {str(self.general_settings.target_fps)} to {str(target_fps)}")
+            try:
+                assert float(target_fps) >= 0
+                self.general_settings.target_fps = float(target_fps)
+            except Exception as e:
+                self.logger.error(traceback.format_exc())
+                self.logger.exception(e)
+                self.logger.info(f"Sticking with a target fps of {self.general_settings.target_fps}")
@@ -1,6 +1,7 @@
 from elements.locker import Locker
 from elements.settings.general_settings import GeneralSettings
 from elements.settings.params.param_settings import ParamSetting
+from elements.utils import get_class_indices
 
 
 class TrackedClassesSetting(ParamSetting):
@@ -14,3 +15,4 @@ class TrackedClassesSetting(ParamSetting):
     def update(self, classes: list) -> None:
         with self.locker.lock:
             self.general_settings.tracked_classes = classes
+            self.general_settings.tracked_class_ids = get_class_indices(classes=self.general_settings.classes, selection=classes)
@@ -4,11 +4,15 @@ from elements.locker import Locker
 from elements.settings.general_settings import GeneralSettings
 from elements.settings.params.param_settings import ParamSetting
 from elements.settings.tracking_settings import TrackingSettings
+from elements.trackers.tracker_registry import TRACKERS, get_parameter_label, get_tracker_entry
 
 
 class TrackerSetting(ParamSetting):
     """
     Select the tracker to use to track objects throughout the video.
+
+    The parameters of the tracker, as described in the tracker registry, get reset to their defaults and shown in the tracker option fields, the first field stays hidden.
+
     """
     def __init__(self, general_settings: GeneralSettings, tracking_settings: TrackingSettings, locker: Locker):
         super().__init__(locker)
@@ -17,22 +21,37 @@ class TrackerSetting(ParamSetting):
 
     def update(self, tracker: str):
         with self.locker.lock:
-            self.logger.info(f"Changed tracker from {str(self.tracking_settings.tracker)} to {str(tracker)}")
-            self.tracking_settings.tracker = tracker
+            entry = get_tracker_entry(tracker=tracker)
+            if entry is None:
+                self.logger.error(f"Unknown tracker {tracker}, choose one of {[entry.name for entry in TRACKERS.values()]}")
+                self.logger.info(f"Sticking with {str(self.tracking_settings.tracker)}")
+                return self.get_option_fields()
+
+            self.logger.info(f"Changed tracker from {str(self.tracking_settings.tracker)} to {entry.name}")
+            self.tracking_settings.tracker = entry.name
+            self.tracking_settings.tracker_generator = entry.create
 
-            self.tracking_settings.param_options["MINIMUM_HITS"] = "3"
-            self.tracking_settings.param_options["MAXIMUM_AGE"] = "30"
-            self.tracking_settings.current_options = {0: "", 1: "MINIMUM_HITS", 2: "MAXIMUM_AGE", 3: ""}
+            for parameter in entry.parameters:
+                self.tracking_settings.param_options[parameter.name] = parameter.default
+            names = [parameter.name for parameter in entry.parameters[:3]]
+            self.tracking_settings.current_options = {0: "", **{i + 1: names[i] if i < len(names) else "" for i in range(3)}}
 
             self.tracking_settings.reset = True
 
-            # Only DeepOCSort is implemented so no need for conditionals
-            return [
-                gr.Text(label="_", value='-', interactive=True, visible=False),
-                gr.Text(label="Minimum hits", value=str(self.tracking_settings.param_options["MINIMUM_HITS"]), interactive=True, visible=self.general_settings.advanced_view),
-                gr.Text(label="Maximum age", value=str(self.tracking_settings.param_options["MAXIMUM_AGE"]), interactive=True, visible=self.general_settings.advanced_view),
-                gr.Text(label="_", value='-', interactive=True, visible=False),
-            ]
+            return self.get_option_fields()
+
+    def get_option_fields(self) -> list[gr.Text]:
+        """
+        Returns the four tracker option fields for the parameters of the current tracker, unused fields are hidden.
+        """
+        fields = []
+        for i in range(4):
+            name = self.tracking_settings.current_options.get(i, "")
+            if name:
+                fields.append(gr.Text(label=get_parameter_label(name=name), value=str(self.tracking_settings.param_options[name]), interactive=True, visible=self.general_settings.advanced_view))
+            else:
+                fields.append(gr.Text(label="_", value='-', interactive=True, visible=False))
+        return fields
 
 
 class TrackerOption1Settings(ParamSetting):
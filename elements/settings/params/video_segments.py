@@ -0,0 +1,27 @@
+import traceback
+
+from elements.locker import Locker
+from elements.settings.general_settings import GeneralSettings
+from elements.settings.params.param_settings import ParamSetting
+
+
+class VideoSegmentsSetting(ParamSetting):
+    """
+    Changes after how many minutes or megabytes the result video rotates to a new segment, 0 disables the limit.
+    """
+    def __init__(self, general_settings: GeneralSettings, locker: Locker):
+        super().__init__(locker)
+        self.general_settings = general_settings
+
+    def update(self, minutes: float, max_mb: float) -> None:
+        with self.locker.lock:
+            self.logger.info(f"Changing video segments from {str(self.general_settings.segment_minutes)} minutes and {str(self.general_settings.segment_max_mb)} MB to {str(minutes)} minutes and {str(max_mb)} MB")
+            try:
+                assert float(minutes) >= 0
+                assert float(max_mb) >= 0
+                self.general_settings.segment_minutes = float(minutes)
+                self.general_settings.segment_max_mb = float(max_mb)
+            except Exception as e:
+                self.logger.error(traceback.format_exc())
+                self.logger.exception(e)
+                self.logger.info(f"Sticking with video segments of {self.general_settings.segment_minutes} minutes and {self.general_settings.segment_max_mb} MB")
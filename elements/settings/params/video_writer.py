@@ -0,0 +1,27 @@
+import traceback
+
+from elements.enums import OverflowPolicy
+from elements.locker import Locker
+from elements.settings.general_settings import GeneralSettings
+from elements.settings.params.param_settings import ParamSetting
+
+
+class VideoWriterSetting(ParamSetting):
+    """
+    Changes the size of the queue of frames waiting to be encoded into the result video, and what happens to new frames when it is full.
+    """
+    def __init__(self, general_settings: GeneralSettings, locker: Locker):
+        super().__init__(locker)
+        self.general_settings = general_settings
+
+    def update(self, queue_size: int, overflow_policy: str) -> None:
+        with self.locker.lock:
+            self.logger.info(f"Changing video writer queue from {str(self.general_settings.video_queue_size)} frames with policy {self.general_settings.video_overflow_policy.name} to {str(queue_size)} frames with policy {str(overflow_policy)}")
+            try:
+                assert int(queue_size) >= 1
+                self.general_settings.video_overflow_policy = OverflowPolicy[str(overflow_policy).upper()]
+                self.general_settings.video_queue_size = int(queue_size)
+            except Exception as e:
+                self.logger.error(traceback.format_exc())
+                self.logger.exception(e)
+                self.logger.info(f"Sticking with a video writer queue of {self.general_settings.video_queue_size} frames with policy {self.general_settings.video_overflow_policy.name}")
@@ -4,11 +4,13 @@ import gradio as gr
 
 from config.config_parser import ConfigParser
 from elements.enums import Tasks, InputMode
+from elements.load_model.load_model_onnx import LoadModelOnnx
 from elements.load_model.load_model_yolo import LoadModelYolo
 from elements.locker import Locker
 from elements.settings.general_settings import GeneralSettings
 from elements.settings.model_settings import ModelSettings
 from elements.settings.params.param_settings import ParamSetting
+from elements.utils import get_class_indices
 
 
 class WeightsSetting(ParamSetting):
@@ -33,10 +35,14 @@ class WeightsSetting(ParamSetting):
 
             self.logger.info(f"Changed weights from {str(self.model_settings.weights_path)} to {str(weights_path)}")
             if weights_path is not self.model_settings.weights_path and weights_path:
-                if self.config_parser.current_config.load_model_type in ["yolo"]:
+                if self.config_parser.current_config.load_model_type in ["yolo", "onnx"]:
                     self.general_settings.classes = self.config_parser.current_config.classes
                     self.general_settings.tracked_classes = self.config_parser.current_config.tracked_classes
                     self.general_settings.showed_classes = self.config_parser.current_config.showed_classes
+                    self.general_settings.tracked_class_ids = get_class_indices(classes=self.general_settings.classes, selection=self.general_settings.tracked_classes)
+                if self.config_parser.current_config.load_model_type in ["yolo"]:
                     self.model_settings.model = LoadModelYolo(weights_file=weights_path, model_name=self.model_settings.architecture, version=self.config_parser.current_config.version, device=self.model_settings.device).load_model()
+                elif self.config_parser.current_config.load_model_type in ["onnx"]:
+                    self.model_settings.model = LoadModelOnnx(weights_file=weights_path, model_name=self.model_settings.architecture, device=self.model_settings.device, intra_op_threads=self.config_parser.current_config.intra_op_threads, inter_op_threads=self.config_parser.current_config.inter_op_threads).load_model()
             self.model_settings.weights_path = weights_path
         return gr.CheckboxGroup(label="Which objects should be tracked", choices=self.config_parser.current_config.showed_classes, value=self.general_settings.tracked_classes, interactive=True)
@@ -1,26 +1,39 @@
 from elements.model import ModelConfig
 from elements.settings.params.advanced_view import AdvancedViewSetting
 from elements.settings.params.architecture import ArchitectureSetting
+from elements.settings.params.batch_size import BatchSizeSetting
 from elements.settings.params.box_threshold import BoxThresholdSetting
 from elements.settings.params.bpp import BPPSetting
 from elements.settings.params.camera import CameraIndexSetting
 from elements.settings.params.camera_mode import CameraModeSetting
+from elements.settings.params.chunked_processing import ChunkedProcessingSetting
 from elements.settings.params.classes import ClassesSetting
+from elements.settings.params.detection_cache import DetectionCacheSetting
+from elements.settings.params.detection_interval import DetectionIntervalSetting
 from elements.settings.params.device import DeviceSetting
+from elements.settings.params.export_tracks import ExportTracksSetting
 from elements.settings.params.gamma_correction import GammaCorrectionBoolSetting, GammaCorrectionValueSetting
+from elements.settings.params.image_writer import ImageWriterSetting
 from elements.settings.params.input_height import InputHeightSetting
 from elements.settings.params.input_width import InputWidthSetting
+from elements.settings.params.motion_gate import MotionGateSetting
 from elements.settings.params.normalize_type import NormalizeTypeSetting
 from elements.settings.params.output_folder import OutputFolderSetting
+from elements.settings.params.pipeline_queue_size import PipelineQueueSizeSetting
+from elements.settings.params.prefetch_frames import PrefetchFramesSetting
 from elements.settings.params.realistic_processing import RealisticProcessingSetting
+from elements.settings.params.realtime import RealtimeSetting
 from elements.settings.params.reset_stats_min import ResetStatsMinSetting
 from elements.settings.params.save_frames import SaveAllFrames
 from elements.settings.params.save_new_objects import SaveNewObjects
 from elements.settings.params.save_results import SaveResults
 from elements.settings.params.screen_dimension import ScreenDimensionSetting
+from elements.settings.params.target_fps import TargetFpsSetting
 from elements.settings.params.task_type import TaskTypeSetting
 from elements.settings.params.tracked_classes import TrackedClassesSetting
 from elements.settings.params.tracker import TrackerSetting, TrackerOption1Settings, TrackerOption2Settings, TrackerOption3Settings, TrackerOption4Settings
+from elements.settings.params.video_segments import VideoSegmentsSetting
+from elements.settings.params.video_writer import VideoWriterSetting
 from elements.settings.params.weights import WeightsSetting
 
 
@@ -43,14 +56,27 @@ class SettingsOrchestrator:
 
         self.advanced_view_setting = AdvancedViewSetting(general_settings=model_manager.general_settings, tracking_settings=model_manager.tracking_settings, locker=model_manager.locker)
         self.realistic_processing_setting = RealisticProcessingSetting(general_settings=model_manager.general_settings, locker=model_manager.locker)
+        self.realtime_setting = RealtimeSetting(general_settings=model_manager.general_settings, locker=model_manager.locker)
         self.screen_dimension_setting = ScreenDimensionSetting(general_settings=model_manager.general_settings, locker=model_manager.locker)
+        self.prefetch_frames_setting = PrefetchFramesSetting(general_settings=model_manager.general_settings, locker=model_manager.locker)
+        self.chunked_processing_setting = ChunkedProcessingSetting(general_settings=model_manager.general_settings, locker=model_manager.locker)
+        self.detection_cache_setting = DetectionCacheSetting(general_settings=model_manager.general_settings, locker=model_manager.locker)
+        self.detection_interval_setting = DetectionIntervalSetting(general_settings=model_manager.general_settings, locker=model_manager.locker)
+        self.pipeline_queue_size_setting = PipelineQueueSizeSetting(general_settings=model_manager.general_settings, locker=model_manager.locker)
+        self.batch_size_setting = BatchSizeSetting(general_settings=model_manager.general_settings, locker=model_manager.locker)
+        self.video_writer_setting = VideoWriterSetting(general_settings=model_manager.general_settings, locker=model_manager.locker)
+        self.image_writer_setting = ImageWriterSetting(general_settings=model_manager.general_settings, locker=model_manager.locker)
+        self.video_segments_setting = VideoSegmentsSetting(general_settings=model_manager.general_settings, locker=model_manager.locker)
 
         self.camera_index_setting = CameraIndexSetting(general_settings=model_manager.general_settings, locker=model_manager.locker)
         self.reset_stats_min = ResetStatsMinSetting(general_settings=model_manager.general_settings, locker=model_manager.locker)
+        self.motion_gate_setting = MotionGateSetting(general_settings=model_manager.general_settings, locker=model_manager.locker)
+        self.target_fps_setting = TargetFpsSetting(general_settings=model_manager.general_settings, locker=model_manager.locker)
 
         self.save_all_frames_setting = SaveAllFrames(general_settings=model_manager.general_settings, locker=model_manager.locker)
         self.save_results_setting = SaveResults(general_settings=model_manager.general_settings, locker=model_manager.locker)
         self.save_new_objects_setting = SaveNewObjects(general_settings=model_manager.general_settings, locker=model_manager.locker)
+        self.export_tracks_setting = ExportTracksSetting(general_settings=model_manager.general_settings, locker=model_manager.locker)
 
         self.box_threshold_setting = BoxThresholdSetting(general_settings=model_manager.general_settings, locker=model_manager.locker)
 
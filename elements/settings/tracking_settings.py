@@ -8,7 +8,8 @@ class TrackingSettings:
     """
     def __init__(self) -> None:
         self.tracker = None
-        self.reset: bool = False
+        self.reset: bool = False  # The tracker settings changed
+        self.reset_stats: bool = False  # The counts should be zeroed
         self.tracker_generator = None
         self.param_options: dict = {"HIGH_TRACKING_THRESHOLD": "", "LOW_TRACKING_THRESHOLD": "", "MATCHING_THRESHOLD": "", "TRACKING_BUFFER": "", "MAXIMUM_DISTANCE": "", "MAXIMUM_IOU_DISTANCE": "", "MAXIMUM_AGE": "", "MAXIMUM_HITS": ""}
 
@@ -0,0 +1,221 @@
+import argparse
+import json
+import time
+from collections import deque
+from types import SimpleNamespace
+
+import numpy as np
+import torch
+
+from elements.settings.general_settings import GeneralSettings
+from elements.trackers.general import GeneralizedProcessor
+from elements.trackers.tracker_registry import TRACKERS, get_tracker_entry
+from elements.utils import Logger
+
+logger = Logger.setup_logger()
+
+
+def synthetic_detections(objects: int, frames: int, width: int, height: int, classes: int = 2, seed: int = 0) -> list[np.ndarray]:
+    """
+    Returns the (N, 6) detections per frame of objects moving in straight lines through an image of width by height, bouncing off the borders.
+    """
+    rng = np.random.default_rng(seed)
+    sizes = rng.uniform(30, 120, size=(objects, 2))
+    positions = rng.uniform(0, 1, size=(objects, 2)) * (np.array([width, height]) - sizes)
+    velocities = rng.uniform(-8, 8, size=(objects, 2))
+    class_ids = np.arange(objects) % classes
+
+    detections = []
+    for _ in range(frames):
+        positions += velocities
+        bounced = (positions < 0) | (positions > np.array([width, height]) - sizes)
+        velocities[bounced] *= -1
+        positions = np.clip(positions, 0, np.array([width, height]) - sizes)
+
+        boxes = np.empty((objects, 6), dtype=np.float32)
+        boxes[:, :2] = positions
+        boxes[:, 2:4] = positions + sizes
+        boxes[:, 4] = rng.uniform(0.65, 0.95, size=objects)
+        boxes[:, 5] = class_ids
+        detections.append(boxes)
+    return detections
+
+
+def benchmark_tracker(tracker: str, detections: list[np.ndarray], image: np.ndarray, classes: list[str], device: str = "cpu", warmup_frames: int = 10) -> dict:
+    """
+    Measures the time a GeneralizedProcessor with the given tracker spends per frame on updating the tracks with the detections and reading the active tracks.
+    """
+    entry = get_tracker_entry(tracker=tracker)
+    general_settings = GeneralSettings()
+    general_settings.classes = classes
+    general_settings.tracked_classes = classes
+
+    tracker_model = entry.create(param_options={}, box_threshold=0.5, device=device)
+    min_hits = int(next((parameter.default for parameter in entry.parameters if parameter.name == "MINIMUM_HITS"), 0))
+    tracker_processor = GeneralizedProcessor(general_settings=general_settings, min_hits=min_hits, tracker=tracker_model)
+
+    times = []
+    active_tracks = 0
+    with torch.no_grad():
+        for i, boxes in enumerate(detections):
+            start = time.perf_counter()
+            active_boxes = tracker_processor.update_boxes(boxes=boxes, image=image)
+            boxes_from_active_tracks = tracker_processor.get_boxes_from_active_tracks(active_tracks=active_boxes)
+            tracker_processor.update_tracks(active_tracks=boxes_from_active_tracks, verbose=False)
+            if i >= warmup_frames:
+                times.append(time.perf_counter() - start)
+                active_tracks += len(boxes_from_active_tracks)
+
+    times_ms = np.asarray(times) * 1000
+    return {
+        "tracker": entry.name,
+        "reid": entry.reid_weights is not None,
+        "frames": len(times),
+        "mean_ms": round(float(times_ms.mean()), 3),
+        "p95_ms": round(float(np.percentile(times_ms, 95)), 3),
+        "max_ms": round(float(times_ms.max()), 3),
+        "fps": round(1000 / float(times_ms.mean()), 1),
+        "mean_active_tracks": round(active_tracks / len(times), 1),
+    }
+
+
+class ReplayTracker:
+    """
+    Stands in for a BoxMot tracker with a fixed set of tracks, returning all of them on every update, so only the work of the TrackerProcessor around the tracker gets measured.
+    """
+    def __init__(self, tracks: int, classes: int = 2, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        self.per_class_active_tracks: dict[int, list] = {class_id: [] for class_id in range(classes)}
+        for track_id in range(tracks):
+            self.per_class_active_tracks[track_id % classes].append(SimpleNamespace(id=track_id, age=int(rng.integers(0, 10))))
+
+        self.output = np.zeros((tracks, 8), dtype=np.float32)
+        self.output[:, :4] = [10, 10, 50, 50]
+        self.output[:, 4] = np.arange(tracks)
+        self.output[:, 5] = 0.9
+        self.output[:, 6] = np.arange(tracks) % classes
+
+    def update(self, boxes: np.ndarray, image: np.ndarray) -> np.ndarray:
+        return self.output
+
+
+def benchmark_update_boxes(track_amounts: tuple[int, ...] = (10, 100, 1000), frames: int = 200, min_hits: int = 3) -> list[dict]:
+    """
+    Measures the time TrackerProcessor.update_boxes spends per frame on confirming the tracks the tracker returns, for amounts of tracks that are all returned every frame.
+    """
+    general_settings = GeneralSettings()
+    general_settings.classes = ["helmet", "cyclist"]
+    general_settings.tracked_classes = general_settings.classes
+
+    results = []
+    for tracks in track_amounts:
+        tracker_processor = GeneralizedProcessor(general_settings=general_settings, min_hits=min_hits, tracker=ReplayTracker(tracks=tracks))
+        boxes = np.zeros((0, 6), dtype=np.float32)
+        start = time.perf_counter()
+        for _ in range(frames):
+            active_boxes = tracker_processor.update_boxes(boxes=boxes, image=None)
+        elapsed = (time.perf_counter() - start) / frames
+        results.append({"tracks": tracks, "confirmed": len(active_boxes), "mean_ms": round(elapsed * 1000, 4)})
+    return results
+
+
+class SoakTracker:
+    """
+    Stands in for a BoxMot tracker on a camera that runs for a long time: every frame new_per_frame tracks appear, get returned for lifetime frames and are held for max_age
+    more frames before the tracker drops them, with ids that never get reused.
+    """
+    def __init__(self, new_per_frame: int, lifetime: int, max_age: int, classes: int = 2):
+        self.new_per_frame = new_per_frame
+        self.lifetime = lifetime
+        self.max_age = max_age
+        self.classes = classes
+        self.frame = 0
+        self.next_id = 0
+        self.returned: deque = deque(maxlen=new_per_frame * lifetime)
+        self.per_class_active_tracks: dict[int, deque] = {class_id: deque() for class_id in range(classes)}  # In the order the tracks appeared
+
+    def update(self, boxes: np.ndarray, image: np.ndarray) -> np.ndarray:
+        for held in self.per_class_active_tracks.values():
+            while held and held[0].first_frame <= self.frame - self.lifetime - self.max_age:
+                held.popleft()
+        for _ in range(self.new_per_frame):
+            track = SimpleNamespace(id=self.next_id, age=0, first_frame=self.frame)
+            self.per_class_active_tracks[track.id % self.classes].append(track)
+            self.returned.append(track)
+            self.next_id += 1
+
+        returned = list(self.returned)
+        for track in returned:
+            track.age += 1
+        self.frame += 1
+
+        output = np.zeros((len(returned), 8), dtype=np.float32)
+        output[:, :4] = [10, 10, 50, 50]
+        output[:, 4] = [track.id for track in returned]
+        output[:, 5] = 0.9
+        output[:, 6] = [track.id % self.classes for track in returned]
+        return output
+
+
+def soak_track_store(tracks: int = 1_000_000, new_per_frame: int = 10, lifetime: int = 8, max_age: int = 30, min_hits: int = 3) -> dict:
+    """
+    Runs a GeneralizedProcessor for as many frames as it takes the SoakTracker to create the given amount of tracks, and checks every track got counted exactly once while the
+    track store stays bounded.
+    """
+    general_settings = GeneralSettings()
+    general_settings.classes = ["helmet", "cyclist"]
+    general_settings.tracked_classes = general_settings.classes
+    tracker_processor = GeneralizedProcessor(general_settings=general_settings, min_hits=min_hits, tracker=SoakTracker(new_per_frame=new_per_frame, lifetime=lifetime, max_age=max_age))
+
+    boxes = np.zeros((0, 6), dtype=np.float32)
+    frames = tracks // new_per_frame + min_hits  # The tracks appearing in the last min_hits frames do not get confirmed
+    start = time.perf_counter()
+    for i in range(frames):
+        active_boxes = tracker_processor.update_boxes(boxes=boxes, image=None)
+        tracker_processor.update_tracks(active_tracks=tracker_processor.get_boxes_from_active_tracks(active_tracks=active_boxes), verbose=False)
+        if i % 10000 == 0:
+            logger.info(f"Frame {i}/{frames}: {json.dumps(tracker_processor.get_metrics())}")
+    elapsed = time.perf_counter() - start
+
+    counted = sum(tracker_processor.counts.values())
+    return {"frames": frames, "counted": counted, "expected": tracks, "identical": counted == tracks, "seconds": round(elapsed, 1), **tracker_processor.get_metrics()}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compares the per frame cost of the trackers in the tracker registry on synthetic detections. Run from the root of the repository.")
+    parser.add_argument('--trackers', type=str, nargs="+", default=[entry.name for entry in TRACKERS.values()], help="Trackers to compare, standard all of them")
+    parser.add_argument('--objects', type=int, default=20, help="Amount of objects moving through the frame")
+    parser.add_argument('--frames', type=int, default=300, help="Amount of frames to track")
+    parser.add_argument('--width', type=int, default=1280, help="Width of the frames, as the input width of the model")
+    parser.add_argument('--height', type=int, default=736, help="Height of the frames, as the input height of the model")
+    parser.add_argument('--device', type=str, default="cpu", help="Device to run the appearance models on")
+    parser.add_argument('--output', type=str, default=None, help="JSON file to save the results to")
+    parser.add_argument('--update-boxes', action="store_true", help="Only measure the track confirmation of TrackerProcessor.update_boxes with 10, 100 and 1000 tracks")
+    parser.add_argument('--soak', type=int, default=None, help="Only run the soak test of the track store with this amount of tracks, like 1000000")
+    args = parser.parse_args()
+
+    if args.soak:
+        logger.info(f"{json.dumps(soak_track_store(tracks=args.soak))}")
+        raise SystemExit(0)
+
+    if args.update_boxes:
+        for result in benchmark_update_boxes():
+            logger.info(f"{json.dumps(result)}")
+        raise SystemExit(0)
+
+    torch.set_grad_enabled(False)
+    frames = synthetic_detections(objects=args.objects, frames=args.frames, width=args.width, height=args.height)
+    frame = np.random.default_rng(0).integers(0, 256, size=(args.height, args.width, 3), dtype=np.uint8)  # The appearance models get crops of it, the contents do not matter for the speed
+
+    results = []
+    for tracker_name in args.trackers:
+        if get_tracker_entry(tracker=tracker_name) is None:
+            logger.error(f"Unknown tracker {tracker_name}, skipping it")
+            continue
+        results.append(benchmark_tracker(tracker=tracker_name, detections=frames, image=frame, classes=["helmet", "cyclist"], device=args.device))
+        logger.info(f"{json.dumps(results[-1])}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+        logger.info(f"Saved the results to {args.output}")
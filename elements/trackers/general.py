@@ -1,18 +1,21 @@
+import numpy as np
+
 from elements.trackers.tracker_processor import TrackerProcessor
 
 
 class GeneralizedProcessor(TrackerProcessor):
     def update_tracks(self, active_tracks: list, verbose: bool = True) -> bool:
         """
-        Uses the custom Track objects to keep a list of which instances have been counted already.
+        Uses the custom Track objects to keep a store of which instances have been counted already, and when they were last seen.
         """
         save_image: bool = False
         for track in active_tracks:
-            if track.track_id not in self.tracks.keys():
+            if track.track_id not in self.tracks:
                 if verbose:
                     self.logger.info(f"{self.general_settings.classes[int(track.class_id)]} added")
-                self.tracks[track.track_id] = {"passed": True}
+                self.tracks.add(track_id=int(track.track_id), frame=self.frame_count)
                 self.counts[self.general_settings.classes[int(track.class_id)]] += 1
                 save_image = True
                 continue
+        self.tracks.touch(track_ids=np.fromiter((int(track.track_id) for track in active_tracks), dtype=np.int64, count=len(active_tracks)), frame=self.frame_count)
         return save_image
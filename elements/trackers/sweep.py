@@ -0,0 +1,223 @@
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, asdict
+from typing import Optional
+
+import cv2
+import torch
+
+from config.config_parser import ConfigParser
+from elements.predictors.utils.box_processor import BoxProcessor
+from elements.predictors.utils.detection_cache import DETECTION_CACHE_FOLDER, DetectionCache, get_cache_key
+from elements.predictors.utils.video_reader import VideoReader
+from elements.settings.general_settings import GeneralSettings
+from elements.settings.model_settings import ModelSettings
+from elements.settings.tracking_settings import TrackingSettings
+from elements.trackers.tracker_factory import TrackerFactory
+from elements.utils import Logger, get_class_indices
+
+logger = Logger.setup_logger()
+
+
+@dataclass
+class SweepJob:
+    """
+    A single configuration of the tracker to replay the cached detections of a video through.
+    """
+    index: int
+    input_path: str
+    cache_key: dict
+    tracker: str
+    min_hits: int
+    max_age: int
+    box_threshold: float
+    classes: list[str]
+    tracked_classes: list[str]
+    input_width: int
+    input_height: int
+    start_frame: int
+    end_frame: int
+    device: str
+    threads: int
+    detection_interval: int = 1
+
+
+@dataclass
+class SweepResult:
+    """
+    The counts a configuration of a SweepJob produced, and their errors if ground truth counts are known. For a detection interval above 1, count_drift holds the difference per
+    class with the counts of the same configuration detecting every frame, if that is part of the sweep.
+    """
+    index: int
+    min_hits: int
+    max_age: int
+    box_threshold: float
+    detection_interval: int = 1
+    counts: dict[str, int] = field(default_factory=dict)
+    errors: Optional[dict[str, int]] = None
+    absolute_error: Optional[int] = None
+    count_drift: Optional[dict[str, int]] = None
+    processed_frames: int = 0
+    elapsed: float = 0.0
+
+
+def run_configuration(job: SweepJob) -> SweepResult:
+    """
+    Replays the cached detections of the video through a fresh GeneralizedProcessor created with the tracker settings of the job, in its own process.
+
+    The frames still get decoded, the appearance model of the tracker needs them. With a detection interval, only every x-th frame gets its detections replayed, the tracks get
+    extrapolated in between like when processing the video with --detection-interval.
+
+    """
+    torch.set_num_threads(job.threads)
+    cv2.setNumThreads(job.threads)
+
+    general_settings = GeneralSettings()
+    general_settings.classes = job.classes
+    general_settings.tracked_classes = job.tracked_classes
+    general_settings.tracked_class_ids = get_class_indices(classes=job.classes, selection=job.tracked_classes)
+    general_settings.box_threshold = job.box_threshold
+    general_settings.input_width = job.input_width
+    general_settings.input_height = job.input_height
+
+    tracking_settings = TrackingSettings()
+    tracking_settings.tracker = job.tracker
+    tracking_settings.tracker_generator = TrackerFactory.get_tracker_generator(tracker=job.tracker)
+    tracking_settings.param_options["MINIMUM_HITS"] = str(job.min_hits)
+    tracking_settings.param_options["MAXIMUM_AGE"] = str(job.max_age)
+
+    model_settings = ModelSettings()
+    model_settings.device = job.device
+
+    _, tracker_processor = TrackerFactory.create(general_settings=general_settings, tracking_settings=tracking_settings, model_settings=model_settings)
+    box_processor = BoxProcessor(general_settings=general_settings)
+    input_size = (job.input_width, job.input_height)
+
+    result = SweepResult(index=job.index, min_hits=job.min_hits, max_age=job.max_age, box_threshold=job.box_threshold, detection_interval=job.detection_interval)
+    start_time = time.perf_counter()
+
+    with torch.no_grad(), DetectionCache(folder=DETECTION_CACHE_FOLDER, key=job.cache_key, read_only=True) as detection_cache, VideoReader(job.input_path) as video_reader:
+        for frame_index, image in video_reader.frames(start_frame=job.start_frame, end_frame=job.end_frame):
+            if frame_index % job.detection_interval != 0:
+                tracker_processor.update_tracks(active_tracks=tracker_processor.get_boxes_from_active_tracks(active_tracks=tracker_processor.propagate_boxes()), verbose=False)
+                result.processed_frames += 1
+                continue
+
+            boxes = detection_cache.get(frame_index=frame_index, box_threshold=job.box_threshold)
+            if boxes is None:
+                raise ValueError(f"Frame {frame_index} is not in the detection cache with a box threshold of {job.box_threshold} or lower")
+
+            image = cv2.resize(src=image, dsize=input_size)
+            try:
+                active_boxes = tracker_processor.update_boxes(boxes=box_processor.extract_boxes(predictions=boxes), image=image)
+            except Exception as e:
+                logger.error(traceback.format_exc())
+                logger.error(e)
+                active_boxes = []
+            tracker_processor.update_tracks(active_tracks=tracker_processor.get_boxes_from_active_tracks(active_tracks=active_boxes), verbose=False)
+            result.processed_frames += 1
+
+    result.counts = dict(tracker_processor.counts)
+    result.elapsed = time.perf_counter() - start_time
+    logger.info(f"Configuration {job.index} (minimum hits {job.min_hits}, maximum age {job.max_age}, box threshold {job.box_threshold}, detection interval {job.detection_interval}) counted {result.counts} in {result.elapsed:.1f} seconds")
+    return result
+
+
+def score_result(result: SweepResult, ground_truth: dict[str, int]) -> None:
+    """
+    Adds the count error per class of the ground truth and the summed absolute error to the result.
+    """
+    result.errors = {class_name: result.counts.get(class_name, 0) - count for class_name, count in ground_truth.items()}
+    result.absolute_error = sum(abs(error) for error in result.errors.values())
+
+
+def add_count_drift(results: list[SweepResult]) -> None:
+    """
+    Adds the count drift per class to the results with a detection interval above 1, compared to the result of the same tracker settings detecting every frame.
+    """
+    full_rate = {(r.min_hits, r.max_age, r.box_threshold): r for r in results if r.detection_interval == 1}
+    for result in results:
+        baseline = full_rate.get((result.min_hits, result.max_age, result.box_threshold))
+        if result.detection_interval > 1 and baseline is not None:
+            result.count_drift = {class_name: result.counts.get(class_name, 0) - count for class_name, count in baseline.counts.items()}
+
+
+def sweep(architecture: str, weights: str, input_path: str, min_hits: list[int], max_ages: list[int], box_thresholds: list[float], start_frame: int = 0, end_frame: Optional[int] = None, ground_truth: Optional[dict[str, int]] = None, workers: Optional[int] = None, tracker: Optional[str] = None, detection_intervals: Optional[list[int]] = None) -> list[SweepResult]:
+    """
+    Replays the cached detections of a video through every combination of the tracker settings in parallel worker processes and returns the counts of each, best first if
+    ground truth counts are passed.
+
+    The detections have to be cached first by processing the video with --detection-cache, with a box threshold at or below the lowest one of the sweep. Without a tracker, the
+    tracker configured for the architecture gets used. Detection intervals above 1 report their count drift from detecting every frame, keep 1 among them for that.
+
+    """
+    config = ConfigParser().get_current_config(architecture=architecture, weights=weights)
+    input_size = (int(config.input_width), int(config.input_height))
+    cache_key = get_cache_key(video_path=input_path, weights_path=os.path.join("models", "architectures", architecture, weights), load_model_type=config.load_model_type or "yolo", input_size=input_size, tracked_class_ids=get_class_indices(classes=config.classes, selection=config.tracked_classes))
+
+    with VideoReader(input_path, prefetch_frames=0) as video_reader:
+        end_frame = end_frame if end_frame is not None else video_reader.total_frames
+    with DetectionCache(folder=DETECTION_CACHE_FOLDER, key=cache_key, read_only=True) as detection_cache:
+        if not detection_cache.covers(start_frame=start_frame, end_frame=end_frame, box_threshold=min(box_thresholds)):
+            raise ValueError(f"The detection cache does not hold frames {start_frame}-{end_frame} of {input_path} with a box threshold of {min(box_thresholds)} or lower, process the video with --detection-cache first")
+
+    grid = list(itertools.product(min_hits, max_ages, box_thresholds, detection_intervals or [1]))
+    workers = max(1, min(workers or os.cpu_count() or 1, len(grid)))
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    jobs = [SweepJob(index=i, input_path=input_path, cache_key=cache_key, tracker=tracker or config.tracker, min_hits=hits, max_age=age, box_threshold=threshold, classes=config.classes, tracked_classes=config.tracked_classes, input_width=input_size[0], input_height=input_size[1], start_frame=start_frame, end_frame=end_frame, device="cpu", threads=threads, detection_interval=interval) for i, (hits, age, threshold, interval) in enumerate(grid)]
+
+    logger.info(f"Sweeping {len(jobs)} tracker configurations over frames {start_frame}-{end_frame} of {input_path} in {workers} worker processes")
+    start_time = time.perf_counter()
+    # Spawn instead of fork, forking a process that already initialized torch threads is unsafe
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        results = list(pool.map(run_configuration, jobs))
+    logger.info(f"Swept {len(jobs)} configurations in {time.perf_counter() - start_time:.1f} seconds")
+
+    add_count_drift(results=results)
+
+    if ground_truth:
+        for result in results:
+            score_result(result=result, ground_truth=ground_truth)
+        results.sort(key=lambda r: r.absolute_error)
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Replays the cached detections of a video through a grid of tracker settings in parallel and reports the counts of each. Run from the root of the repository.")
+    parser.add_argument('--architecture', type=str, default="yolov10", help="Architecture folder in models/architectures the weights are in")
+    parser.add_argument('--weights', type=str, default="yolov10_tracker.pt", help="Name of the weights file the detections got cached with")
+    parser.add_argument('--input', type=str, required=True, help="Video file in the dataset folder, processed with --detection-cache before")
+    parser.add_argument('--min-hits', type=int, nargs="+", default=[3], help="Values of MINIMUM_HITS to sweep")
+    parser.add_argument('--max-age', type=int, nargs="+", default=[30], help="Values of MAXIMUM_AGE to sweep")
+    parser.add_argument('--box-threshold', type=float, nargs="+", default=[0.6], help="Box thresholds to sweep, at or above the one the detections got cached with")
+    parser.add_argument('--start-frame', type=int, default=0, help="First frame of the video to replay")
+    parser.add_argument('--end-frame', type=int, default=None, help="Frame of the video to stop replaying at (exclusive), the whole video if not set")
+    parser.add_argument('--ground-truth', type=str, default=None, help="JSON file with the true count per class, the configurations get ranked by their error")
+    parser.add_argument('--tracker', type=str, default=None, help="Tracker from the tracker registry to sweep, standard the one configured for the architecture")
+    parser.add_argument('--detection-interval', type=int, nargs="+", default=[1], help="Detection intervals to sweep, the count drift of those above 1 is reported against 1")
+    parser.add_argument('--workers', type=int, default=None, help="Amount of worker processes, standard the amount of cores")
+    parser.add_argument('--output', type=str, default=None, help="JSON file to save the results to")
+    args = parser.parse_args()
+
+    true_counts = None
+    if args.ground_truth:
+        with open(args.ground_truth) as file:
+            true_counts = {class_name: int(count) for class_name, count in json.load(file).items()}
+
+    sweep_results = sweep(architecture=args.architecture, weights=args.weights, input_path=os.path.join("dataset", args.input), min_hits=args.min_hits, max_ages=args.max_age, box_thresholds=args.box_threshold, start_frame=args.start_frame, end_frame=args.end_frame, ground_truth=true_counts, workers=args.workers, tracker=args.tracker, detection_intervals=args.detection_interval)
+
+    for sweep_result in sweep_results:
+        error = f", absolute error {sweep_result.absolute_error}" if sweep_result.absolute_error is not None else ""
+        drift = f", drift {sweep_result.count_drift}" if sweep_result.count_drift is not None else ""
+        logger.info(f"Minimum hits {sweep_result.min_hits}, maximum age {sweep_result.max_age}, box threshold {sweep_result.box_threshold}, detection interval {sweep_result.detection_interval}: {sweep_result.counts}{error}{drift}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump([asdict(sweep_result) for sweep_result in sweep_results], file, indent=2)
+        logger.info(f"Saved the results to {args.output}")
@@ -0,0 +1,79 @@
+import numpy as np
+
+
+class TrackStore:
+    """
+    Remembers the ids of the counted tracks and the frame each was last seen in, in sorted numpy arrays instead of a dictionary per track.
+
+    Ids are evicted once they have not been seen for ttl_frames and the tracker no longer holds a track with that id. BoxMot never reuses an id, so an evicted id can not come
+    back and counting stays the same, while the store stays bounded by the amount of tracks of the last ttl_frames instead of growing for as long as the application runs.
+
+    """
+    def __init__(self, ttl_frames: int = 30, capacity: int = 256):
+        self.ttl_frames = ttl_frames
+        self.ids = np.empty(capacity, dtype=np.int64)
+        self.last_seen = np.empty(capacity, dtype=np.int64)
+        self.size = 0
+        self.evicted = 0
+        self.max_size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, track_id) -> bool:
+        i = int(np.searchsorted(self.ids[:self.size], int(track_id)))
+        return i < self.size and self.ids[i] == int(track_id)
+
+    def keys(self) -> list[int]:
+        return self.ids[:self.size].tolist()
+
+    def add(self, track_id: int, frame: int) -> None:
+        """
+        Adds a track id seen in the given frame, keeping the ids sorted. New ids are almost always the highest, which makes inserting an append.
+        """
+        if self.size == self.ids.shape[0]:
+            self.ids = np.resize(self.ids, self.size * 2)
+            self.last_seen = np.resize(self.last_seen, self.size * 2)
+
+        i = int(np.searchsorted(self.ids[:self.size], int(track_id)))
+        if i < self.size:
+            self.ids[i + 1:self.size + 1] = self.ids[i:self.size].copy()
+            self.last_seen[i + 1:self.size + 1] = self.last_seen[i:self.size].copy()
+        self.ids[i] = int(track_id)
+        self.last_seen[i] = frame
+        self.size += 1
+        self.max_size = max(self.max_size, self.size)
+
+    def touch(self, track_ids: np.ndarray, frame: int) -> None:
+        """
+        Marks the known ids among track_ids as seen in the given frame.
+        """
+        if not self.size or not len(track_ids):
+            return
+        ids = self.ids[:self.size]
+        indices = np.minimum(np.searchsorted(ids, track_ids), self.size - 1)
+        self.last_seen[indices[ids[indices] == track_ids]] = frame
+
+    def evict(self, frame: int, alive_ids: np.ndarray) -> int:
+        """
+        Removes the ids not seen for ttl_frames that are not among the alive_ids of the tracker, returning the amount of removed ids.
+        """
+        ids = self.ids[:self.size]
+        expired = (self.last_seen[:self.size] < frame - self.ttl_frames) & ~np.isin(ids, alive_ids)
+        evicted = int(np.count_nonzero(expired))
+        if evicted:
+            keep = ~expired
+            self.size = int(np.count_nonzero(keep))
+            self.ids[:self.size] = ids[keep]
+            self.last_seen[:self.size] = self.last_seen[:len(keep)][keep]
+            self.evicted += evicted
+        return evicted
+
+    def clear(self) -> None:
+        self.size = 0
+
+    def get_metrics(self) -> dict:
+        """
+        Returns the amount of remembered and evicted tracks and the memory the arrays take.
+        """
+        return {"tracks": self.size, "max_tracks": self.max_size, "evicted": self.evicted, "bytes": self.ids.nbytes + self.last_seen.nbytes}
@@ -1,12 +1,41 @@
+from typing import Callable, Optional
+
 from elements.settings.general_settings import GeneralSettings
 from elements.settings.model_settings import ModelSettings
 from elements.settings.tracking_settings import TrackingSettings
 from elements.trackers.general import GeneralizedProcessor
+from elements.trackers.tracker_processor import TrackerProcessor
+from elements.trackers.tracker_registry import get_tracker_entry
 
 
 class TrackerFactory:
+    @staticmethod
+    def get_tracker_generator(tracker: str) -> Optional[Callable]:
+        """
+        Returns the function creating the BoxMot tracker with the given name from the tracker parameters, or None if the tracker is unknown.
+        """
+        entry = get_tracker_entry(tracker=tracker)
+        return entry.create if entry is not None else None
+
     @staticmethod
     def create(general_settings: GeneralSettings, tracking_settings: TrackingSettings, model_settings: ModelSettings):
-        tracker_model = tracking_settings.tracker_generator(min_hits=int(tracking_settings.param_options["MINIMUM_HITS"]), max_age=int(tracking_settings.param_options["MAXIMUM_AGE"]), det_thresh=float(general_settings.box_threshold), device=model_settings.device)
-        tracker_processor = GeneralizedProcessor(general_settings=general_settings, min_hits=int(tracking_settings.param_options["MINIMUM_HITS"]), tracker=tracker_model)
+        tracker_model = tracking_settings.tracker_generator(param_options=tracking_settings.param_options, box_threshold=float(general_settings.box_threshold), device=model_settings.device)
+        tracker_processor = GeneralizedProcessor(general_settings=general_settings, min_hits=int(float(tracking_settings.param_options.get("MINIMUM_HITS") or 0)), tracker=tracker_model)
+        tracker_processor.tracker_name = tracking_settings.tracker
         return tracker_model, tracker_processor
+
+    @staticmethod
+    def reconfigure(general_settings: GeneralSettings, tracking_settings: TrackingSettings, tracker_processor: TrackerProcessor) -> bool:
+        """
+        Applies the current tracker parameters to the tracker of tracker_processor in place, if it is the selected tracker and supports that. Returns whether it did, if not a new
+        tracker has to be created.
+        """
+        entry = get_tracker_entry(tracker=tracking_settings.tracker)
+        if entry is None or tracker_processor.tracker_name is None or get_tracker_entry(tracker=tracker_processor.tracker_name) is not entry:
+            return False
+        if not entry.reconfigure(tracker=tracker_processor.tracker, param_options=tracking_settings.param_options, box_threshold=float(general_settings.box_threshold)):
+            return False
+
+        tracker_processor.min_hits = int(float(tracking_settings.param_options.get("MINIMUM_HITS") or 0))
+        tracker_processor.tracks.ttl_frames = tracker_processor.get_max_age()
+        return True
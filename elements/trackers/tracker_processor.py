@@ -1,6 +1,7 @@
+import itertools
 import math
 from abc import ABC, abstractmethod
-from copy import deepcopy
+from typing import Optional
 
 import cv2
 import numpy as np
@@ -8,6 +9,7 @@ from boxmot.trackers.basetracker import BaseTracker
 
 from elements.datatypes.boundingbox import BoundingBox
 from elements.settings.general_settings import GeneralSettings
+from elements.trackers.track_store import TrackStore
 from elements.utils import Logger, get_color_map
 
 
@@ -19,9 +21,15 @@ class TrackerProcessor(ABC):
         self.count = 0
         self.min_hits = min_hits
         self.tracker = tracker
+        self.tracker_name: Optional[str] = None  # Name in the tracker registry, set by the TrackerFactory
         self.logger = Logger.setup_logger()
         self.general_settings = general_settings
-        self.tracks: dict = {}
+        self.frame_count = 0
+        self.alive_ids = np.empty(0, dtype=np.int64)  # Ids of the tracks the BoxMot tracker still holds
+        self.tracks = TrackStore(ttl_frames=self.get_max_age())
+        self.last_boxes = np.zeros((0, 8), dtype=np.float32)  # Active tracks of the last update, extrapolated by propagate_boxes
+        self.velocities = np.zeros((0, 4), dtype=np.float32)
+        self.propagated_frames = 0
         self.counts: dict[str, int] = {k: 0 for k in self.general_settings.classes}
         self.color_map = get_color_map(self.general_settings.classes)
 
@@ -33,6 +41,19 @@ class TrackerProcessor(ABC):
         self.count = 0
         self.counts = {k: 0 for k in self.general_settings.classes}
 
+    def reset_statistics(self) -> None:
+        """
+        Resets the counts and forgets which tracks got counted, the BoxMot tracker keeps its tracks.
+        """
+        self.reset_count()
+        self.tracks.clear()
+
+    def get_max_age(self) -> int:
+        """
+        Returns the amount of frames the BoxMot tracker keeps a track without detections, ByteTrack calls it max_time_lost.
+        """
+        return int(getattr(self.tracker, "max_age", None) or getattr(self.tracker, "max_time_lost", None) or 30)
+
     @abstractmethod
     def update_tracks(self, active_tracks: list, verbose: bool = True) -> bool:
         """
@@ -40,24 +61,65 @@ class TrackerProcessor(ABC):
         """
         pass
 
-    def update_boxes(self, boxes: list, image: np.ndarray) -> list[np.ndarray]:
+    def update_boxes(self, boxes: np.ndarray, image: np.ndarray) -> list[np.ndarray]:
         """
-        Passes the detections to the BoxMot tracker object so it can look whether they belong to an existing track of a new one.
-        """
-        tracker_tracks: list = sum(self.tracker.per_class_active_tracks.values(), [])
-        new_potential_active_tracks = self.tracker.update(np.asarray(boxes), image)
-        active_tracks = []
-        for potential_active_track in new_potential_active_tracks:
-            for track in tracker_tracks:
-                if track.age > self.min_hits and track.id == int(potential_active_track[4]):
-                    active_tracks.append(potential_active_track)
-                    break
+        Passes the (N, 6) array of detections to the BoxMot tracker object so it can look whether they belong to an existing track of a new one.
 
-        return active_tracks
+        Only the returned tracks that already existed before this frame and are older than min_hits are active. Their ids and ages get collected in arrays once per frame, so
+        confirming the returned tracks is a single vectorized lookup instead of a loop over all tracks per returned track. Every max age frames, the counted tracks the tracker
+        no longer holds get evicted from the track store.
 
-    def update_count(self, image: np.ndarray, background_fill: bool = False) -> np.ndarray:
         """
-        Pastes the classes and counts on the image with dynamic font size and thickness.
+        tracker_tracks = list(itertools.chain.from_iterable(self.tracker.per_class_active_tracks.values()))
+        new_potential_active_tracks = self.tracker.update(boxes, image)
+        self.frame_count += 1
+        ids = np.fromiter((track.id for track in tracker_tracks), dtype=np.int64, count=len(tracker_tracks))
+        self.alive_ids = ids
+        if self.frame_count % max(1, self.tracks.ttl_frames) == 0:
+            self.tracks.evict(frame=self.frame_count, alive_ids=ids)
+        if len(new_potential_active_tracks) == 0 or not tracker_tracks:
+            self.remember_boxes(boxes=np.zeros((0, 8), dtype=np.float32))
+            return []
+
+        age_attribute = "age" if hasattr(tracker_tracks[0], "age") else "tracklet_len"  # ByteTrack counts the age as tracklet_len
+        ages = np.fromiter((getattr(track, age_attribute) for track in tracker_tracks), dtype=np.int64, count=len(tracker_tracks))
+
+        new_potential_active_tracks = np.asarray(new_potential_active_tracks)
+        confirmed = np.isin(new_potential_active_tracks[:, 4].astype(np.int64), ids[ages > self.min_hits])
+        self.remember_boxes(boxes=new_potential_active_tracks[confirmed])
+        return list(new_potential_active_tracks[confirmed])
+
+    def remember_boxes(self, boxes: np.ndarray) -> None:
+        """
+        Keeps the active tracks of the last update and the velocity per frame of their boxes since the update before, the motion the tracker estimated between the detections.
+        """
+        frames = self.propagated_frames + 1
+        velocities = np.zeros((len(boxes), 4), dtype=np.float32)
+        if len(boxes) and len(self.last_boxes):
+            order = np.argsort(self.last_boxes[:, 4])
+            indices = order[np.minimum(np.searchsorted(self.last_boxes[:, 4], boxes[:, 4], sorter=order), len(order) - 1)]
+            matched = self.last_boxes[indices, 4] == boxes[:, 4]
+            velocities[matched] = (boxes[matched, :4] - self.last_boxes[indices[matched], :4]) / frames
+        self.last_boxes = np.asarray(boxes, dtype=np.float32)
+        self.velocities = velocities
+        self.propagated_frames = 0
+
+    def propagate_boxes(self) -> list[np.ndarray]:
+        """
+        Returns the active tracks of the last update moved along their velocity for a frame without detections, in the format of update_boxes. The BoxMot tracker is not updated,
+        so it only sees the frames with detections and its tracks do not age on the frames in between.
+        """
+        self.propagated_frames += 1
+        if not len(self.last_boxes):
+            return []
+        boxes = self.last_boxes.copy()
+        boxes[:, :4] += self.velocities * self.propagated_frames
+        return list(boxes)
+
+    def update_count(self, image: np.ndarray, background_fill: bool = False, text: Optional[str] = None) -> np.ndarray:
+        """
+        Pastes the classes and counts on the image with dynamic font size and thickness, in place. text is the result of get_formatted_count to paste, the current counts if not
+        passed.
         """
         scale = 1
 
@@ -71,8 +133,8 @@ class TrackerProcessor(ABC):
         fontscale = min(width, height) * FONT_SCALE
         thickness = math.ceil(min(width, height) * THICKNESS_SCALE)
 
-        text = self.get_formatted_count()
-        img = deepcopy(image)
+        text = text if text is not None else self.get_formatted_count()
+        img = image
         y = int(image_height / 1.05)  # Start Y position for text placement
 
         max_size = -1
@@ -121,6 +183,12 @@ class TrackerProcessor(ABC):
                 text += f"{str(c)}: {str(self.counts[c])}\n"
         return text
 
+    def get_metrics(self) -> dict:
+        """
+        Returns the size and memory of the track store and the amount of tracks the BoxMot tracker holds.
+        """
+        return {**self.tracks.get_metrics(), "alive_tracks": len(self.alive_ids)}
+
     def get_boxes_from_active_tracks(self, active_tracks: list) -> list[BoundingBox]:
         """
         Returns a list of bounding boxes created from info inside active_tracks, a list of.
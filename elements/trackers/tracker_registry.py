@@ -0,0 +1,135 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Optional
+
+import boxmot
+from boxmot.trackers.basetracker import BaseTracker
+
+
+@dataclass
+class TrackerParameter:
+    """
+    A parameter of a tracker that can be changed in the GUI, stored in TrackingSettings.param_options under its name.
+
+    :param argument: Keyword argument of the BoxMot tracker the value gets passed as, None if only the TrackerProcessor uses it
+
+    """
+    name: str
+    label: str
+    default: str
+    argument: Optional[str] = None
+    cast: Callable = int
+
+
+@dataclass
+class TrackerEntry:
+    """
+    A tracker that can be selected, with the parameters it takes.
+
+    Trackers with reid_weights run an appearance model on the crop of every detection, which is about as expensive on a CPU as the detection itself. The others only use the motion
+    of the boxes.
+
+    """
+    name: str
+    tracker_class: Callable
+    parameters: list[TrackerParameter]
+    description: str
+    threshold_argument: str = "det_thresh"
+    reid_weights: Optional[str] = None
+    options: dict = field(default_factory=dict)
+
+    def create(self, param_options: dict, box_threshold: float, device: str) -> BaseTracker:
+        """
+        Creates the BoxMot tracker with the parameter values in param_options, falling back to the defaults for missing ones.
+        """
+        arguments = dict(self.options)
+        arguments[self.threshold_argument] = box_threshold
+        for parameter in self.parameters:
+            if parameter.argument is not None:
+                arguments[parameter.argument] = parameter.cast(float(param_options.get(parameter.name) or parameter.default))
+        if self.reid_weights is not None:
+            arguments.update(reid_weights=Path(self.reid_weights), device=device, half=False)
+        return self.tracker_class(**arguments)
+
+    def reconfigure(self, tracker: BaseTracker, param_options: dict, box_threshold: float) -> bool:
+        """
+        Applies the parameter values in param_options to a tracker created by this entry, in place, so its appearance model does not get loaded again.
+
+        Only trackers with an appearance model get reconfigured, recreating the others is cheap. Their parameters are read on every update, so the tracks carry on with the new
+        values. Returns whether the tracker got reconfigured, if not it has to be created again.
+
+        """
+        if self.reid_weights is None:
+            return False
+
+        arguments = {self.threshold_argument: box_threshold}
+        for parameter in self.parameters:
+            if parameter.argument is not None:
+                arguments[parameter.argument] = parameter.cast(float(param_options.get(parameter.name) or parameter.default))
+        if not all(hasattr(tracker, argument) for argument in arguments):
+            return False
+
+        for argument, value in arguments.items():
+            setattr(tracker, argument, value)
+        return True
+
+
+MINIMUM_HITS = TrackerParameter(name="MINIMUM_HITS", label="Minimum hits", default="3", argument="min_hits")
+MAXIMUM_AGE = TrackerParameter(name="MAXIMUM_AGE", label="Maximum age", default="30", argument="max_age")
+
+# Keyed by the casefolded name, as the names in config.yaml and the GUI
+TRACKERS: dict[str, TrackerEntry] = {
+    "deepocsort": TrackerEntry(
+        name="DeepOcSort",
+        tracker_class=boxmot.DeepOcSort,
+        parameters=[MINIMUM_HITS, MAXIMUM_AGE],
+        description="OC-SORT with OSNet x1.0 appearance features, the most robust to occlusions and the slowest",
+        reid_weights="osnet_x1_0_msmt17.pt",
+        options={"asso_func": "centroid", "per_class": True},
+    ),
+    "deepocsortlite": TrackerEntry(
+        name="DeepOcSortLite",
+        tracker_class=boxmot.DeepOcSort,
+        parameters=[MINIMUM_HITS, MAXIMUM_AGE],
+        description="OC-SORT with the about 4 times smaller OSNet x0.25 appearance features",
+        reid_weights="osnet_x0_25_msmt17.pt",
+        options={"asso_func": "centroid", "per_class": True},
+    ),
+    "ocsort": TrackerEntry(
+        name="OcSort",
+        tracker_class=boxmot.OcSort,
+        parameters=[MINIMUM_HITS, MAXIMUM_AGE],
+        description="OC-SORT on motion only, without an appearance model",
+        options={"asso_func": "centroid", "per_class": True},
+    ),
+    "bytetrack": TrackerEntry(
+        name="ByteTrack",
+        tracker_class=boxmot.ByteTrack,
+        parameters=[
+            TrackerParameter(name="MINIMUM_HITS", label="Minimum hits", default="3"),
+            TrackerParameter(name="TRACKING_BUFFER", label="Tracking buffer", default="30", argument="track_buffer"),
+            TrackerParameter(name="MATCHING_THRESHOLD", label="Matching threshold", default="0.8", argument="match_thresh", cast=float),
+        ],
+        description="ByteTrack on motion only, also associating low confidence boxes to existing tracks",
+        threshold_argument="track_thresh",
+        options={"per_class": True},
+    ),
+}
+
+
+def get_tracker_entry(tracker: str) -> Optional[TrackerEntry]:
+    """
+    Returns the registry entry of the tracker with the given name, case insensitive, or None if the tracker is unknown.
+    """
+    return TRACKERS.get(str(tracker).casefold())
+
+
+def get_parameter_label(name: str) -> str:
+    """
+    Returns the label to show in the GUI for the tracker parameter with the given name.
+    """
+    for entry in TRACKERS.values():
+        for parameter in entry.parameters:
+            if parameter.name == name:
+                return parameter.label
+    return name.replace("_", " ").capitalize() or "_"
@@ -1,4 +1,5 @@
 import datetime
+import hashlib
 import logging
 import os
 from logging.handlers import RotatingFileHandler
@@ -27,6 +28,36 @@ def get_optimal_font_scale(text: str, width: float) -> float:
     return 1
 
 
+def get_class_indices(classes: list[str], selection: list[str]) -> list[int]:
+    """
+    Returns the indices in classes of the class names in selection, which is how the model refers to them.
+    """
+    return [i for i, class_name in enumerate(classes) if class_name in selection]
+
+
+def parse_timestamp(timestamp: str) -> float:
+    """
+    Parses a timestamp in seconds ("5400.5") or in [[HH:]MM:]SS notation ("01:30:00.5") to seconds.
+    """
+    seconds = 0.0
+    for part in str(timestamp).strip().split(":"):
+        seconds = seconds * 60 + float(part)
+    if seconds < 0:
+        raise ValueError(f"Timestamp cannot be negative: {timestamp}")
+    return seconds
+
+
+def hash_file(path: str, chunk_size: int = 1 << 20) -> str:
+    """
+    Returns the sha256 hex digest of the contents of the file at path.
+    """
+    sha = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
 class Logger:
     """
     Provides a logger for informative print statements and saves them for further investigation.
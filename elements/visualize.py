@@ -4,7 +4,7 @@ import numpy as np
 
 def draw_fps_text(image: np.ndarray, text: str, text_color: tuple = (40, 255, 255)):
     """
-    Draws an FPS component on the image in the upper left corner.
+    Draws an FPS component on the image in the upper left corner, in place.
 
     :param image: The image to draw on.
     :param text: Text to display above the progress bar.
@@ -12,7 +12,7 @@ def draw_fps_text(image: np.ndarray, text: str, text_color: tuple = (40, 255, 25
     :return: Image with progress bar drawn on it.
 
     """
-    img = image.copy()
+    img = image
 
     # Text position (above bar)
     font = cv2.FONT_HERSHEY_SIMPLEX
@@ -30,7 +30,7 @@ def draw_fps_text(image: np.ndarray, text: str, text_color: tuple = (40, 255, 25
 
 def draw_progress_bar(image: np.ndarray, text: str, percentage: float, bar_color: tuple = (0, 255, 0), bg_color: tuple = (50, 50, 50), text_color: tuple = (255, 255, 255)):
     """
-    Draws a progress bar on the image with a label above it.
+    Draws a progress bar on the image with a label above it, in place.
 
     :param image: The image to draw on.
     :param text: Text to display above the progress bar.
@@ -41,7 +41,7 @@ def draw_progress_bar(image: np.ndarray, text: str, percentage: float, bar_color
     :return: Image with progress bar drawn on it.
 
     """
-    img = image.copy()
+    img = image
     h, w = img.shape[:2]
 
     # Progress bar dimensions
@@ -131,9 +131,9 @@ class ModelManager:
 
     def reset_tracker(self):
         """
-        Resets the tracker including statistics.
+        Resets the tracker statistics, the tracker itself keeps running.
         """
-        self.tracking_settings.reset = True
+        self.tracking_settings.reset_stats = True
 
     def predict_gui(self, input_path: Union[str, List]):
         """
@@ -154,21 +154,23 @@ class ModelManager:
         return True
 
     @torch.no_grad()
-    def predict(self, input_path: Optional[Union[str, list]], display: Optional[Display] = None, skip_frames: Optional[int] = 0):
+    def predict(self, input_path: Optional[Union[str, list]], display: Optional[Display] = None, start_frame: int = 0, end_frame: Optional[int] = None, start_time: Optional[float] = None, end_time: Optional[float] = None):
         """
         Standard predict function called by the Gradio component. The supported tasks include: object detection and segmentation and tracking. Tracking uses a different Predictor class to process the images.
 
         :param display: Instance of Display to show results of each prediction locally
         :param input_path: Path to an image or video
-        :param skip_frames: Amount of frames to skip in the case of processing a video file. Useful for debugging
+        :param start_frame: First frame to process in the case of processing a video file, reached by seeking instead of decoding
+        :param end_frame: Frame to stop processing at (exclusive) in the case of processing a video file
+        :param start_time: Like start_frame, but in seconds. Takes precedence over start_frame
+        :param end_time: Like end_frame, but in seconds. Takes precedence over end_frame
 
         """
         if not self.check_model_settings():
             return None
 
         if self.general_settings.task_type.casefold() == Tasks.TRACKING.name.casefold():
-            self.predictor, self.predictor_parameters = PredictTracking(general_settings=self.general_settings, model_settings=self.model_settings, tracking_settings=self.tracking_settings, websocket_server=self.websocket_server, display=display, skip_frames=skip_frames, input_path=input_path,
-                                                                        locker=self.locker).get_predictor()
+            self.predictor, self.predictor_parameters = PredictTracking(general_settings=self.general_settings, model_settings=self.model_settings, tracking_settings=self.tracking_settings, websocket_server=self.websocket_server, display=display, input_path=input_path, locker=self.locker, start_frame=start_frame, end_frame=end_frame, start_time=start_time, end_time=end_time).get_predictor()
         else:
             logger.exception("Task types other than tracking are not supported")
             gr.Warning("Task types other than tracking are not supported")
@@ -0,0 +1,29 @@
+import numpy as np
+
+from elements.predictors.utils.frame_pool import FramePool
+
+
+def test_buffers_are_reused_after_warm_up():
+    pool = FramePool(size=3)
+    warm_up = [pool.next(width=64, height=48) for _ in range(3)]
+    assert pool.allocations == 3
+
+    reused = [pool.next(width=64, height=48) for _ in range(9)]
+    assert pool.allocations == 3
+    assert [id(buffer) for buffer in reused] == [id(buffer) for buffer in warm_up] * 3
+
+
+def test_buffers_have_the_requested_shape():
+    pool = FramePool(size=2)
+    buffer = pool.next(width=64, height=48)
+    assert buffer.shape == (48, 64, 3)
+    assert buffer.dtype == np.uint8
+
+
+def test_changed_dimensions_reallocate_the_ring():
+    pool = FramePool(size=2)
+    for _ in range(4):
+        pool.next(width=64, height=48)
+    buffer = pool.next(width=32, height=24)
+    assert buffer.shape == (24, 32, 3)
+    assert pool.allocations == 3
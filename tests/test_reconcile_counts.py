@@ -0,0 +1,24 @@
+import pytest
+
+chunked_input = pytest.importorskip("elements.predictors.chunked_input")
+
+
+def test_a_tail_track_removes_a_single_duplicate():
+    classes = ["helmet", "cyclist"]
+    previous = chunked_input.ChunkResult(index=0, start=0, end=100, counts={"helmet": 3, "cyclist": 0}, tail_boxes={7: (0, [(100, [10, 10, 50, 50]), (101, [12, 10, 52, 50])])})
+    current = chunked_input.ChunkResult(
+        index=1, start=100, end=200, counts={"helmet": 2, "cyclist": 0}, head_boxes={
+            1: (0, [(100, [10, 10, 50, 50]), (101, [12, 10, 52, 50])]),
+            2: (0, [(101, [14, 12, 54, 52])]),  # Overlaps the same tail track, but less
+        }
+    )
+
+    assert chunked_input.reconcile_counts(results=[current, previous], classes=classes) == {"helmet": 4, "cyclist": 0}
+
+
+def test_tracks_of_another_class_are_no_duplicates():
+    classes = ["helmet", "cyclist"]
+    previous = chunked_input.ChunkResult(index=0, start=0, end=100, counts={"helmet": 1, "cyclist": 0}, tail_boxes={7: (0, [(100, [10, 10, 50, 50])])})
+    current = chunked_input.ChunkResult(index=1, start=100, end=200, counts={"helmet": 0, "cyclist": 1}, head_boxes={1: (1, [(100, [10, 10, 50, 50])])})
+
+    assert chunked_input.reconcile_counts(results=[previous, current], classes=classes) == {"helmet": 1, "cyclist": 1}
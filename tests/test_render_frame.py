@@ -0,0 +1,85 @@
+import tracemalloc
+from datetime import datetime
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+import pytest
+
+base_predictor = pytest.importorskip("elements.predictors.base_predictor")
+
+from elements.cycling_timer import CyclingTimer  # noqa: E402
+from elements.display import Display  # noqa: E402
+from elements.locker import Locker  # noqa: E402
+from elements.settings.general_settings import GeneralSettings  # noqa: E402
+from elements.trackers.general import GeneralizedProcessor  # noqa: E402
+
+
+class RenderPredictor(base_predictor.PredictorBase):
+    """
+    A predictor that only renders, without a result saver writing to the output folder.
+    """
+    def initialize_result_saver(self):
+        return None
+
+    def predict(self):
+        return None
+
+
+class FixedTracker:
+    def __init__(self):
+        self.per_class_active_tracks = {0: [], 1: []}
+        self.max_age = 30
+
+
+def create_predictor() -> RenderPredictor:
+    general_settings = GeneralSettings()
+    general_settings.classes = ["helmet", "cyclist"]
+    general_settings.tracked_classes = general_settings.classes
+    general_settings.input_width, general_settings.input_height = 640, 384
+    general_settings.screen_width, general_settings.screen_height = 1920, 1080
+
+    tracker_processor = GeneralizedProcessor(general_settings=general_settings, min_hits=3, tracker=FixedTracker())
+    predictor = RenderPredictor(general_settings=general_settings, model_settings=None, tracking_settings=None, predictor_parameters=SimpleNamespace(tracker_processor=tracker_processor), websocket_server=None, locker=Locker())
+
+    # Also draw the progress bar of the reset stats timer, without running the timer
+    general_settings.reset_stats_min = 10
+    predictor.cycling_timer = CyclingTimer(name="Reset stats timer", minutes=10, fn=lambda: None, locker=predictor.locker)
+    predictor.cycling_timer.start_time = datetime.now()
+    predictor.last_times = [0.04] * 5  # Draws the FPS as well
+    return predictor
+
+
+def test_render_frame_allocates_nothing_after_warm_up(monkeypatch):
+    monkeypatch.setattr(cv2, "namedWindow", lambda *args, **kwargs: None)
+    monkeypatch.setattr(cv2, "setWindowProperty", lambda *args, **kwargs: None)
+    monkeypatch.setattr(cv2, "imshow", lambda *args, **kwargs: None)
+    monkeypatch.setattr(cv2, "waitKey", lambda *args, **kwargs: -1)
+
+    predictor = create_predictor()
+    display = Display()
+    image = np.random.default_rng(0).integers(0, 255, size=(1080, 1920, 3), dtype=np.uint8)
+    boxes = np.array([[10, 10, 100, 100, 1, 0.9, 0, 0], [200, 50, 300, 200, 2, 0.8, 1, 1]], dtype=np.float32)
+    full_frame_bytes = image.nbytes
+
+    def render() -> np.ndarray:
+        tracks = predictor.predictor_parameters.tracker_processor.get_boxes_from_active_tracks(active_tracks=list(boxes))
+        return predictor.render_frame(image=image, boxes_from_active_tracks=tracks, display=display)
+
+    for _ in range(predictor.frame_pool.size):
+        render()
+    allocations = predictor.frame_pool.allocations
+
+    tracemalloc.start()
+    try:
+        for _ in range(2 * predictor.frame_pool.size):
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            show_image = render()
+            _, peak = tracemalloc.get_traced_memory()
+            assert peak - before < full_frame_bytes / 10, "Rendering a frame allocated a full frame"
+    finally:
+        tracemalloc.stop()
+
+    assert predictor.frame_pool.allocations == allocations
+    assert show_image.shape == (1080, 1920, 3)
@@ -0,0 +1,44 @@
+import numpy as np
+
+from elements.trackers.track_store import TrackStore
+
+
+def test_ids_stay_sorted_and_known():
+    store = TrackStore(ttl_frames=30, capacity=2)
+    for track_id in (5, 1, 9, 3):
+        store.add(track_id=track_id, frame=0)
+    assert store.keys() == [1, 3, 5, 9]
+    assert 3 in store
+    assert 4 not in store
+    assert len(store) == 4
+
+
+def test_eviction_removes_expired_ids_only():
+    store = TrackStore(ttl_frames=10)
+    store.add(track_id=1, frame=0)
+    store.add(track_id=2, frame=0)
+    store.add(track_id=3, frame=0)
+    store.touch(track_ids=np.array([2], dtype=np.int64), frame=15)
+
+    assert store.evict(frame=11, alive_ids=np.array([3], dtype=np.int64)) == 1  # 1 expired, 2 was seen, 3 is still held by the tracker
+    assert store.keys() == [2, 3]
+    assert store.evict(frame=26, alive_ids=np.empty(0, dtype=np.int64)) == 2
+    assert len(store) == 0
+    assert store.get_metrics()["evicted"] == 3
+
+
+def test_size_stays_bounded_by_the_ttl():
+    ttl_frames, new_per_frame = 30, 4
+    store = TrackStore(ttl_frames=ttl_frames)
+    track_id = 0
+    for frame in range(10_000):
+        for _ in range(new_per_frame):
+            store.add(track_id=track_id, frame=frame)
+            track_id += 1
+        if frame % ttl_frames == 0:
+            store.evict(frame=frame, alive_ids=np.empty(0, dtype=np.int64))
+
+    bound = (2 * ttl_frames + 1) * new_per_frame  # Ids expire after ttl_frames and get evicted at most ttl_frames later
+    assert store.max_size <= bound
+    assert store.get_metrics()["bytes"] <= 2 * 8 * 2 * bound
+    assert store.evicted + len(store) == track_id
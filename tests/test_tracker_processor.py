@@ -0,0 +1,68 @@
+import itertools
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+pytest.importorskip("boxmot")
+
+from elements.settings.general_settings import GeneralSettings  # noqa: E402
+from elements.trackers.general import GeneralizedProcessor  # noqa: E402
+
+
+class FixedTracker:
+    """
+    Stands in for a BoxMot tracker holding a fixed set of tracks, returning the same boxes on every update.
+    """
+    def __init__(self, tracks: list, output: np.ndarray):
+        self.per_class_active_tracks = {0: tracks[::2], 1: tracks[1::2]}
+        self.output = output
+        self.max_age = 30
+
+    def update(self, boxes: np.ndarray, image: np.ndarray) -> np.ndarray:
+        return self.output
+
+
+def update_boxes_loop(tracker: FixedTracker, boxes: np.ndarray, min_hits: int) -> list[np.ndarray]:
+    """
+    The loop update_boxes used before it got vectorized, as reference.
+    """
+    tracker_tracks = list(itertools.chain.from_iterable(tracker.per_class_active_tracks.values()))
+    active_tracks = []
+    for potential_active_track in tracker.update(boxes, None):
+        for track in tracker_tracks:
+            if track.age > min_hits and track.id == int(potential_active_track[4]):
+                active_tracks.append(potential_active_track)
+                break
+    return active_tracks
+
+
+def test_update_boxes_matches_the_loop():
+    rng = np.random.default_rng(0)
+    min_hits = 3
+    tracks = [SimpleNamespace(id=track_id, age=int(rng.integers(0, 8))) for track_id in range(40)]
+    output = np.zeros((50, 8), dtype=np.float32)
+    output[:, :4] = rng.uniform(0, 100, size=(50, 4))
+    output[:, 4] = rng.permutation(60)[:50]  # Some returned ids are not among the tracks
+    output[:, 5] = 0.9
+    output[:, 6] = output[:, 4] % 2
+
+    general_settings = GeneralSettings()
+    general_settings.classes = ["helmet", "cyclist"]
+    general_settings.tracked_classes = general_settings.classes
+    tracker = FixedTracker(tracks=tracks, output=output)
+    tracker_processor = GeneralizedProcessor(general_settings=general_settings, min_hits=min_hits, tracker=tracker)
+
+    boxes = np.zeros((0, 6), dtype=np.float32)
+    expected = update_boxes_loop(tracker=tracker, boxes=boxes, min_hits=min_hits)
+    actual = tracker_processor.update_boxes(boxes=boxes, image=None)
+
+    assert 0 < len(expected) < len(output)
+    np.testing.assert_array_equal(np.asarray(actual), np.asarray(expected))
+
+
+def test_update_boxes_without_tracks_returns_nothing():
+    general_settings = GeneralSettings()
+    general_settings.classes = ["helmet", "cyclist"]
+    tracker_processor = GeneralizedProcessor(general_settings=general_settings, min_hits=3, tracker=FixedTracker(tracks=[], output=np.zeros((2, 8), dtype=np.float32)))
+    assert tracker_processor.update_boxes(boxes=np.zeros((0, 6), dtype=np.float32), image=None) == []